@@ -1,5 +1,6 @@
 """Application interfaces (contracts)."""
 
-from .strategy import Strategy
+from .bar_source import BarSource
+from .strategy import BatchStrategy, Strategy, StrategyGrid
 
-__all__ = ["Strategy"]
+__all__ = ["BarSource", "BatchStrategy", "Strategy", "StrategyGrid"]
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from domain.backtest import BarArrays
+
+
+class BarSource(ABC):
+    @abstractmethod
+    def iter_chunks(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator[BarArrays]:
+        """Yield the bars of one (exchange, symbol, timeframe) in [start, end), oldest first, in large chunks."""
@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 from shared.domain.models import OHLCV, Signal
 
 
 class Strategy(ABC):
+    # 戦略が判断に使用する時間足（例: "1s", "1m", "5m"）
+    timeframe: str = "1s"
+
+    def required_indicators(self) -> Sequence[str]:
+        """Return the indicator specs this strategy reads (e.g. ["ma:7", "ma:20"]); empty means the default set."""
+        return ()
+
     @abstractmethod
     def calculate_indicators(self, ohlcv: OHLCV) -> Dict[str, float]:
         """Calculate indicators from OHLCV."""
@@ -13,3 +23,55 @@ class Strategy(ABC):
     def decide(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
         """Return a trading signal or None."""
 
+    @property
+    def series_history(self) -> int:
+        """Return how many closes before each chunk decide_series needs to continue seamlessly."""
+        return 0
+
+    def decide_series(self, closes: np.ndarray, start: int) -> Optional[np.ndarray]:
+        """Decide for a whole close series of one symbol at once (vectorized backtesting).
+
+        closes[:start] is the carried-over history (at most series_history closes) and closes[start:]
+        the new bars. Return one action per new bar (1 = enter_long, -1 = exit, 0 = none) matching
+        what decide would emit bar by bar, or None when the strategy has no vectorized implementation.
+        """
+        return None
+
+    def export_state(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return per-market state to checkpoint as exchange -> symbol -> state (stateless strategies return {})."""
+        return {}
+
+    def restore_state(self, state: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+        """Restore per-market state returned by export_state."""
+
+
+class BatchStrategy(Strategy):
+    """Strategy that can also decide for many markets at once from columnar arrays."""
+
+    @abstractmethod
+    def decide_batch(
+        self, markets: Sequence[Tuple[str, str]], closes: np.ndarray, indicators: Mapping[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Decide for many (exchange, symbol) markets at once (one row per market, no duplicates).
+
+        Return (actions, confidences) where an empty action means no signal. Missing indicator
+        values are NaN. Must update per-market state exactly as decide would.
+        """
+
+    @abstractmethod
+    def make_signal(self, ohlcv: OHLCV, action: str, confidence: Decimal, indicators: Dict[str, float]) -> Signal:
+        """Build the Signal for one row that decide_batch returned an action for."""
+
+
+class StrategyGrid(ABC):
+    # グリッドが判断に使用する時間足（例: "1s", "1m", "5m"）
+    timeframe: str = "1s"
+
+    @property
+    @abstractmethod
+    def required_history(self) -> int:
+        """Return the number of closes evaluate needs in the shared price history."""
+
+    @abstractmethod
+    def evaluate(self, ohlcv: OHLCV, closes: Sequence[float]) -> List[Signal]:
+        """Evaluate every parameter combination on the latest bar and return shadow signals."""
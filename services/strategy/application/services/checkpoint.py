@@ -0,0 +1,96 @@
+"""Strategy checkpoint.
+
+Application layer: 戦略ワーカーの状態のチェックポイント
+責務: パイプラインの状態（未確定のバー・OHLCV履歴・戦略の状態・配信できなかったシグナル）と、
+      その状態に反映済みの Stream ID をまとめて保持する
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from shared.domain.models import Signal
+
+# チェックポイントの形式のバージョン（互換性のない変更をした場合に上げる）
+CHECKPOINT_VERSION = 4
+
+
+def stream_id_key(stream_id: str) -> Tuple[int, int]:
+    """Stream ID（"<ミリ秒>-<連番>"）を比較用のタプルに変換します。
+
+    Args:
+        stream_id: Stream ID（例: "1732312345000-0"）
+
+    Returns:
+        (ミリ秒, 連番)
+    """
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def signal_to_state(signal: Signal) -> Dict[str, Any]:
+    """Signal をチェックポイントに保存できる形式（JSON）に変換します。
+
+    Args:
+        signal: Signal エンティティ
+
+    Returns:
+        シリアライズ可能な辞書
+    """
+    return {
+        "exchange": signal.exchange,
+        "symbol": signal.symbol,
+        "strategy": signal.strategy,
+        "action": signal.action,
+        "confidence": str(signal.confidence),
+        "price_ref": str(signal.price_ref),
+        "indicators": signal.indicators,
+        "meta": signal.meta,
+        "timestamp": signal.timestamp.isoformat() if signal.timestamp else None,
+    }
+
+
+def signal_from_state(state: Dict[str, Any]) -> Signal:
+    """signal_to_state で変換した辞書から Signal を復元します。
+
+    Args:
+        state: signal_to_state が返した辞書
+
+    Returns:
+        Signal エンティティ
+    """
+    timestamp = state.get("timestamp")
+    return Signal(
+        exchange=state["exchange"],
+        symbol=state["symbol"],
+        strategy=state["strategy"],
+        action=state["action"],
+        confidence=Decimal(state["confidence"]),
+        price_ref=Decimal(state["price_ref"]),
+        indicators=state.get("indicators"),
+        meta=state.get("meta"),
+        timestamp=datetime.fromisoformat(timestamp) if timestamp else None,
+    )
+
+
+@dataclass
+class StrategyCheckpoint:
+    """Snapshot of the strategy worker state at a consistent point of the input streams.
+
+    stream_ids までのメッセージをすべて反映した時点の状態です。
+    復元後は stream_ids より後のメッセージをリプレイすることで、停止直前の状態に追いつけます。
+    """
+
+    # Stream 名 → 状態に反映済みの最新のメッセージID
+    stream_ids: Dict[str, str] = field(default_factory=dict)
+    # 時間足 → 取引所 → シンボル → 未確定のバー（OHLCVGeneratorUseCase.export_state）
+    open_bars: Dict[str, Dict[str, Dict[str, List[Any]]]] = field(default_factory=dict)
+    # 取引所 → シンボル → OHLCV履歴のバイナリ（IndicatorCalculatorUseCase.export_state）
+    history: Dict[str, Dict[str, bytes]] = field(default_factory=dict)
+    # 戦略インスタンスID → 取引所 → シンボル → 戦略の状態（SignalGeneratorUseCase.export_state）
+    strategy: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = field(default_factory=dict)
+    # 配信できずに引き継いだシグナル（signal_to_state の形式、メッセージのリプレイでは再生成されないもの）
+    unpublished: List[Dict[str, Any]] = field(default_factory=list)
+    # 作成時刻（エポック秒）
+    created_at: float = 0.0
+    version: int = CHECKPOINT_VERSION
@@ -0,0 +1,56 @@
+"""Ticker Conflation.
+
+Application layer: 遅延時のティッカー間引き
+責務: 取得したバッチ内で、同じ取引所・シンボル・同じバケットの途中のティッカーを読み飛ばす
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+from application.services.message_time import message_ts
+
+# 間引きの対象とする Stream（約定・板情報は間引かない）
+CONFLATED_STREAMS = frozenset({"md:ticker"})
+
+
+def conflate_tickers(
+    batch: Sequence[Dict[str, Any]], bucket_ms: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """同じ取引所・シンボル・同じ時間足バケットのティッカーを、最初と最後の1件ずつに間引きます。
+
+    バケットの最初のティッカーが始値を、最後のティッカーが終値を決めるため、
+    バーの境界と始値・終値は間引かない場合と同じになります（途中のティッカーによる
+    高値・安値は失われますが、約定は間引かないため約定による高値・安値と出来高は保たれます）。
+    data フィールドはデコードせず、exchange・symbol・ts のみを参照します（ts が不正な場合は Stream ID の時刻）。
+
+    Args:
+        batch: ts の昇順に並んだメッセージのリスト
+        bucket_ms: 最小の時間足の長さ（ミリ秒）
+
+    Returns:
+        (処理するメッセージのリスト, 読み飛ばしたメッセージのリスト)。処理するメッセージの順序は保たれます
+    """
+    first: Dict[Tuple[str, str, int], int] = {}
+    last: Dict[Tuple[str, str, int], int] = {}
+    tickers = 0
+    for index, message in enumerate(batch):
+        if message["stream"] not in CONFLATED_STREAMS:
+            continue
+        tickers += 1
+        fields = message["fields"]
+        key = (fields.get("exchange", ""), fields.get("symbol", ""), message_ts(message) // bucket_ms)
+        first.setdefault(key, index)
+        last[key] = index
+
+    keep = set(first.values())
+    keep.update(last.values())
+    if len(keep) == tickers:
+        # 読み飛ばせるティッカーがない
+        return list(batch), []
+
+    kept: List[Dict[str, Any]] = []
+    superseded: List[Dict[str, Any]] = []
+    for index, message in enumerate(batch):
+        if message["stream"] in CONFLATED_STREAMS and index not in keep:
+            superseded.append(message)
+        else:
+            kept.append(message)
+    return kept, superseded
@@ -0,0 +1,78 @@
+"""Keyed Executor.
+
+Application layer: キー単位で順序を保証する並行実行
+責務: 異なるキー（シンボル）の処理をイベントループ上で並行に実行し、
+      同じキーの処理は投入順に1つずつ実行する
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedExecutor:
+    """Run coroutines concurrently across keys while keeping strict order per key.
+
+    同じキーのタスクは直前のタスクの完了を待ってから開始するため、シンボルごとの状態
+    （未確定バー・指標・戦略）は常に投入順に更新されます。
+    実行中（待機中を含む）のタスク数は max_in_flight で制限され、上限に達すると submit が待機します。
+    """
+
+    def __init__(self, max_in_flight: int = 256) -> None:
+        """Initialize Keyed Executor.
+
+        Args:
+            max_in_flight: 同時に保持するタスク数の上限
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be positive: {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # キーごとの最後に投入されたタスク（次のタスクはこれの完了を待つ）
+        self._tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """実行中・待機中のタスク数。"""
+        return len(self._tasks)
+
+    async def submit(self, key: Hashable, work: Callable[[], Awaitable[None]]) -> asyncio.Task:
+        """キーに紐づく処理を投入します。
+
+        Args:
+            key: 順序を保証する単位（例: シンボル）
+            work: 実行するコルーチンを返す関数
+
+        Returns:
+            投入したタスク
+        """
+        await self._slots.acquire()
+        previous = self._tails.get(key)
+        task = asyncio.create_task(self._run(previous, work))
+        self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._on_done(key, done))
+        return task
+
+    async def join(self) -> None:
+        """投入済みのすべてのタスクの完了を待ちます。"""
+        while self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+    @staticmethod
+    async def _run(previous: Optional[asyncio.Task], work: Callable[[], Awaitable[None]]) -> None:
+        """直前のタスクの完了（成功・失敗を問わない）を待ってから処理を実行します。"""
+        if previous is not None and not previous.done():
+            await asyncio.wait({previous})
+        await work()
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """タスク完了時に枠を解放し、例外をログに記録します。"""
+        self._tasks.discard(task)
+        if self._tails.get(key) is task:
+            del self._tails[key]
+        self._slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Keyed task failed: key=%s, error=%s", key, task.exception(), exc_info=task.exception())
@@ -0,0 +1,30 @@
+"""Message Time.
+
+Application layer: Stream メッセージのイベント時刻
+責務: 欠落・不正な ts を含むメッセージでも例外を出さずに、バッチの並べ替え・ティッカーの間引き・リプレイの時計に使う時刻を返す
+"""
+from typing import Any, Dict
+
+
+def message_ts(message: Dict[str, Any]) -> int:
+    """メッセージのイベント時刻（ts）を返します。
+
+    ts が欠落している、または数値でない場合は Stream ID のミリ秒部分（Redis が受け付けた時刻）を、
+    それも解釈できない場合は 0 を返します。そのようなメッセージは OHLCVGeneratorUseCase.parse_message が
+    警告を出して読み飛ばし、バーには集約されません（ACK はされる）。代わりの時刻は、そこまでの
+    並べ替え・間引きの位置とリプレイの時計にだけ使われます。
+
+    Args:
+        message: Redis Stream メッセージ（{"stream", "id", "fields"}）
+
+    Returns:
+        イベント時刻（エポックミリ秒）
+    """
+    try:
+        return int(message.get("fields", {}).get("ts"))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return int(str(message.get("id", "")).partition("-")[0])
+    except ValueError:
+        return 0
@@ -0,0 +1,100 @@
+"""Symbol Shard Router.
+
+Application layer: シンボルのシャード割り当て
+責務: 複数の strategy ワーカーのうち、どのワーカーがどのシンボルを担当するかを決定する
+"""
+import hashlib
+from typing import Dict, Iterable, List
+
+
+class ShardRouter:
+    """Assign symbols to worker shards with rendezvous (highest random weight) hashing.
+
+    シンボルごとの指標・戦略状態はプロセス内メモリに保持されるため、
+    同じシンボルのティックは常に同じワーカーで処理する必要があります。
+    rendezvous hashing はシンボル一覧を共有しなくても全ワーカーで同じ結果になり、
+    シャード数を変更したときに担当が移動するシンボルも約 1/N に抑えられます。
+    """
+
+    def __init__(self, shard_index: int = 0, shard_count: int = 1) -> None:
+        """Initialize Shard Router.
+
+        Args:
+            shard_index: このワーカーのシャード番号（0 始まり）
+            shard_count: シャード（ワーカー）の総数
+
+        Raises:
+            ValueError: シャード番号・総数が不正な場合
+        """
+        if shard_count < 1:
+            raise ValueError(f"shard_count must be positive: {shard_count}")
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index must be in [0, {shard_count}): {shard_index}")
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self._owns_cache: Dict[str, bool] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """シャーディングが有効（シャード数が2以上）かどうか。"""
+        return self.shard_count > 1
+
+    def shard_of(self, symbol: str) -> int:
+        """シンボルを担当するシャード番号を返します。
+
+        Args:
+            symbol: シンボル（例: "BTC_JPY"）
+
+        Returns:
+            シャード番号
+        """
+        if self.shard_count == 1:
+            return 0
+        return max(range(self.shard_count), key=lambda index: self._weight(symbol, index))
+
+    def owns(self, symbol: str) -> bool:
+        """このワーカーがシンボルを担当しているかどうかを返します。
+
+        Args:
+            symbol: シンボル（例: "BTC_JPY"）
+
+        Returns:
+            担当している場合は True
+        """
+        owned = self._owns_cache.get(symbol)
+        if owned is None:
+            owned = self._owns_cache[symbol] = self.shard_of(symbol) == self.shard_index
+        return owned
+
+    def owned_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """シンボル一覧のうち、このワーカーが担当するものを返します。
+
+        Args:
+            symbols: シンボル一覧
+
+        Returns:
+            担当するシンボルのリスト
+        """
+        return [symbol for symbol in symbols if self.owns(symbol)]
+
+    def consumer_group(self, base_name: str) -> str:
+        """このシャード用の Consumer Group 名を返します。
+
+        各シャードはすべてのメッセージを受け取って担当外を読み飛ばすため、
+        シャードごとに別の Consumer Group を使用します（シャード数1の場合は base_name のまま）。
+
+        Args:
+            base_name: Consumer Group の基本名（例: "strategy"）
+
+        Returns:
+            Consumer Group 名（例: "strategy-shard-0"）
+        """
+        if not self.enabled:
+            return base_name
+        return f"{base_name}-shard-{self.shard_index}"
+
+    @staticmethod
+    def _weight(symbol: str, index: int) -> int:
+        """シンボルとシャードの組に対する重み（プロセスをまたいで決定的なハッシュ値）。"""
+        digest = hashlib.blake2b(f"{symbol}:{index}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
@@ -4,7 +4,7 @@ Application layer: シグナル配信サービス
 責務: Signal エンティティを受け取り、Infrastructure 層の Publisher に委譲する
 """
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Sequence
 
 from shared.domain.models import Signal
 
@@ -20,13 +20,22 @@ class SignalPublisherService:
     Signal エンティティを受け取り、Redis Stream に配信します。
     """
 
-    def __init__(self, publisher: "RedisStreamPublisher") -> None:
+    def __init__(
+        self,
+        publisher: "RedisStreamPublisher",
+        stream_prefix: str = "signal",
+        log_level: int = logging.INFO,
+    ) -> None:
         """Initialize Signal Publisher Service.
 
         Args:
             publisher: Infrastructure 層の RedisStreamPublisher インスタンス
+            stream_prefix: 配信先の Stream 名の接頭辞（デフォルト: "signal"、シャドーシグナルは "shadow" など）
+            log_level: 配信したシグナルのログレベル（大量のシャドーシグナルは DEBUG にする）
         """
         self.publisher = publisher
+        self.stream_prefix = stream_prefix
+        self.log_level = log_level
 
     async def publish(self, signal: Signal) -> None:
         """Signal を Redis Stream に配信します.
@@ -34,11 +43,35 @@ class SignalPublisherService:
         Args:
             signal: 配信する Signal エンティティ
         """
-        # Stream 名を生成（例: "signal:gmo:BTC_JPY"）
-        stream_name = f"signal:{signal.exchange}:{signal.symbol}"
+        # Infrastructure 層の Publisher に委譲
+        await self.publisher.publish(self._stream_name(signal), self._to_payload(signal))
+        self._log_published(signal)
+
+    async def publish_many(self, signals: Sequence[Signal]) -> None:
+        """複数の Signal を1回の往復でまとめて配信します.
+
+        相場全体が動いて多数のシンボルで同時にシグナルが発生した場合でも、
+        シグナルごとの往復が発生しません。
 
-        # Signal エンティティを辞書形式に変換
-        payload = {
+        Args:
+            signals: 配信する Signal エンティティのリスト
+        """
+        if not signals:
+            return
+        await self.publisher.publish_many(
+            [(self._stream_name(signal), self._to_payload(signal)) for signal in signals]
+        )
+        for signal in signals:
+            self._log_published(signal)
+
+    def _stream_name(self, signal: Signal) -> str:
+        """Stream 名を生成します（例: "signal:gmo:BTC_JPY"）。"""
+        return f"{self.stream_prefix}:{signal.exchange}:{signal.symbol}"
+
+    @staticmethod
+    def _to_payload(signal: Signal) -> Dict[str, Any]:
+        """Signal エンティティを配信用の辞書に変換します。"""
+        payload: Dict[str, Any] = {
             "exchange": signal.exchange,
             "symbol": signal.symbol,
             "strategy": signal.strategy,
@@ -53,10 +86,12 @@ class SignalPublisherService:
             payload["indicators"] = signal.indicators
         if signal.meta:
             payload["meta"] = signal.meta
+        return payload
 
-        # Infrastructure 層の Publisher に委譲
-        await self.publisher.publish(stream_name, payload)
-        logger.info(
+    def _log_published(self, signal: Signal) -> None:
+        """配信したシグナルをログに出力します。"""
+        logger.log(
+            self.log_level,
             "Published signal: exchange=%s, symbol=%s, strategy=%s, action=%s",
             signal.exchange,
             signal.symbol,
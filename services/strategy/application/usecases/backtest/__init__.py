@@ -0,0 +1 @@
+"""Backtest usecases (vectorized strategy evaluation over stored bars)."""
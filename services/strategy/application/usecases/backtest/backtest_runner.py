@@ -0,0 +1,97 @@
+"""Backtest Use Case.
+
+Application layer: バックテストユースケース
+責務: 保存済みのバーをチャンク単位で読み込み、戦略の decide_series でまとめて判定して損益を計算する
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from application.interfaces.bar_source import BarSource
+from application.interfaces.strategy import Strategy
+from domain.backtest import BacktestResult, LongOnlyPortfolio
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestUseCase:
+    """Run a strategy over historical bars with vectorized decisions.
+
+    バーをチャンクごとに NumPy 配列で受け取り、直前のチャンクの終値（series_history 本）を引き継いで
+    decide_series を呼び出します。行動は LongOnlyPortfolio で損益・ドローダウン・取引一覧に変換します。
+    """
+
+    def __init__(
+        self,
+        source: BarSource,
+        strategy: Strategy,
+        initial_capital: float = 1_000_000.0,
+        fee_rate: float = 0.0,
+    ) -> None:
+        """Initialize Backtest Use Case.
+
+        Args:
+            source: バーの読み込み元（ohlcv テーブル、ファイルなど）
+            strategy: バックテストする戦略（decide_series を実装していること）
+            initial_capital: 初期資産
+            fee_rate: 売買ごとの手数料率
+        """
+        self.source = source
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+
+    async def execute(
+        self,
+        exchange: str,
+        symbol: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> BacktestResult:
+        """1シンボルの [start, end) のバーで戦略をバックテストします（時間足は戦略の timeframe）。
+
+        Args:
+            exchange: 取引所（例: "gmo"）
+            symbol: シンボル（例: "BTC_JPY"）
+            start: 開始時刻（省略時は最初のバーから）
+            end: 終了時刻（省略時は最後のバーまで）
+
+        Returns:
+            BacktestResult
+
+        Raises:
+            ValueError: 戦略が decide_series を実装していない場合
+        """
+        portfolio = LongOnlyPortfolio(initial_capital=self.initial_capital, fee_rate=self.fee_rate)
+        history_size = self.strategy.series_history
+        history = np.empty(0, dtype=np.float64)
+        started = time.perf_counter()
+
+        async for bars in self.source.iter_chunks(exchange, symbol, self.strategy.timeframe, start, end):
+            if not len(bars):
+                continue
+            closes = np.concatenate((history, bars.close))
+            actions = self.strategy.decide_series(closes, len(history))
+            if actions is None:
+                raise ValueError(f"Strategy {type(self.strategy).__name__} does not support vectorized backtesting")
+            portfolio.update(bars, actions)
+            history = closes[-history_size:].copy() if history_size else history
+            logger.debug("Backtest chunk processed: symbol=%s, bars=%d, until=%s", symbol, len(bars), bars.timestamps[-1])
+
+        result = portfolio.result()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Backtest finished: symbol=%s, timeframe=%s, bars=%d, trades=%d, total_return=%.4f, "
+            "max_drawdown=%.4f, elapsed=%.2fs",
+            symbol,
+            self.strategy.timeframe,
+            result.bars,
+            len(result.trades),
+            result.total_return,
+            result.max_drawdown,
+            elapsed,
+        )
+        return result
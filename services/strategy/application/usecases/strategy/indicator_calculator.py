@@ -4,11 +4,12 @@ Application layer: 指標計算ユースケース
 責務: OHLCVからテクニカル指標を計算する
 """
 import logging
-from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
-import pandas as pd
+
+from domain.indicators import IndicatorEngine, IndicatorSpec
+from domain.market import OHLCVRingBuffer, OrderBookStore, TradeTapeStore
 from shared.domain.models import OHLCV
 
 logger = logging.getLogger(__name__)
@@ -18,182 +19,253 @@ class IndicatorCalculatorUseCase:
     """Calculate technical indicators from OHLCV.
 
     OHLCVデータからテクニカル指標（移動平均、RSI、ボリンジャーバンドなど）を計算します。
+    履歴と指標エンジンは、ohlcv テーブルの一意制約と同じく（取引所, シンボル）ごとに保持します。
     """
 
-    def __init__(self) -> None:
-        """Initialize Indicator Calculator Use Case."""
-        # シンボルごとのOHLCV履歴を保持（指標計算用）
-        self._ohlcv_history: Dict[str, List[OHLCV]] = {}
-        self._max_history_size = 200  # 最大200本のローソク足を保持
+    def __init__(
+        self,
+        max_history_size: int = 200,
+        order_books: Optional[OrderBookStore] = None,
+        trade_tapes: Optional[TradeTapeStore] = None,
+        indicators: Optional[Iterable[Union[str, IndicatorSpec]]] = None,
+        min_batch_size: int = 8,
+    ) -> None:
+        """Initialize Indicator Calculator Use Case.
 
-    def _add_to_history(self, ohlcv: OHLCV) -> None:
+        Args:
+            max_history_size: 取引所・シンボルごとに保持するローソク足の最大本数（デフォルト: 200）
+            order_books: 板情報（オプション、指定した場合は板の特徴量を指標に追加）
+            trade_tapes: 約定履歴（オプション、指定した場合は約定の特徴量を指標に追加）
+            indicators: 計算する指標の宣言（戦略の required_indicators、
+                省略時は従来の指標一式（MA 5/20/50, RSI, ボリンジャーバンド, MACD））
+            min_batch_size: execute_many でベクトル化して計算するシンボル数の下限
+                （これより少ない場合は NumPy の固定コストの方が大きいため、シンボルごとに計算する）
+
+        Raises:
+            ValueError: 指標の宣言が不正な場合
+        """
+        # (取引所, シンボル) ごとのOHLCV履歴（固定容量のリングバッファ）
+        self._ohlcv_history: Dict[Tuple[str, str], OHLCVRingBuffer] = {}
+        self._max_history_size = max_history_size
+        # (取引所, シンボル) ごとのインクリメンタル指標エンジン
+        self._engines: Dict[Tuple[str, str], IndicatorEngine] = {}
+        self.order_books = order_books
+        self.trade_tapes = trade_tapes
+        # 宣言を検証し、計算グラフの構成（必要な履歴の本数）を確定する
+        self._template = IndicatorEngine(indicators)
+        self.indicators = self._template.specs
+        self.min_batch_size = min_batch_size
+
+    def _add_to_history(self, ohlcv: OHLCV) -> OHLCVRingBuffer:
         """OHLCVを履歴に追加します。
 
         Args:
             ohlcv: OHLCV エンティティ
+
+        Returns:
+            取引所・シンボルの履歴バッファ
+        """
+        key = (ohlcv.exchange, ohlcv.symbol)
+        history = self._ohlcv_history.get(key)
+        if history is None:
+            history = self._ohlcv_history[key] = OHLCVRingBuffer(self.history_capacity)
+
+        history.append_ohlcv(ohlcv)
+        return history
+
+    def _get_engine(self, ohlcv: OHLCV) -> IndicatorEngine:
+        """OHLCV の取引所・シンボルの指標エンジンを取得します（存在しない場合は作成）。
+
+        Args:
+            ohlcv: OHLCV エンティティ
+
+        Returns:
+            IndicatorEngine インスタンス
         """
-        symbol = ohlcv.symbol
-        if symbol not in self._ohlcv_history:
-            self._ohlcv_history[symbol] = []
+        key = (ohlcv.exchange, ohlcv.symbol)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = IndicatorEngine(self.indicators)
+        return engine
 
-        self._ohlcv_history[symbol].append(ohlcv)
+    @property
+    def history_capacity(self) -> int:
+        """取引所・シンボルごとに保持するローソク足の本数（ウォームアップで読み込む本数）。"""
+        return max(self._max_history_size, self._template.required_history)
 
-        # 履歴サイズを制限
-        if len(self._ohlcv_history[symbol]) > self._max_history_size:
-            self._ohlcv_history[symbol] = self._ohlcv_history[symbol][-self._max_history_size :]
+    def warm_up(self, ohlcvs: Sequence[OHLCV]) -> Dict[Tuple[str, str], Tuple[OHLCV, Dict[str, float]]]:
+        """過去の OHLCV を履歴と指標エンジンに読み込みます。
 
-    def _ohlcv_to_dataframe(self, symbol: str) -> Optional[pd.DataFrame]:
-        """OHLCV履歴をpandas DataFrameに変換します。
+        既に履歴がある取引所・シンボル（チェックポイントから復元済みなど）は読み飛ばします。
 
         Args:
-            symbol: シンボル
+            ohlcvs: OHLCV エンティティのリスト（取引所・シンボルごとに古い順）
 
         Returns:
-            DataFrame（履歴が不足している場合は None）
+            (取引所, シンボル) → (最後に読み込んだ OHLCV, その時点の指標) の辞書
         """
-        if symbol not in self._ohlcv_history or len(self._ohlcv_history[symbol]) < 2:
-            return None
-
-        ohlcv_list = self._ohlcv_history[symbol]
-        data = {
-            "timestamp": [o.timestamp for o in ohlcv_list],
-            "open": [float(o.open) for o in ohlcv_list],
-            "high": [float(o.high) for o in ohlcv_list],
-            "low": [float(o.low) for o in ohlcv_list],
-            "close": [float(o.close) for o in ohlcv_list],
-            "volume": [float(o.volume) for o in ohlcv_list],
+        skipped = {
+            key for key in {(ohlcv.exchange, ohlcv.symbol) for ohlcv in ohlcvs} if key in self._ohlcv_history
         }
-        df = pd.DataFrame(data)
-        df.set_index("timestamp", inplace=True)
-        return df
-
-    def execute(self, ohlcv: OHLCV) -> Dict[str, float]:
-        """OHLCVからテクニカル指標を計算します.
+        latest: Dict[Tuple[str, str], Tuple[OHLCV, Dict[str, float]]] = {}
+        for ohlcv in ohlcvs:
+            key = (ohlcv.exchange, ohlcv.symbol)
+            if key in skipped:
+                continue
+            history = self._add_to_history(ohlcv)
+            latest[key] = (ohlcv, self._get_engine(ohlcv).update(history.close))
+        return latest
+
+    def get_history(self, exchange: str, symbol: str) -> Optional[OHLCVRingBuffer]:
+        """取引所・シンボルのOHLCV履歴を取得します。
 
         Args:
-            ohlcv: OHLCV エンティティ
+            exchange: 取引所名
+            symbol: シンボル
 
         Returns:
-            指標の辞書（例: {'ma_5': 100.5, 'ma_20': 99.8, 'rsi': 65.2}）
+            OHLCVRingBuffer（履歴がない場合は None）
         """
-        # 履歴に追加
-        self._add_to_history(ohlcv)
+        return self._ohlcv_history.get((exchange, symbol))
 
-        # DataFrame に変換
-        df = self._ohlcv_to_dataframe(ohlcv.symbol)
-        if df is None or len(df) < 2:
-            # データが不足している場合は空の辞書を返す
-            return {}
+    def export_state(self) -> Dict[str, Dict[str, bytes]]:
+        """取引所・シンボルごとのOHLCV履歴をバイナリ形式で返します（チェックポイント用）。
 
-        indicators: Dict[str, float] = {}
+        指標エンジンの内部状態は履歴から再構築できるため、履歴のみを保存します。
 
-        try:
-            close = df["close"]
-
-            # 移動平均（MA）
-            if len(df) >= 5:
-                ma_5 = close.rolling(window=5).mean()
-                if not ma_5.empty and not pd.isna(ma_5.iloc[-1]):
-                    indicators["ma_5"] = float(ma_5.iloc[-1])
-
-            if len(df) >= 20:
-                ma_20 = close.rolling(window=20).mean()
-                if not ma_20.empty and not pd.isna(ma_20.iloc[-1]):
-                    indicators["ma_20"] = float(ma_20.iloc[-1])
-
-            if len(df) >= 50:
-                ma_50 = close.rolling(window=50).mean()
-                if not ma_50.empty and not pd.isna(ma_50.iloc[-1]):
-                    indicators["ma_50"] = float(ma_50.iloc[-1])
-
-            # RSI（相対力指数）
-            if len(df) >= 14:
-                rsi = self._calculate_rsi(close, period=14)
-                if rsi is not None and not pd.isna(rsi):
-                    indicators["rsi"] = float(rsi)
-
-            # ボリンジャーバンド
-            if len(df) >= 20:
-                bb_middle = close.rolling(window=20).mean()
-                bb_std = close.rolling(window=20).std()
-                if not bb_middle.empty and not pd.isna(bb_middle.iloc[-1]):
-                    indicators["bb_middle"] = float(bb_middle.iloc[-1])
-                    indicators["bb_upper"] = float(bb_middle.iloc[-1] + 2 * bb_std.iloc[-1])
-                    indicators["bb_lower"] = float(bb_middle.iloc[-1] - 2 * bb_std.iloc[-1])
-
-            # MACD
-            if len(df) >= 26:
-                macd_result = self._calculate_macd(close)
-                if macd_result:
-                    indicators["macd"] = float(macd_result["macd"])
-                    indicators["macd_signal"] = float(macd_result["signal"])
-                    indicators["macd_hist"] = float(macd_result["hist"])
+        Returns:
+            取引所 → シンボル → OHLCVRingBuffer.to_bytes() の辞書
+        """
+        state: Dict[str, Dict[str, bytes]] = {}
+        for (exchange, symbol), history in self._ohlcv_history.items():
+            state.setdefault(exchange, {})[symbol] = history.to_bytes()
+        return state
 
-        except Exception as e:
-            logger.error("Failed to calculate indicators: %s", e, exc_info=True)
+    def restore_state(self, state: Dict[str, Dict[str, bytes]]) -> None:
+        """チェックポイントからOHLCV履歴を復元し、指標エンジンを再構築します。
+
+        履歴の終値を古い順にエンジンへ流し込むため、シンボルあたり履歴の本数に比例した時間で完了します。
 
-        return indicators
+        Args:
+            state: export_state が返した辞書
+        """
+        for exchange, symbols in state.items():
+            for symbol, data in symbols.items():
+                key = (exchange, symbol)
+                engine = self._engines[key] = IndicatorEngine(self.indicators)
+                history = self._ohlcv_history[key] = OHLCVRingBuffer.from_bytes(data, self.history_capacity)
+                closes = history.close
+                for end in range(1, len(closes) + 1):
+                    engine.update(closes[:end])
+
+    def execute(self, ohlcv: OHLCV, features: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """OHLCVからテクニカル指標を計算します.
 
-    def _calculate_rsi(self, close: pd.Series, period: int = 14) -> Optional[float]:
-        """RSI（相対力指数）を計算します。
+        取引所・シンボルごとのインクリメンタル指標エンジンを1本分だけ更新するため、
+        履歴の長さに関係なく O(1) で計算できます。
 
         Args:
-            close: 終値のSeries
-            period: 期間（デフォルト: 14）
+            ohlcv: OHLCV エンティティ
+            features: バーの終了時点の板・約定の特徴量（OHLCVGeneratorUseCase.features_at_close、
+                省略時は板情報・約定履歴の現在の特徴量）
 
         Returns:
-            RSI値（計算できない場合は None）
+            指標の辞書（例: {'ma_5': 100.5, 'ma_20': 99.8, 'rsi': 65.2}）
         """
-        if len(close) < period + 1:
-            return None
-
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        # 履歴に追加
+        history = self._add_to_history(ohlcv)
 
-        if rsi.empty or pd.isna(rsi.iloc[-1]):
-            return None
+        try:
+            indicators = self._get_engine(ohlcv).update(history.close)
+            self._add_features(ohlcv, indicators, features)
+            return indicators
+        except Exception as e:
+            logger.error("Failed to calculate indicators: %s", e, exc_info=True)
+            return {}
 
-        return float(rsi.iloc[-1])
+    def execute_many(
+        self, ohlcvs: Sequence[OHLCV], features: Optional[Sequence[Mapping[str, float]]] = None
+    ) -> List[Dict[str, float]]:
+        """同時に確定した複数シンボルの OHLCV から、指標をまとめて計算します.
 
-    def _calculate_macd(
-        self, close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9
-    ) -> Optional[Dict[str, float]]:
-        """MACDを計算します。
+        各シンボルの直近の終値をシンボル × 本数の2次元配列に積み上げ、
+        指標ごとに1回のベクトル化した演算で全シンボル分を計算してから、シンボルごとの辞書に戻します。
+        同じ取引所・シンボルが複数回含まれる場合は、順序を保つためにそこでバッチを区切ります。
 
         Args:
-            close: 終値のSeries
-            fast: 短期EMA期間（デフォルト: 12）
-            slow: 長期EMA期間（デフォルト: 26）
-            signal: シグナル線の期間（デフォルト: 9）
+            ohlcvs: OHLCV エンティティのリスト（取引所・シンボルごとに古い順）
+            features: ohlcvs と同じ順の、バーの終了時点の板・約定の特徴量
+                （省略時は板情報・約定履歴の現在の特徴量）
 
         Returns:
-            MACD、シグナル、ヒストグラムの辞書（計算できない場合は None）
+            ohlcvs と同じ順の指標の辞書のリスト
         """
-        if len(close) < slow + signal:
-            return None
-
-        # EMA計算
-        ema_fast = close.ewm(span=fast, adjust=False).mean()
-        ema_slow = close.ewm(span=slow, adjust=False).mean()
+        results: List[Dict[str, float]] = []
+        batch: List[OHLCV] = []
+        batch_features: List[Optional[Mapping[str, float]]] = []
+        keys = set()
+        for index, ohlcv in enumerate(ohlcvs):
+            key = (ohlcv.exchange, ohlcv.symbol)
+            if key in keys:
+                results.extend(self._execute_batch(batch, batch_features))
+                batch = []
+                batch_features = []
+                keys.clear()
+            batch.append(ohlcv)
+            batch_features.append(features[index] if features is not None else None)
+            keys.add(key)
+        results.extend(self._execute_batch(batch, batch_features))
+        return results
+
+    def _execute_batch(
+        self, ohlcvs: List[OHLCV], features: List[Optional[Mapping[str, float]]]
+    ) -> List[Dict[str, float]]:
+        """取引所・シンボルの重複がない OHLCV の指標を計算します（少数の場合はシンボルごとに計算）。
 
-        # MACD線
-        macd_line = ema_fast - ema_slow
+        Args:
+            ohlcvs: OHLCV エンティティのリスト（取引所・シンボルの重複なし）
+            features: ohlcvs と同じ順の、バーの終了時点の板・約定の特徴量（None の場合は現在の特徴量）
 
-        # シグナル線
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        Returns:
+            ohlcvs と同じ順の指標の辞書のリスト
+        """
+        if len(ohlcvs) < self.min_batch_size:
+            return [self.execute(ohlcv, bar_features) for ohlcv, bar_features in zip(ohlcvs, features)]
 
-        # ヒストグラム
-        histogram = macd_line - signal_line
+        histories = [self._add_to_history(ohlcv) for ohlcv in ohlcvs]
+        try:
+            # 直近 required_history 本の終値を積み上げる（履歴が不足する分は NaN）
+            width = self._template.required_history
+            windows = np.full((len(ohlcvs), width), np.nan)
+            for row, history in zip(windows, histories):
+                closes = history.close[-width:]
+                row[width - len(closes) :] = closes
+
+            engines = [self._get_engine(ohlcv) for ohlcv in ohlcvs]
+            results = IndicatorEngine.update_batch(engines, windows)
+            for ohlcv, indicators, bar_features in zip(ohlcvs, results, features):
+                self._add_features(ohlcv, indicators, bar_features)
+            return results
+        except Exception as e:
+            logger.error("Failed to calculate indicators for %d symbols: %s", len(ohlcvs), e, exc_info=True)
+            return [{} for _ in ohlcvs]
 
-        if macd_line.empty or pd.isna(macd_line.iloc[-1]):
-            return None
+    def _add_features(
+        self, ohlcv: OHLCV, indicators: Dict[str, float], features: Optional[Mapping[str, float]] = None
+    ) -> None:
+        """板・約定の特徴量を指標の辞書に追加します。
 
-        return {
-            "macd": float(macd_line.iloc[-1]),
-            "signal": float(signal_line.iloc[-1]),
-            "hist": float(histogram.iloc[-1]),
-        }
+        Args:
+            ohlcv: OHLCV エンティティ
+            indicators: 指標の辞書
+            features: バーの終了時点の特徴量（省略時は板情報・約定履歴の現在の特徴量）
+        """
+        if features is not None:
+            indicators.update(features)
+            return
+        if self.order_books is not None:
+            # 板の特徴量（best_bid, best_ask, spread, bid_depth, ask_depth, book_imbalance など）
+            indicators.update(self.order_books.features(ohlcv.exchange, ohlcv.symbol))
+        if self.trade_tapes is not None:
+            # 約定の特徴量（vwap_10s, volume_delta_10s, trade_intensity_10s, avg_trade_size_10s など）
+            indicators.update(self.trade_tapes.features(ohlcv.exchange, ohlcv.symbol))
@@ -1,14 +1,123 @@
-from typing import Iterable
+"""Strategy Pipeline.
 
-from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+Application layer: 戦略処理のパイプライン
+責務: decode → aggregate → indicators → decide → publish/persist の各ステージを
+      上限付きキューで接続し、I/O（Redis XADD・Postgres INSERT）と CPU 処理を重ねて実行する
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from application.services.checkpoint import StrategyCheckpoint, signal_from_state, signal_to_state, stream_id_key
+from application.services.keyed_executor import KeyedExecutor
+from application.services.signal_publisher import SignalPublisherService
 from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
 from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
-from application.services.signal_publisher import SignalPublisherService
 from shared.domain.models import OHLCV, Signal
 
+if TYPE_CHECKING:
+    from application.interfaces.strategy import StrategyGrid
+    from shared.application.interfaces.i_ohlcv_repository import IOhlcvRepository
+    from shared.application.interfaces.i_signal_repository import ISignalRepository
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("decode", "aggregate", "indicators", "decide", "publish")
+
+# ステージの終了を下流に伝える番兵
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """ステージごとの処理件数とレイテンシ。"""
+
+    processed: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        """1件分の処理時間を記録します。
+
+        Args:
+            elapsed: 処理時間（秒）
+        """
+        self.processed += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+
+    @property
+    def avg_ms(self) -> float:
+        """平均処理時間（ミリ秒）。"""
+        return self.total_seconds / self.processed * 1000 if self.processed else 0.0
+
+
+class _Envelope:
+    """パイプラインを流れる1メッセージ分の作業単位。
+
+    message が None のものは、チェックポイントから引き継いだ配信待ちのシグナルだけを運びます。
+    """
+
+    __slots__ = ("message", "parsed", "bars", "features", "evaluated", "signals", "shadow_signals")
+
+    def __init__(self, message: Optional[Dict[str, Any]]) -> None:
+        self.message = message
+        self.parsed: Optional[Dict[str, Any]] = None
+        self.bars: List[OHLCV] = []
+        # 時間足 → 確定したバーの終了時点の板・約定の特徴量（aggregate ステージで保存する）
+        self.features: Dict[str, Dict[str, float]] = {}
+        self.evaluated: List[Tuple[OHLCV, Dict[str, float]]] = []
+        self.signals: List[Signal] = []
+        self.shadow_signals: List[Signal] = []
+
+
+def _distinct_market_runs(bars: List[Tuple[_Envelope, OHLCV]]) -> List[List[Tuple[_Envelope, OHLCV]]]:
+    """バーの列を、同じ取引所・シンボルを2回含まない連続した区間に分割します（順序は保持）。"""
+    runs: List[List[Tuple[_Envelope, OHLCV]]] = [[]]
+    markets = set()
+    for envelope, ohlcv in bars:
+        market = (ohlcv.exchange, ohlcv.symbol)
+        if market in markets:
+            runs.append([])
+            markets.clear()
+        runs[-1].append((envelope, ohlcv))
+        markets.add(market)
+    return runs
+
+
+class _Barrier:
+    """チェックポイントを取得するためにパイプラインを流れる番兵。
+
+    各ステージは自身より前に投入されたメッセージをすべて処理した時点でこの番兵を受け取るため、
+    番兵が通過した時点の状態を集めると、同じメッセージまでを反映した一貫した状態になります。
+    """
+
+    __slots__ = ("checkpoint", "future")
+
+    def __init__(self, checkpoint: StrategyCheckpoint, future: "asyncio.Future[StrategyCheckpoint]") -> None:
+        self.checkpoint = checkpoint
+        self.future = future
+
 
 class StrategyPipeline:
-    """Orchestrates OHLCV -> indicators -> signal -> publish."""
+    """Orchestrates decode -> aggregate -> indicators -> decide -> publish/persist.
+
+    各ステージは1つのタスクで上限付きの asyncio.Queue から順に取り出して処理するため、
+    シンボルごとの順序はパイプライン全体で保たれます。
+    publish/persist ステージはシグナルをまとめて配信し、保存はシンボル単位で並行に実行して、
+    遅いシンボルが他を止めないようにします。
+    下流が詰まるとキューが埋まり、submit が待機して XREADGROUP の読み込みが抑制されます。
+    decode/aggregate で失敗したメッセージは on_failed に渡され、ACK されずに pending に残ります
+    （PendingReclaimer による再処理・dead-letter の対象になる）。
+    aggregate を通過したメッセージは状態への反映が済んでいるため、以降の失敗では再処理に回しません。
+    indicators/decide で失敗したメッセージは指標・シグナルなしで保存・完了とし、
+    シグナルの配信に失敗したメッセージは計算済みのシグナルを保持して配信できるまで再送してから完了とします。
+    停止時に配信できなかったシグナルは、チェックポイントで次回の起動に引き継ぎます。
+    """
 
     def __init__(
         self,
@@ -16,17 +125,543 @@ class StrategyPipeline:
         indicator_calculator: IndicatorCalculatorUseCase,
         signal_generator: SignalGeneratorUseCase,
         publisher: SignalPublisherService,
+        on_done: Callable[[Dict[str, Any]], None],
+        ohlcv_repository: Optional["IOhlcvRepository"] = None,
+        signal_repository: Optional["ISignalRepository"] = None,
+        queue_size: int = 1000,
+        max_in_flight: int = 256,
+        publish_batch_size: int = 100,
+        stage_batch_size: int = 256,
+        on_failed: Optional[Callable[[Dict[str, Any]], None]] = None,
+        shadow_grid: Optional["StrategyGrid"] = None,
+        shadow_publisher: Optional[SignalPublisherService] = None,
+        publish_retry_interval: float = 1.0,
     ) -> None:
+        """Initialize Strategy Pipeline.
+
+        Args:
+            ohlcv_generator: OHLCV 生成ユースケース
+            indicator_calculator: 指標計算ユースケース
+            signal_generator: シグナル生成ユースケース
+            publisher: シグナル配信サービス
+            on_done: メッセージの処理が完了したときに呼ばれるコールバック（ACK 用）
+            ohlcv_repository: OHLCV リポジトリ（オプション）
+            signal_repository: Signal リポジトリ（オプション）
+            queue_size: ステージ間キューの上限
+            max_in_flight: publish/persist ステージで同時に実行するメッセージ数の上限
+            publish_batch_size: 1回の往復でシグナルを配信するメッセージ数の上限
+            stage_batch_size: indicators/decide ステージでまとめて処理するメッセージ数の上限
+            on_failed: メッセージの処理に失敗したときに呼ばれるコールバック
+                （省略した場合は on_done を呼び、失敗したメッセージも ACK する）
+            shadow_grid: パラメータグリッド（オプション、指定した場合は decide ステージで
+                全組み合わせを評価し、シャドーシグナルを生成する）
+            shadow_publisher: シャドーシグナルの配信先（本番のシグナルとは別の Stream、
+                配信に失敗してもメッセージの ACK には影響しない）
+            publish_retry_interval: 配信に失敗したシグナルを、新しいメッセージがなくても再送する間隔（秒）
+        """
         self.ohlcv_generator = ohlcv_generator
         self.indicator_calculator = indicator_calculator
         self.signal_generator = signal_generator
         self.publisher = publisher
+        self.ohlcv_repository = ohlcv_repository
+        self.signal_repository = signal_repository
+        self.shadow_grid = shadow_grid
+        self.shadow_publisher = shadow_publisher
+        self._on_done = on_done
+        self._on_failed = on_failed or on_done
+        self._publish_batch_size = publish_batch_size
+        self._stage_batch_size = stage_batch_size
+        self._publish_retry_interval = publish_retry_interval
+        # 配信に失敗し、再送を待っているメッセージ（古い順、計算済みのシグナルを保持する。
+        # message が None のものはチェックポイントから引き継いだシグナル）
+        self._unpublished: List[_Envelope] = []
+        self._queues: Dict[str, asyncio.Queue] = {
+            name: asyncio.Queue(maxsize=queue_size) for name in STAGES
+        }
+        self._stats: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+        self._executor = KeyedExecutor(max_in_flight=max_in_flight)
+        self._tasks: List[asyncio.Task] = []
+        self._reporter: Optional[asyncio.Task] = None
+        # Stream ごとに投入済みの最新のメッセージID（チェックポイント用）
+        self._last_ids: Dict[str, str] = {}
+
+    async def start(self, report_interval: float = 60.0) -> None:
+        """各ステージのタスクを開始します。
+
+        Args:
+            report_interval: ステージ統計をログ出力する間隔（秒、0 以下で無効）
+        """
+        bodies: Dict[str, Callable[[_Envelope], Awaitable[bool]]] = {
+            "decode": self._decode,
+            "aggregate": self._aggregate,
+        }
+        # 多数のシンボルのバーが同時に確定するステージは、溜まっているメッセージをまとめて処理する
+        batch_bodies: Dict[str, Callable[[List[_Envelope]], None]] = {
+            "indicators": self._indicators,
+            "decide": self._decide,
+        }
+        for index, name in enumerate(STAGES[:-1]):
+            if name in batch_bodies:
+                self._tasks.append(
+                    asyncio.create_task(self._run_batch_stage(name, batch_bodies[name], STAGES[index + 1]))
+                )
+                continue
+            self._tasks.append(
+                asyncio.create_task(self._run_stage(name, bodies[name], STAGES[index + 1]))
+            )
+        self._tasks.append(asyncio.create_task(self._run_publish_stage()))
+        if report_interval > 0:
+            self._reporter = asyncio.create_task(self._report_loop(report_interval))
+
+    async def submit(self, message: Dict[str, Any]) -> None:
+        """メッセージをパイプラインに投入します（キューが満杯の場合は空くまで待機）。
+
+        Args:
+            message: Redis Stream から取得したメッセージ
+        """
+        self._track(message)
+        await self._queues["decode"].put(_Envelope(message))
+
+    async def checkpoint(self) -> StrategyCheckpoint:
+        """投入済みのメッセージまでを反映した状態のチェックポイントを取得します。
+
+        実行中はパイプラインに番兵を流し、各ステージが番兵を受け取った時点の状態を集めます
+        （ステージを止めずに一貫した状態を取得できる）。停止中はその場で状態を集めます。
+
+        Returns:
+            StrategyCheckpoint
+        """
+        checkpoint = StrategyCheckpoint(stream_ids=dict(self._last_ids), created_at=time.time())
+        if not self._tasks:
+            for name in STAGES:
+                self._capture(name, checkpoint)
+            return checkpoint
+
+        barrier = _Barrier(checkpoint, asyncio.get_running_loop().create_future())
+        await self._queues["decode"].put(barrier)
+        return await barrier.future
+
+    def restore(self, checkpoint: StrategyCheckpoint) -> None:
+        """チェックポイントから状態を復元します（start の前に呼び出すこと）。
+
+        停止前に配信できなかったシグナルは再送待ちに戻し、start 後に publish/persist ステージで配信・保存します。
+
+        Args:
+            checkpoint: checkpoint で取得した StrategyCheckpoint
+        """
+        self.ohlcv_generator.restore_state(checkpoint.open_bars)
+        self.indicator_calculator.restore_state(checkpoint.history)
+        self.signal_generator.restore_state(checkpoint.strategy)
+        self._last_ids.update(checkpoint.stream_ids)
+        if checkpoint.unpublished:
+            envelope = _Envelope(None)
+            envelope.signals = [signal_from_state(state) for state in checkpoint.unpublished]
+            self._unpublished.append(envelope)
+
+    def warm_up(self, ohlcvs: List[OHLCV]) -> int:
+        """過去の OHLCV で指標と戦略の状態を初期化します（シグナルは配信しない、start の前に呼び出すこと）。
+
+        戦略が使用する時間足のバーだけを指標エンジンに読み込み、取引所・シンボルごとの最後のバーで
+        戦略の判断を1回実行して、クロス判定に必要な前回の値を設定します。
+
+        Args:
+            ohlcvs: OHLCV エンティティのリスト（取引所・シンボル・時間足ごとに古い順）
+
+        Returns:
+            指標エンジンに読み込んだ取引所・シンボルの数
+        """
+        timeframe = self.signal_generator.strategy.timeframe
+        latest = self.indicator_calculator.warm_up([ohlcv for ohlcv in ohlcvs if ohlcv.timeframe == timeframe])
+        for ohlcv, indicators in latest.values():
+            self.signal_generator.execute_all(ohlcv, indicators)
+        return len(latest)
+
+    async def replay(self, message: Dict[str, Any], publish: bool = False) -> None:
+        """メッセージで状態だけを更新します（start の前に呼び出すこと）。
+
+        チェックポイントの復元後に、停止前に配信済みのメッセージを再適用するために使用します。
+        publish=True の場合は、生成したシグナルを再送待ちとして保持し、start 後に publish/persist ステージで
+        配信・保存してから on_done を呼び出します（停止前に処理が完了していない pending メッセージ用）。
+        それ以外の場合は on_done・on_failed を呼び出しません。
+
+        Args:
+            message: Redis Stream から取得したメッセージ
+            publish: 生成したシグナルを配信するか
+        """
+        self._track(message)
+        envelope = _Envelope(message)
+        try:
+            if await self._decode(envelope) and await self._aggregate(envelope):
+                self._indicators([envelope])
+                self._decide([envelope])
+        except Exception as e:
+            logger.error("Failed to replay message %s: %s", message.get("id"), e, exc_info=True)
+            return
+        if publish and envelope.signals:
+            envelope.shadow_signals = []
+            self._unpublished.append(envelope)
+
+    async def evaluate(self, messages: Sequence[Dict[str, Any]]) -> Tuple[List[Signal], List[Signal]]:
+        """メッセージをまとめて decode → aggregate → indicators → decide のステージ処理に通します。
+
+        ステージのキューを経由せずに同じタスクで実行するため、結果はタイミングに依存しません
+        （配信・保存・ACK は行わない、リプレイ用、start の前に呼び出すこと）。
+        indicators/decide は実行中の stage_batch_size 本のバッチと同じく、messages 全体をまとめて処理します。
+
+        Args:
+            messages: Redis Stream のメッセージのリスト（古い順）
+
+        Returns:
+            (シグナルのリスト, シャドーシグナルのリスト)（メッセージの順）
+        """
+        batch: List[_Envelope] = []
+        for message in messages:
+            self._track(message)
+            envelope = _Envelope(message)
+            if await self._decode(envelope) and await self._aggregate(envelope):
+                batch.append(envelope)
+        if batch:
+            self._indicators(batch)
+            self._decide(batch)
+        return (
+            [signal for envelope in batch for signal in envelope.signals],
+            [signal for envelope in batch for signal in envelope.shadow_signals],
+        )
+
+    async def stop(self) -> None:
+        """投入済みのメッセージをすべて処理してからステージを停止します。"""
+        if not self._tasks:
+            return
+        await self._queues["decode"].put(_STOP)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._executor.join()
+        self._tasks = []
+        if self._reporter:
+            self._reporter.cancel()
+            self._reporter = None
+        self.log_stats()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """ステージごとのキュー長とレイテンシを返します。
+
+        Returns:
+            ステージ名をキーとする統計の辞書
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for name in STAGES:
+            stats = self._stats[name]
+            depth = self._queues[name].qsize()
+            if name == "publish":
+                # publish/persist はシンボル単位で並行実行されるため、実行中の件数も含める
+                depth += self._executor.in_flight
+            result[name] = {
+                "queue_depth": depth,
+                "processed": stats.processed,
+                "avg_ms": stats.avg_ms,
+                "max_ms": stats.max_seconds * 1000,
+            }
+        return result
+
+    def log_stats(self) -> None:
+        """ステージ統計をログに出力します。"""
+        for name, stats in self.stats().items():
+            logger.info(
+                "Pipeline stage stats: stage=%s, queue_depth=%d, processed=%d, avg_ms=%.3f, max_ms=%.3f",
+                name,
+                stats["queue_depth"],
+                stats["processed"],
+                stats["avg_ms"],
+                stats["max_ms"],
+            )
+
+    def _track(self, message: Dict[str, Any]) -> None:
+        """Stream ごとに投入済みの最新のメッセージIDを記録します。"""
+        stream_name = message.get("stream")
+        message_id = message.get("id")
+        if not stream_name or not message_id:
+            return
+        last = self._last_ids.get(stream_name)
+        # 回収した pending メッセージは古い ID のため、最新の ID を後退させない
+        if last is None or stream_id_key(message_id) > stream_id_key(last):
+            self._last_ids[stream_name] = message_id
+
+    def _capture(self, name: str, checkpoint: StrategyCheckpoint) -> None:
+        """ステージが管理する状態をチェックポイントに書き込みます。"""
+        if name == "aggregate":
+            checkpoint.open_bars = self.ohlcv_generator.export_state()
+        elif name == "indicators":
+            checkpoint.history = self.indicator_calculator.export_state()
+        elif name == "decide":
+            checkpoint.strategy = self.signal_generator.export_state()
+        elif name == "publish":
+            # pending のメッセージに対応するシグナルはリプレイで再生成されるため、引き継いだものだけを保存する
+            checkpoint.unpublished = [
+                signal_to_state(signal)
+                for envelope in self._unpublished
+                if envelope.message is None
+                for signal in envelope.signals
+            ]
+
+    async def _run_stage(
+        self,
+        name: str,
+        body: Callable[[_Envelope], Awaitable[bool]],
+        next_name: str,
+    ) -> None:
+        """キューから取り出したメッセージにステージ処理を適用し、次のステージへ渡します。
+
+        Args:
+            name: ステージ名
+            body: ステージ処理（次のステージへ渡す場合は True、処理完了の場合は False を返す）
+            next_name: 次のステージ名
+        """
+        queue = self._queues[name]
+        next_queue = self._queues[next_name]
+        stats = self._stats[name]
+
+        while True:
+            envelope = await queue.get()
+            if envelope is _STOP:
+                await next_queue.put(_STOP)
+                return
+            if isinstance(envelope, _Barrier):
+                self._capture(name, envelope.checkpoint)
+                await next_queue.put(envelope)
+                continue
+
+            started = time.perf_counter()
+            try:
+                forward = await body(envelope)
+            except Exception as e:
+                # ACK せずに pending に残す（再処理を繰り返すメッセージは dead-letter に移動される）
+                logger.error("Error processing message in stage %s: %s", name, e, exc_info=True)
+                stats.record(time.perf_counter() - started)
+                self._on_failed(envelope.message)
+                continue
+            stats.record(time.perf_counter() - started)
+
+            if forward:
+                # 下流が詰まっている場合はここで待機する（バックプレッシャー）
+                await next_queue.put(envelope)
+            else:
+                self._on_done(envelope.message)
+
+    async def _run_batch_stage(
+        self,
+        name: str,
+        body: Callable[[List[_Envelope]], None],
+        next_name: str,
+    ) -> None:
+        """キューに溜まっているメッセージをまとめて取り出してステージ処理を適用し、次のステージへ渡します。
+
+        秒の変わり目に多数のシンボルのバーが同時に確定した場合でも、
+        指標の計算と戦略の判断はシンボル方向の配列に対する1回のベクトル化した演算で行われます。
+        番兵（停止・チェックポイント）の前後のメッセージは同じバッチに含めません。
+
+        Args:
+            name: ステージ名
+            body: ステージ処理（バッチ内のメッセージをまとめて処理する）
+            next_name: 次のステージ名
+        """
+        queue = self._queues[name]
+        next_queue = self._queues[next_name]
+        stats = self._stats[name]
+
+        while True:
+            batch = [await queue.get()]
+            while (
+                not queue.empty()
+                and len(batch) < self._stage_batch_size
+                and isinstance(batch[-1], _Envelope)
+            ):
+                batch.append(queue.get_nowait())
+            marker = batch.pop() if not isinstance(batch[-1], _Envelope) else None
+
+            if batch:
+                started = time.perf_counter()
+                try:
+                    body(batch)
+                except Exception as e:
+                    # ティックは aggregate ステージで状態に反映済みのため、再処理に回すと出来高・約定履歴が
+                    # 二重に反映される。指標・シグナルなしで次のステージへ渡し、バーの保存と ACK は行う
+                    logger.error(
+                        "Error processing %d messages in stage %s, forwarding them without signals: %s",
+                        len(batch),
+                        name,
+                        e,
+                        exc_info=True,
+                    )
+                    for envelope in batch:
+                        envelope.evaluated = []
+                        envelope.signals = []
+                        envelope.shadow_signals = []
+                # 1件あたりの処理時間（バッチ全体の処理時間を按分）を記録する
+                elapsed = (time.perf_counter() - started) / max(len(batch), 1)
+                for envelope in batch:
+                    stats.record(elapsed)
+                    await next_queue.put(envelope)
+
+            if marker is _STOP:
+                await next_queue.put(_STOP)
+                return
+            if isinstance(marker, _Barrier):
+                self._capture(name, marker.checkpoint)
+                await next_queue.put(marker)
+
+    async def _run_publish_stage(self) -> None:
+        """publish/persist ステージ: シグナルをまとめて配信し、保存はシンボル単位で並行に行います。
+
+        キューに溜まっているメッセージをまとめて取り出し、そのシグナルを1回の往復で配信します
+        （相場全体が動いて多数のシンボルで同時にシグナルが発生しても往復は1回）。
+        配信に失敗したシグナルは、ティックを再処理すると出来高・約定履歴が二重に反映されるため
+        pending からの再処理には回さず、次のバッチ（新しいメッセージがなければ publish_retry_interval 秒後）で
+        新しいシグナルより先に再送します。
+        停止時に配信できなかったシグナルは再送待ちに残してメッセージを完了とし、
+        チェックポイントで次回の起動に引き継ぎます。
+        """
+        queue = self._queues["publish"]
+        stopping = False
+        while not stopping:
+            batch: List[Any] = []
+            if self._unpublished:
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), self._publish_retry_interval))
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                batch.append(await queue.get())
+            while not queue.empty() and len(batch) < self._publish_batch_size:
+                batch.append(queue.get_nowait())
+            if batch and batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            if any(isinstance(envelope, _Barrier) for envelope in batch):
+                # 番兵はすべてのステージを通過済みのため、チェックポイントを返す
+                for barrier in batch:
+                    if isinstance(barrier, _Barrier) and not barrier.future.done():
+                        self._capture("publish", barrier.checkpoint)
+                        barrier.future.set_result(barrier.checkpoint)
+                batch = [envelope for envelope in batch if not isinstance(envelope, _Barrier)]
+
+            started = time.perf_counter()
+            # 再送待ちのシグナルを先に配信する（シンボルごとのシグナルの順序を保つ）
+            retry, self._unpublished = self._unpublished, []
+            completed = retry + batch
+            signals = [signal for envelope in completed for signal in envelope.signals]
+            if signals:
+                try:
+                    await self.publisher.publish_many(signals)
+                except Exception as e:
+                    if stopping:
+                        # 停止時に配信できないシグナルはチェックポイントで引き継ぎ、メッセージは ACK する
+                        # （pending に残すと次回の起動時にティックが二重に反映されるため）。
+                        # シグナルの保存は次回の起動時に配信してから行う
+                        logger.error(
+                            "Carrying %d unpublished signals over to the checkpoint on shutdown: %s",
+                            len(signals),
+                            e,
+                            exc_info=True,
+                        )
+                        carried = _Envelope(None)
+                        carried.signals = signals
+                        self._unpublished = [carried]
+                        completed = [envelope for envelope in completed if envelope.message is not None]
+                        for envelope in completed:
+                            envelope.signals = []
+                    else:
+                        logger.error(
+                            "Failed to publish %d signals, retrying: %s", len(signals), e, exc_info=True
+                        )
+                        # 配信できなかったメッセージは保存・ACK せず、計算済みのシグナルを再送まで保持する
+                        self._unpublished = [envelope for envelope in completed if envelope.signals]
+                        completed = [envelope for envelope in completed if not envelope.signals]
+
+            shadow_signals = [signal for envelope in batch for signal in envelope.shadow_signals]
+            if shadow_signals and self.shadow_publisher is not None:
+                try:
+                    await self.shadow_publisher.publish_many(shadow_signals)
+                except Exception as e:
+                    # シャドーシグナルはペーパートレード用のため、配信できなくても処理を続ける
+                    logger.warning("Failed to publish %d shadow signals: %s", len(shadow_signals), e)
+
+            for envelope in completed:
+                symbol = envelope.bars[0].symbol if envelope.bars else envelope.signals[0].symbol
+                await self._executor.submit(
+                    symbol, lambda envelope=envelope: self._persist(envelope, started)
+                )
+
+    async def _decode(self, envelope: _Envelope) -> bool:
+        """decode ステージ: メッセージをパースします。"""
+        envelope.parsed = self.ohlcv_generator.parse_message(envelope.message)
+        return envelope.parsed is not None
+
+    async def _aggregate(self, envelope: _Envelope) -> bool:
+        """aggregate ステージ: ティックを未確定バーに反映し、確定したバーを受け取ります。
+
+        板情報・約定履歴は後続のメッセージでこのステージが更新し続けるため、
+        確定したバーの終了時点の特徴量をここで取得してメッセージと一緒に渡します。
+        """
+        envelope.bars = self.ohlcv_generator.apply_tick(envelope.parsed)
+        for ohlcv in envelope.bars:
+            envelope.features[ohlcv.timeframe] = self.ohlcv_generator.features_at_close(ohlcv)
+        return bool(envelope.bars)
+
+    def _indicators(self, batch: List[_Envelope]) -> None:
+        """indicators ステージ: 戦略が使用する時間足のバーについて、指標をまとめて計算します。
+
+        パラメータグリッドは共有の終値履歴がそのバーまでを反映している間に評価する必要があるため、
+        グリッドがある場合は同じ取引所・シンボルが2回現れないところで区切って計算します。
+        """
+        timeframe = self.signal_generator.strategy.timeframe
+        bars = [
+            (envelope, ohlcv) for envelope in batch for ohlcv in envelope.bars if ohlcv.timeframe == timeframe
+        ]
+        for envelope in batch:
+            envelope.evaluated = []
+        for run in _distinct_market_runs(bars) if self.shadow_grid is not None else [bars]:
+            results = self.indicator_calculator.execute_many(
+                [ohlcv for _, ohlcv in run], [envelope.features.get(ohlcv.timeframe, {}) for envelope, ohlcv in run]
+            )
+            for (envelope, ohlcv), indicators in zip(run, results):
+                envelope.evaluated.append((ohlcv, indicators))
+                if self.shadow_grid is not None:
+                    # 共有の終値履歴から、パラメータグリッドの全組み合わせをまとめて評価する
+                    history = self.indicator_calculator.get_history(ohlcv.exchange, ohlcv.symbol)
+                    if history is not None:
+                        envelope.shadow_signals.extend(self.shadow_grid.evaluate(ohlcv, history.close))
+
+    def _decide(self, batch: List[_Envelope]) -> None:
+        """decide ステージ: 共通の指標に対して、すべての戦略インスタンスのロジックでまとめてシグナルを生成します。"""
+        evaluated = [(envelope, ohlcv, indicators) for envelope in batch for ohlcv, indicators in envelope.evaluated]
+        results = self.signal_generator.execute_batch(
+            [ohlcv for _, ohlcv, _ in evaluated], [indicators for _, _, indicators in evaluated]
+        )
+        for (envelope, _, _), signals in zip(evaluated, results):
+            envelope.signals.extend(signals)
+
+    async def _persist(self, envelope: _Envelope, started: float) -> None:
+        """publish/persist ステージ: 配信済みのメッセージの OHLCV・シグナルを保存します。"""
+        try:
+            # OHLCV を保存
+            if self.ohlcv_repository and envelope.bars:
+                try:
+                    await self.ohlcv_repository.save_many(envelope.bars)
+                except Exception as e:
+                    logger.error("Failed to save OHLCV: %s", e, exc_info=True)
 
-    def process(self, raw_messages: Iterable[dict]) -> None:
-        for raw in raw_messages:
-            ohlcv: OHLCV = self.ohlcv_generator.execute(raw)
-            indicators = self.indicator_calculator.execute(ohlcv)
-            signal: Signal | None = self.signal_generator.execute(ohlcv, indicators)
-            if signal:
-                self.publisher.publish(signal)
+            # シグナルを保存（outbox の場合はバッファに追加するだけで、コミットを待たない）
+            if self.signal_repository and envelope.signals:
+                try:
+                    await self.signal_repository.save_many(envelope.signals)
+                except Exception as e:
+                    logger.error("Failed to save signal: %s", e, exc_info=True)
+        finally:
+            self._stats["publish"].record(time.perf_counter() - started)
+            if envelope.message is not None:
+                self._on_done(envelope.message)
 
+    async def _report_loop(self, interval: float) -> None:
+        """一定間隔でステージ統計をログに出力します。"""
+        while True:
+            await asyncio.sleep(interval)
+            self.log_stats()
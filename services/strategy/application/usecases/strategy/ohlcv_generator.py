@@ -5,12 +5,9 @@ Application layer: OHLCV生成ユースケース
 """
 import json
 import logging
-from collections import defaultdict
-from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
-import pandas as pd
+from domain.market import CascadingBarAggregator, OrderBookStore, TradeTapeStore, parse_timeframe
 from shared.domain.models import OHLCV
 
 if TYPE_CHECKING:
@@ -18,171 +15,244 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Stream 名とメッセージタイプの対応
+STREAM_TYPES = {
+    "md:ticker": "ticker",
+    "md:trade": "trade",
+    "md:orderbook": "orderbook",
+}
+
+# 約定の売買方向（テイカー側）
+_TRADE_SIDES = {"BUY": 1, "SELL": -1, "buy": 1, "sell": -1}
+
+
+def _decode_json_data(fields: Mapping[str, Any]) -> Any:
+    """data フィールドを JSON としてデコードします（デコーダー未指定時のデフォルト）。"""
+    data = fields.get("data", "{}")
+    return json.loads(data) if isinstance(data, (str, bytes)) else data
+
 
 class OHLCVGeneratorUseCase:
     """Generate OHLCV from raw market data.
 
     市場データ（ticker/trade）からOHLCV（ローソク足）を生成します。
-    時間足ごと（1秒/1分/5分など）に集約します。
+    メッセージの ts で時間足のバケットを判定し、バーが確定したときだけ OHLCV を返します。
+    上位の時間足（1分/5分/1時間など）は確定した下位のバーから段階的に集約します。
     """
 
-    def __init__(self, repository: Optional["IOhlcvRepository"] = None) -> None:
+    def __init__(
+        self,
+        repository: Optional["IOhlcvRepository"] = None,
+        timeframes: Sequence[str] = ("1s",),
+        decode_data: Optional[Callable[[Mapping[str, Any]], Any]] = None,
+        order_books: Optional[OrderBookStore] = None,
+        trade_tapes: Optional[TradeTapeStore] = None,
+    ) -> None:
         """Initialize OHLCV Generator Use Case.
 
         Args:
             repository: OHLCV リポジトリ（オプション、将来の永続化用）
+            timeframes: 生成する時間足（例: ["1s", "1m", "5m"]、デフォルト: ["1s"]）。
+                最小の時間足をティックから集約し、上位の時間足は確定したバーから順に集約します
+            decode_data: メッセージのフィールドから data をデコードする関数
+                （Infrastructure 層のコーデック、デフォルト: JSON）
+            order_books: md:orderbook のメッセージを反映する板情報（オプション、
+                指定しない場合は板情報のメッセージを読み飛ばす）
+            trade_tapes: md:trade の約定を追加する約定履歴（オプション）
         """
         self.repository = repository
-        # シンボルごとの時系列データを保持（メモリ上）
-        self._ticker_buffer: Dict[str, list] = defaultdict(list)
-        self._trade_buffer: Dict[str, list] = defaultdict(list)
+        self._decode_data = decode_data or _decode_json_data
+        self.order_books = order_books
+        self.trade_tapes = trade_tapes
+        # 取引所・シンボル・時間足ごとに未確定のバーを1本だけ保持する（生のティックは保持しない）
+        self._aggregator = CascadingBarAggregator(timeframes)
+        self.base_timeframe = self._aggregator.timeframes[0]
+        # (時間足, 取引所, シンボル) → (未確定のバーの終了時刻, その時点の板・約定の特徴量)
+        self._snapshots: Dict[Tuple[str, str, str], Tuple[int, Dict[str, float]]] = {}
+
+    def export_state(self) -> Dict[str, Dict[str, Dict[str, List[Any]]]]:
+        """未確定のバーを返します（チェックポイント用）。
+
+        Returns:
+            時間足 → 取引所 → シンボル → 未確定のバーの辞書
+        """
+        return self._aggregator.export_open_bars()
+
+    def restore_state(self, state: Dict[str, Dict[str, Dict[str, List[Any]]]]) -> None:
+        """チェックポイントから未確定のバーを復元します。
 
-    def _parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        Args:
+            state: export_state が返した辞書
+        """
+        self._aggregator.restore_open_bars(state)
+
+    def parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Redis Stream メッセージをパースします。
 
         Args:
             message: Redis Stream メッセージ
 
         Returns:
-            パースされたメッセージ（None の場合は無効）
+            パースされたメッセージ（None の場合は無効。ts が欠落・不正なメッセージも無効として読み飛ばす）
         """
         try:
             fields = message.get("fields", {})
-            stream_name = message.get("stream", "")
 
             # Stream 名からタイプを判定
-            if "ticker" in stream_name:
-                msg_type = "ticker"
-            elif "trade" in stream_name:
-                msg_type = "trade"
-            elif "orderbook" in stream_name:
-                msg_type = "orderbook"
-            else:
+            msg_type = STREAM_TYPES.get(message.get("stream", ""))
+            if msg_type is None:
+                return None
+
+            # バケットの判定に使うため、ts がないメッセージを 1970-01-01 のティックとして扱わない
+            try:
+                ts = int(fields.get("ts"))
+            except (TypeError, ValueError):
+                logger.warning(
+                    "Skipping message without a valid ts: stream=%s, id=%s, ts=%r",
+                    message.get("stream"),
+                    message.get("id"),
+                    fields.get("ts"),
+                )
                 return None
 
-            # データをパース
-            data_str = fields.get("data", "{}")
-            data = json.loads(data_str) if isinstance(data_str, str) else data_str
+            # データをデコード
+            data = self._decode_data(fields)
 
             return {
                 "type": msg_type,
                 "exchange": fields.get("exchange", ""),
                 "symbol": fields.get("symbol", ""),
-                "ts": int(fields.get("ts", 0)),
+                "ts": ts,
                 "data": data,
             }
         except Exception as e:
             logger.error("Failed to parse message: %s", e, exc_info=True)
             return None
 
-    def _add_to_buffer(self, parsed: Dict[str, Any]) -> None:
-        """パースされたメッセージをバッファに追加します。
+    def apply_tick(self, parsed: Dict[str, Any]) -> List[OHLCV]:
+        """パースされたメッセージを未確定バーに反映します。
+
+        ticker の volume は24時間出来高（累積値）のため、バーの出来高には trade の size のみを加算します。
 
         Args:
             parsed: パースされたメッセージ
+
+        Returns:
+            確定した OHLCV のリスト（下位の時間足から順、確定なしの場合は空）
         """
-        symbol = parsed["symbol"]
-        ts = parsed["ts"]
+        data = parsed["data"]
+        if self.order_books is not None or self.trade_tapes is not None:
+            self._snapshot_features(parsed["exchange"], parsed["symbol"], parsed["ts"])
 
         if parsed["type"] == "ticker":
-            data = parsed["data"]
-            # ticker データから価格とボリュームを取得
             price = float(data.get("last", data.get("close", 0)))
-            volume = float(data.get("volume", 0))
-            self._ticker_buffer[symbol].append({"ts": ts, "price": price, "volume": volume})
+            volume = 0.0
         elif parsed["type"] == "trade":
-            data = parsed["data"]
             price = float(data.get("price", 0))
-            size = float(data.get("size", 0))
-            self._trade_buffer[symbol].append({"ts": ts, "price": price, "size": size})
+            volume = float(data.get("size", 0))
+            if self.trade_tapes is not None and price > 0:
+                self.trade_tapes.append(
+                    parsed["exchange"], parsed["symbol"], parsed["ts"], price, volume, _TRADE_SIDES.get(data.get("side"), 0)
+                )
+        else:
+            # 板情報はバーを生成せず、板の状態だけを更新する
+            if parsed["type"] == "orderbook" and self.order_books is not None:
+                self.order_books.apply(parsed["exchange"], parsed["symbol"], data, parsed["ts"])
+            return []
 
-    def _generate_ohlcv_from_buffer(
-        self, symbol: str, exchange: str, timeframe: str = "1s"
-    ) -> Optional[OHLCV]:
-        """バッファからOHLCVを生成します。
+        if price <= 0:
+            return []
 
-        Args:
-            symbol: シンボル（例: "BTC_JPY"）
-            exchange: 取引所名（例: "gmo"）
-            timeframe: 時間足（例: "1s", "1m", "5m"）
+        return self._aggregator.update(parsed["exchange"], parsed["symbol"], parsed["ts"], price, volume)
 
-        Returns:
-            OHLCV エンティティ（データが不足している場合は None）
-        """
-        # ticker と trade のデータをマージ
-        ticker_data = self._ticker_buffer.get(symbol, [])
-        trade_data = self._trade_buffer.get(symbol, [])
+    def features_at_close(self, ohlcv: OHLCV) -> Dict[str, float]:
+        """確定したバーの終了時点の板・約定の特徴量を返します。
 
-        if not ticker_data and not trade_data:
-            return None
+        特徴量はバーの終了時刻を越える最初のメッセージを反映する前に保存されるため、
+        バーを確定させたティックや、その後に届いたメッセージは含みません。
 
-        # 時間足に応じた集約
-        if timeframe == "1s":
-            # 1秒足: 最新の1秒間のデータを使用
-            now = datetime.now()
-            cutoff = now - timedelta(seconds=1)
-            cutoff_ts = int(cutoff.timestamp() * 1000)
+        Args:
+            ohlcv: apply_tick が返した OHLCV
 
-            # 最新のデータを使用
-            all_data = ticker_data + trade_data
-            if not all_data:
-                return None
+        Returns:
+            特徴量の辞書（板情報・約定履歴を使用しない場合は空）
+        """
+        snapshot = self._snapshots.get((ohlcv.timeframe, ohlcv.exchange, ohlcv.symbol))
+        if snapshot is None:
+            # チェックポイントから復元した直後などで保存されていない場合は、現在の特徴量を使用する
+            end_ms = int(ohlcv.timestamp.timestamp() * 1000) + parse_timeframe(ohlcv.timeframe)
+            return self._market_features(ohlcv.exchange, ohlcv.symbol, end_ms)
+        return snapshot[1]
 
-            # 最新の価格データを取得
-            latest = max(all_data, key=lambda x: x["ts"])
-            price = latest.get("price", 0)
-
-            # ボリュームを集計
-            volume = sum(d.get("volume", d.get("size", 0)) for d in all_data if d["ts"] >= cutoff_ts)
-
-            # OHLCV を生成（簡易版: 同じ価格を O/H/L/C に設定）
-            ohlcv = OHLCV(
-                exchange=exchange,
-                symbol=symbol,
-                timeframe=timeframe,
-                timestamp=datetime.fromtimestamp(latest["ts"] / 1000),
-                open=Decimal(str(price)),
-                high=Decimal(str(price)),
-                low=Decimal(str(price)),
-                close=Decimal(str(price)),
-                volume=Decimal(str(volume)),
-            )
-
-            # バッファをクリア（1秒足の場合）
-            self._ticker_buffer[symbol] = []
-            self._trade_buffer[symbol] = []
-
-            return ohlcv
-        else:
-            # より長い時間足の場合は pandas を使用して集約
-            # 簡易実装: 1秒足を生成してからリサンプリング
-            # TODO: より効率的な実装に改善
-            return None
+    def _snapshot_features(self, exchange: str, symbol: str, ts: int) -> None:
+        """未確定のバーの終了時刻を越えるメッセージを反映する前に、その時点の板・約定の特徴量を保存します。
 
-    def execute(self, raw_message: Dict[str, Any]) -> Optional[OHLCV]:
-        """市場データからOHLCVを生成します。
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+            ts: これから反映するメッセージのタイムスタンプ（エポックミリ秒）
+        """
+        captured: Optional[Tuple[int, Dict[str, float]]] = None
+        for timeframe, end_ms in self._aggregator.open_bar_ends(exchange, symbol):
+            key = (timeframe, exchange, symbol)
+            if end_ms is None:
+                # 未確定のバーがない上位の時間足は、このメッセージで確定する下位のバーから作られて
+                # そのまま確定する場合があるため、下位の時間足と同じ時点の特徴量を保存する
+                if captured is not None:
+                    self._snapshots[key] = captured
+                continue
+            if ts < end_ms:
+                continue
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot[0] == end_ms:
+                # 同じ境界を越えたメッセージで保存済み
+                captured = snapshot
+                continue
+            if captured is None or captured[0] != end_ms:
+                captured = (end_ms, self._market_features(exchange, symbol, end_ms))
+            self._snapshots[key] = captured
+
+    def _market_features(self, exchange: str, symbol: str, as_of_ms: int) -> Dict[str, float]:
+        """板・約定の現在の特徴量を返します（約定の時間窓は as_of_ms を基準とする）。"""
+        features: Dict[str, float] = {}
+        if self.order_books is not None:
+            # 板の特徴量（best_bid, best_ask, spread, bid_depth, ask_depth, book_imbalance など）
+            features.update(self.order_books.features(exchange, symbol))
+        if self.trade_tapes is not None:
+            # 約定の特徴量（vwap_10s, volume_delta_10s, trade_intensity_10s, avg_trade_size_10s など）
+            features.update(self.trade_tapes.features(exchange, symbol, as_of_ms))
+        return features
+
+    def execute_all(self, raw_message: Dict[str, Any]) -> List[OHLCV]:
+        """市場データから、確定したすべての時間足の OHLCV を生成します。
 
         Args:
             raw_message: Redis Stream から取得した生メッセージ
 
         Returns:
-            OHLCV エンティティ（生成できない場合は None）
+            確定した OHLCV のリスト（下位の時間足から順、確定なしの場合は空）
         """
         # メッセージをパース
-        parsed = self._parse_message(raw_message)
+        parsed = self.parse_message(raw_message)
         if not parsed:
-            return None
+            return []
 
-        exchange = parsed["exchange"]
-        symbol = parsed["symbol"]
+        # 未確定バーに反映し、境界を越えた場合のみ確定した OHLCV を受け取る
+        # 注意: リポジトリへの保存は main.py で非同期に実行されます
+        return self.apply_tick(parsed)
 
-        # バッファに追加
-        self._add_to_buffer(parsed)
+    def execute(self, raw_message: Dict[str, Any]) -> Optional[OHLCV]:
+        """市場データから最小の時間足の OHLCV を生成します。
 
-        # OHLCV を生成（1秒足）
-        ohlcv = self._generate_ohlcv_from_buffer(symbol, exchange, timeframe="1s")
+        上位の時間足も内部では集約されます。すべての時間足が必要な場合は execute_all を使用してください。
 
-        # 注意: リポジトリへの保存は main.py で非同期に実行されます
-        # ここでは生成のみを行います
+        Args:
+            raw_message: Redis Stream から取得した生メッセージ
 
-        return ohlcv
+        Returns:
+            確定した OHLCV エンティティ（バーが確定していない場合は None）
+        """
+        for ohlcv in self.execute_all(raw_message):
+            if ohlcv.timeframe == self.base_timeframe:
+                return ohlcv
+        return None
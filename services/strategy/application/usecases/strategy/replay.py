@@ -0,0 +1,135 @@
+"""Replay Use Case.
+
+Application layer: 記録した市場データのリプレイ
+責務: 記録した md:* のメッセージを本番と同じ OHLCV生成 → 指標計算 → シグナル生成の処理に
+      CPU の限界の速度で通し、イベント時刻の時計で決定的に再現したシグナルとスループットを報告する
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from application.services.message_time import message_ts
+from application.services.signal_publisher import SignalPublisherService
+from application.usecases.strategy.main import StrategyPipeline
+from shared.domain.clock import ManualClock, use_clock
+from shared.domain.models import Signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayReport:
+    """Result of a replay run."""
+
+    messages: int = 0
+    signal_count: int = 0
+    shadow_signal_count: int = 0
+    elapsed_seconds: float = 0.0
+    # keep_signals=True の場合だけ保持する
+    signals: List[Signal] = field(default_factory=list)
+    shadow_signals: List[Signal] = field(default_factory=list)
+
+    @property
+    def messages_per_second(self) -> float:
+        """1秒あたりに処理したメッセージ数。"""
+        return self.messages / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """結果の要約を JSON にシリアライズできる辞書に変換します。"""
+        return {
+            "messages": self.messages,
+            "signals": self.signal_count,
+            "shadow_signals": self.shadow_signal_count,
+            "elapsed_seconds": self.elapsed_seconds,
+            "messages_per_second": self.messages_per_second,
+        }
+
+
+class ReplayUseCase:
+    """Replay recorded market data through the production strategy chain as fast as possible.
+
+    メッセージを batch_size 件ずつ StrategyPipeline.evaluate に渡し、本番の indicators/decide ステージと
+    同じ処理（シンボル方向のバッチ計算・パラメータグリッドを含む）を同じタスクで実行します。
+    リプレイ中は時刻を省略したドメインモデルの timestamp がシステム時刻ではなく、
+    そのバッチの最後のメッセージの ts（イベント時刻）になるため、同じ入力と batch_size からは
+    常に同じシグナルが生成されます。
+    """
+
+    def __init__(
+        self,
+        pipeline: StrategyPipeline,
+        batch_size: int = 256,
+        publisher: Optional[SignalPublisherService] = None,
+        shadow_publisher: Optional[SignalPublisherService] = None,
+        clock: Optional[ManualClock] = None,
+    ) -> None:
+        """Initialize Replay Use Case.
+
+        Args:
+            pipeline: リプレイする StrategyPipeline（start していないこと、publisher・リポジトリは使用しない）
+            batch_size: indicators/decide でまとめて処理するメッセージ数（本番の stage_batch_size に相当）
+            publisher: 生成したシグナルの出力先（オプション、ファイルへの書き出しなど）
+            shadow_publisher: 生成したシャドーシグナルの出力先（オプション）
+            clock: イベント時刻の時計（省略時は新しい ManualClock）
+
+        Raises:
+            ValueError: batch_size が正でない場合
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive: {batch_size}")
+        self.pipeline = pipeline
+        self.batch_size = batch_size
+        self.publisher = publisher
+        self.shadow_publisher = shadow_publisher
+        self.clock = clock or ManualClock()
+
+    async def execute(self, messages: Iterable[Dict[str, Any]], keep_signals: bool = True) -> ReplayReport:
+        """メッセージを順にリプレイします。
+
+        Args:
+            messages: 記録した Redis Stream のメッセージ（{"stream", "id", "fields"}、古い順）
+            keep_signals: 生成したシグナルを ReplayReport に保持するか（長時間のリプレイでは False）
+
+        Returns:
+            ReplayReport
+        """
+        report = ReplayReport()
+        batch: List[Dict[str, Any]] = []
+        started = time.perf_counter()
+        with use_clock(self.clock):
+            for message in messages:
+                batch.append(message)
+                if len(batch) >= self.batch_size:
+                    await self._evaluate(batch, report, keep_signals)
+                    batch = []
+            if batch:
+                await self._evaluate(batch, report, keep_signals)
+        report.elapsed_seconds = time.perf_counter() - started
+
+        logger.info(
+            "Replay finished: messages=%d, signals=%d, shadow_signals=%d, elapsed=%.2fs, messages_per_second=%.0f",
+            report.messages,
+            report.signal_count,
+            report.shadow_signal_count,
+            report.elapsed_seconds,
+            report.messages_per_second,
+        )
+        return report
+
+    async def _evaluate(self, batch: List[Dict[str, Any]], report: ReplayReport, keep_signals: bool) -> None:
+        """1バッチ分のメッセージを処理し、シグナルを出力・集計します。"""
+        ts = message_ts(batch[-1])
+        if ts:
+            self.clock.set_ms(ts)
+        signals, shadow_signals = await self.pipeline.evaluate(batch)
+        report.messages += len(batch)
+        report.signal_count += len(signals)
+        report.shadow_signal_count += len(shadow_signals)
+        if self.publisher is not None and signals:
+            await self.publisher.publish_many(signals)
+        if self.shadow_publisher is not None and shadow_signals:
+            await self.shadow_publisher.publish_many(shadow_signals)
+        if keep_signals:
+            report.signals.extend(signals)
+            report.shadow_signals.extend(shadow_signals)
@@ -2,10 +2,16 @@
 
 Application layer: シグナル生成ユースケース
 責務: OHLCVと指標から戦略ロジックを使用してシグナルを生成する
+      （1つのワーカーで複数の戦略インスタンスを実行し、共通の指標を各戦略で共有する）
 """
 import logging
-from typing import TYPE_CHECKING, Dict, Optional
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Sequence
 
+import numpy as np
+
+from application.interfaces.strategy import BatchStrategy
+from domain.indicators import DEFAULT_INDICATORS
 from shared.domain.models import OHLCV, Signal
 
 if TYPE_CHECKING:
@@ -14,41 +20,263 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class _IndicatorColumns(Mapping[str, np.ndarray]):
+    """指標の辞書のリストを、指標名 → シンボルごとの値の配列として見せるビュー。
+
+    戦略が参照した指標だけを配列に変換します（値がない行は NaN、どの行にもない指標は KeyError）。
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, float]]) -> None:
+        self._rows = rows
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            if not any(name in row for row in self._rows):
+                raise KeyError(name)
+            column = self._columns[name] = np.array(
+                [row.get(name, np.nan) for row in self._rows], dtype=np.float64
+            )
+        return column
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(set().union(*self._rows))
+
+    def __len__(self) -> int:
+        return len(set().union(*self._rows))
+
+
 class SignalGeneratorUseCase:
     """Generate trading signals from OHLCV and indicators.
 
     OHLCVと指標から戦略ロジックを使用してシグナルを生成します。
+    複数の戦略インスタンス（同じ戦略の異なるパラメータを含む）を指定した場合は、
+    同じバーと指標に対して各インスタンスの decide を順に実行し、
+    シグナルの strategy をインスタンスID に置き換えて区別します。
     """
 
-    def __init__(self, strategy: "Strategy") -> None:
+    def __init__(
+        self,
+        strategy: Optional["Strategy"] = None,
+        strategies: Optional[Mapping[str, "Strategy"]] = None,
+        min_batch_size: int = 8,
+    ) -> None:
         """Initialize Signal Generator Use Case.
 
         Args:
-            strategy: Strategy インターフェースの実装（Infrastructure 層）
+            strategy: Strategy インターフェースの実装（Infrastructure 層、単一の戦略を実行する場合）
+            strategies: インスタンスID → Strategy の辞書（複数の戦略インスタンスを実行する場合、
+                strategy より優先。シグナルの strategy はインスタンスID になる）
+            min_batch_size: execute_batch で戦略の decide_batch を使用するシンボル数の下限
+                （これより少ない場合はバーごとに decide を呼ぶ）
+
+        Raises:
+            ValueError: 戦略が指定されていない、または戦略の時間足が異なる場合
+        """
+        if strategies:
+            self.strategies: Dict[str, "Strategy"] = dict(strategies)
+            self._tag_signals = True
+        elif strategy is not None:
+            self.strategies = {"default": strategy}
+            self._tag_signals = False
+        else:
+            raise ValueError("At least one strategy is required")
+
+        # 指標の履歴は取引所・シンボル単位で共有するため、すべてのインスタンスが同じ時間足で判断する
+        timeframes = {instance.timeframe for instance in self.strategies.values()}
+        if len(timeframes) > 1:
+            raise ValueError(f"All strategy instances must use the same timeframe: {sorted(timeframes)}")
+        self.strategy = next(iter(self.strategies.values()))
+        self.min_batch_size = min_batch_size
+
+    def required_indicators(self) -> List[str]:
+        """すべての戦略インスタンスが使用する指標の宣言を返します（重複を含む和集合、宣言順）。
+
+        宣言がない戦略は従来の指標一式（DEFAULT_INDICATORS）を使用するものとして扱います。
+
+        Returns:
+            指標の宣言のリスト（IndicatorCalculatorUseCase に渡す）
+        """
+        indicators: List[str] = []
+        for instance in self.strategies.values():
+            indicators.extend(instance.required_indicators() or DEFAULT_INDICATORS)
+        return indicators
+
+    def export_state(self) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """戦略インスタンスごとの取引所・シンボルごとの状態を返します（チェックポイント用）。
+
+        Returns:
+            インスタンスID → 取引所 → シンボル → 状態の辞書
+        """
+        return {instance_id: instance.export_state() for instance_id, instance in self.strategies.items()}
+
+    def restore_state(self, state: Dict[str, Dict[str, Dict[str, Dict[str, float]]]]) -> None:
+        """チェックポイントから戦略の状態を復元します（構成から外れたインスタンスの状態は無視）。
+
+        Args:
+            state: export_state が返した辞書
         """
-        self.strategy = strategy
+        for instance_id, instance_state in state.items():
+            instance = self.strategies.get(instance_id)
+            if instance is not None:
+                instance.restore_state(instance_state)
 
     def execute(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
         """OHLCVと指標からシグナルを生成します.
 
+        複数の戦略インスタンスのシグナルが必要な場合は execute_all を使用してください。
+
         Args:
             ohlcv: OHLCV エンティティ
             indicators: 指標の辞書
 
         Returns:
-            Signal エンティティ（シグナルなしの場合は None）
+            Signal エンティティ（シグナルなしの場合は None、複数ある場合は最初のインスタンスのシグナル）
+        """
+        signals = self.execute_all(ohlcv, indicators)
+        return signals[0] if signals else None
+
+    def execute_all(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> List[Signal]:
+        """OHLCVと指標から、すべての戦略インスタンスのシグナルを生成します.
+
+        1つのインスタンスが失敗しても、他のインスタンスの判断は続行します。
+
+        Args:
+            ohlcv: OHLCV エンティティ
+            indicators: 指標の辞書（すべてのインスタンスで共有）
+
+        Returns:
+            Signal エンティティのリスト（インスタンスの順、シグナルなしの場合は空）
+        """
+        signals: List[Signal] = []
+        for instance_id, instance in self.strategies.items():
+            self._decide(instance_id, instance, ohlcv, indicators, signals)
+        return signals
+
+    def execute_batch(
+        self, ohlcvs: Sequence[OHLCV], indicators: Sequence[Dict[str, float]]
+    ) -> List[List[Signal]]:
+        """同時に確定した複数シンボルの OHLCV と指標から、すべての戦略インスタンスのシグナルを生成します.
+
+        BatchStrategy を実装した戦略には、終値と指標をシンボル方向の配列にまとめて1回で判断させます。
+        実装していない戦略や、シンボル数が min_batch_size 未満の場合は、
+        バーごとに decide を呼びます。同じ取引所・シンボルが複数回含まれる場合は、順序を保つためにそこで区切ります。
+
+        Args:
+            ohlcvs: OHLCV エンティティのリスト（取引所・シンボルごとに古い順）
+            indicators: ohlcvs と同じ順の指標の辞書のリスト
+
+        Returns:
+            ohlcvs と同じ順の、Signal エンティティのリスト（インスタンスの順）のリスト
         """
+        results: List[List[Signal]] = [[] for _ in ohlcvs]
+        run: List[int] = []
+        markets = set()
+        for index, ohlcv in enumerate(ohlcvs):
+            market = (ohlcv.exchange, ohlcv.symbol)
+            if market in markets:
+                self._execute_run(ohlcvs, indicators, run, results)
+                run = []
+                markets.clear()
+            run.append(index)
+            markets.add(market)
+        self._execute_run(ohlcvs, indicators, run, results)
+        return results
+
+    def _execute_run(
+        self,
+        ohlcvs: Sequence[OHLCV],
+        indicators: Sequence[Dict[str, float]],
+        run: List[int],
+        results: List[List[Signal]],
+    ) -> None:
+        """取引所・シンボルの重複がないバーについて、すべての戦略インスタンスで判断します。
+
+        Args:
+            ohlcvs: OHLCV エンティティのリスト
+            indicators: ohlcvs と同じ順の指標の辞書のリスト
+            run: 判断するバーのインデックス（取引所・シンボルの重複なし）
+            results: シグナルを追加するリスト（ohlcvs と同じ順）
+        """
+        columns = None
+        for instance_id, instance in self.strategies.items():
+            decided = None
+            if len(run) >= self.min_batch_size and isinstance(instance, BatchStrategy):
+                if columns is None:
+                    columns = _IndicatorColumns([indicators[index] for index in run])
+                try:
+                    decided = instance.decide_batch(
+                        [(ohlcvs[index].exchange, ohlcvs[index].symbol) for index in run],
+                        np.array([float(ohlcvs[index].close) for index in run]),
+                        columns,
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Failed to generate signals: strategy=%s, error=%s", instance_id, e, exc_info=True
+                    )
+                    continue
+
+            if decided is None:
+                # ベクトル化した判断を実装していない（または少数の）場合は、バーごとに decide を呼ぶ
+                for index in run:
+                    self._decide(instance_id, instance, ohlcvs[index], indicators[index], results[index])
+                continue
+
+            actions, confidences = decided
+            for row, action in enumerate(actions):
+                if not action:
+                    continue
+                index = run[row]
+                try:
+                    signal = instance.make_signal(
+                        ohlcvs[index], str(action), Decimal(str(confidences[row])), indicators[index]
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Failed to generate signal: strategy=%s, error=%s", instance_id, e, exc_info=True
+                    )
+                    continue
+                self._emit(instance_id, signal, results[index])
+
+    def _decide(
+        self,
+        instance_id: str,
+        instance: "Strategy",
+        ohlcv: OHLCV,
+        indicators: Dict[str, float],
+        signals: List[Signal],
+    ) -> None:
+        """1本のバーで戦略インスタンスの decide を呼び、シグナルがあれば signals に追加します。"""
         try:
             # Strategy の decide メソッドに委譲
-            signal = self.strategy.decide(ohlcv, indicators)
-            if signal:
-                logger.info(
-                    "Generated signal: symbol=%s, action=%s, confidence=%s",
-                    signal.symbol,
-                    signal.action,
-                    signal.confidence,
-                )
-            return signal
+            signal = instance.decide(ohlcv, indicators)
         except Exception as e:
-            logger.error("Failed to generate signal: %s", e, exc_info=True)
-            return None
+            logger.error("Failed to generate signal: strategy=%s, error=%s", instance_id, e, exc_info=True)
+            return
+        if signal:
+            self._emit(instance_id, signal, signals)
+
+    def _emit(self, instance_id: str, signal: Signal, signals: List[Signal]) -> None:
+        """シグナルにインスタンスID を付けて signals に追加します。"""
+        self._tag(instance_id, signal)
+        logger.info(
+            "Generated signal: symbol=%s, strategy=%s, action=%s, confidence=%s",
+            signal.symbol,
+            signal.strategy,
+            signal.action,
+            signal.confidence,
+        )
+        signals.append(signal)
+
+    def _tag(self, instance_id: str, signal: Signal) -> None:
+        """シグナルの strategy をインスタンスID に置き換えます（戦略名は meta に残す）。
+
+        Args:
+            instance_id: インスタンスID
+            signal: 戦略が生成した Signal
+        """
+        if not self._tag_signals or signal.strategy == instance_id:
+            return
+        signal.meta = {**(signal.meta or {}), "strategy_name": signal.strategy}
+        signal.strategy = instance_id
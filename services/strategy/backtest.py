@@ -0,0 +1,112 @@
+"""Backtest entrypoint for strategy module.
+
+保存済みのバー（ohlcv テーブルまたは CSV ファイル）で戦略をバックテストし、結果を JSON で出力します。
+
+使用例:
+    python backtest.py --symbol BTC_JPY --strategy "moving_average_cross(fast_window=5,slow_window=20)" \\
+        --start 2024-01-01 --end 2025-01-01 --fee-rate 0.0005
+    python backtest.py --symbol BTC_JPY --csv btc_jpy_1s.csv --trades
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from config import load_settings
+from main import configure_logging, create_strategies
+
+from application.interfaces.bar_source import BarSource
+from application.usecases.backtest.backtest_runner import BacktestUseCase
+from infrastructure.backtest import CsvBarSource, DatabaseBarSource
+from shared.infrastructure.database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数をパースします。
+
+    Args:
+        argv: 引数のリスト（省略時は sys.argv）
+
+    Returns:
+        パースした引数
+    """
+    settings = load_settings()
+    parser = argparse.ArgumentParser(description="Backtest a strategy over stored OHLCV bars.")
+    parser.add_argument("--exchange", default="gmo", help="取引所（デフォルト: gmo）")
+    parser.add_argument("--symbol", required=True, help="シンボル（例: BTC_JPY）")
+    parser.add_argument(
+        "--strategy",
+        default=settings.strategy_name,
+        help='戦略の宣言（STRATEGIES と同じ形式、例: "moving_average_cross(fast_window=5,slow_window=20)"）',
+    )
+    parser.add_argument("--timeframe", default=settings.strategy_timeframe, help="時間足（デフォルト: STRATEGY_TIMEFRAME）")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="開始時刻（ISO 8601、UTC）")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="終了時刻（ISO 8601、UTC、この時刻を含まない）")
+    parser.add_argument("--csv", help="バーを読み込む CSV ファイル（省略時は DATABASE_URL の ohlcv テーブル）")
+    parser.add_argument("--chunk-size", type=int, default=500_000, help="1回に読み込むバーの本数")
+    parser.add_argument("--initial-capital", type=float, default=1_000_000.0, help="初期資産")
+    parser.add_argument("--fee-rate", type=float, default=0.0, help="売買ごとの手数料率（例: 0.0005）")
+    parser.add_argument("--trades", action="store_true", help="取引一覧を出力に含める")
+    parser.add_argument("--database-url", default=settings.database_url, help=argparse.SUPPRESS)
+    parser.add_argument("--log-level", default=settings.log_level, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+async def run_backtest(args: argparse.Namespace) -> dict:
+    """引数で指定されたバックテストを実行します。
+
+    Args:
+        args: parse_args の結果
+
+    Returns:
+        バックテスト結果の辞書
+
+    Raises:
+        ValueError: 戦略の宣言が不正、または読み込み元が指定されていない場合
+    """
+    strategy = next(iter(create_strategies([args.strategy], args.strategy, args.timeframe).values()))
+
+    database: Optional[Database] = None
+    source: BarSource
+    if args.csv:
+        source = CsvBarSource(args.csv, chunk_size=args.chunk_size)
+    elif args.database_url:
+        database = Database(args.database_url)
+        source = DatabaseBarSource(database, chunk_size=args.chunk_size)
+    else:
+        raise ValueError("Either --csv or DATABASE_URL is required")
+
+    try:
+        backtest = BacktestUseCase(
+            source=source,
+            strategy=strategy,
+            initial_capital=args.initial_capital,
+            fee_rate=args.fee_rate,
+        )
+        result = await backtest.execute(args.exchange, args.symbol, args.start, args.end)
+    finally:
+        if database is not None:
+            await database.dispose()
+    return result.to_dict(include_trades=args.trades)
+
+
+def main() -> None:
+    """Backtest entrypoint."""
+    args = parse_args()
+    configure_logging(args.log_level)
+    try:
+        summary = asyncio.run(run_backtest(args))
+    except Exception as e:
+        logger.error("Backtest failed: %s", e, exc_info=True)
+        sys.exit(1)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,41 @@ from pydantic import BaseModel, Field
 class Settings(BaseModel):
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
     database_url: str = Field(default="", alias="DATABASE_URL")
+    exchange_name: str = Field(default="gmo", alias="EXCHANGE_NAME")
     symbols: List[str] = Field(default_factory=list, alias="SYMBOLS")
     strategy_name: str = Field(default="moving_average_cross", alias="STRATEGY_NAME")
+    strategy_timeframe: str = Field(default="1s", alias="STRATEGY_TIMEFRAME")
+    strategies: List[str] = Field(default_factory=list, alias="STRATEGIES")
+    shadow_fast_windows: str = Field(default="", alias="SHADOW_FAST_WINDOWS")
+    shadow_slow_windows: str = Field(default="", alias="SHADOW_SLOW_WINDOWS")
+    shadow_stream_prefix: str = Field(default="shadow", alias="SHADOW_STREAM_PREFIX")
+    timeframes: List[str] = Field(default_factory=lambda: ["1s"], alias="TIMEFRAMES")
+    orderbook_depth: int = Field(default=5, alias="ORDERBOOK_DEPTH")
+    trade_windows: List[str] = Field(default_factory=lambda: ["10s", "1m"], alias="TRADE_WINDOWS")
+    trade_tape_capacity: int = Field(default=8192, alias="TRADE_TAPE_CAPACITY")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    consume_batch_size: int = Field(default=100, alias="CONSUME_BATCH_SIZE")
+    ack_flush_interval: float = Field(default=0.1, alias="ACK_FLUSH_INTERVAL")
+    conflate: bool = Field(default=False, alias="CONFLATE")
+    reclaim_min_idle_ms: int = Field(default=60000, alias="RECLAIM_MIN_IDLE_MS")
+    reclaim_interval: float = Field(default=30.0, alias="RECLAIM_INTERVAL")
+    max_deliveries: int = Field(default=5, alias="MAX_DELIVERIES")
+    dead_letter_stream: str = Field(default="dlq:strategy", alias="DEAD_LETTER_STREAM")
+    checkpoint_interval: float = Field(default=60.0, alias="CHECKPOINT_INTERVAL")
+    checkpoint_key: str = Field(default="", alias="CHECKPOINT_KEY")
+    warmup_from_db: bool = Field(default=True, alias="WARMUP_FROM_DB")
+    shard_index: int = Field(default=0, alias="SHARD_INDEX")
+    shard_count: int = Field(default=1, alias="SHARD_COUNT")
+    consumer_name: str = Field(default="", alias="CONSUMER_NAME")
+    max_in_flight: int = Field(default=256, alias="MAX_IN_FLIGHT")
+    pipeline_queue_size: int = Field(default=1000, alias="PIPELINE_QUEUE_SIZE")
+    ohlcv_flush_size: int = Field(default=500, alias="OHLCV_FLUSH_SIZE")
+    ohlcv_flush_interval: float = Field(default=1.0, alias="OHLCV_FLUSH_INTERVAL")
+    ohlcv_max_pending: int = Field(default=10000, alias="OHLCV_MAX_PENDING")
+    signal_flush_size: int = Field(default=100, alias="SIGNAL_FLUSH_SIZE")
+    signal_flush_interval: float = Field(default=1.0, alias="SIGNAL_FLUSH_INTERVAL")
+    signal_max_pending: int = Field(default=10000, alias="SIGNAL_MAX_PENDING")
+    signal_overflow: str = Field(default="drop_oldest", alias="SIGNAL_OVERFLOW")
     enable_http: bool = Field(default=False, alias="ENABLE_HTTP")
     http_port: int = Field(default=8000, alias="HTTP_PORT")
 
@@ -22,12 +54,53 @@ def load_settings() -> Settings:
     # Split SYMBOLS by comma if present
     raw_symbols = os.getenv("SYMBOLS", "")
     parsed_symbols = [s.strip() for s in raw_symbols.split(",") if s.strip()]
+    # Split TIMEFRAMES by comma (e.g. "1s,1m,5m")
+    raw_timeframes = os.getenv("TIMEFRAMES", "1s")
+    parsed_timeframes = [t.strip() for t in raw_timeframes.split(",") if t.strip()]
+    # Split TRADE_WINDOWS by comma (e.g. "10s,1m")
+    raw_trade_windows = os.getenv("TRADE_WINDOWS", "10s,1m")
+    parsed_trade_windows = [w.strip() for w in raw_trade_windows.split(",") if w.strip()]
+    # Split STRATEGIES by semicolon (e.g. "fast=moving_average_cross(fast_window=5,slow_window=20);...")
+    raw_strategies = os.getenv("STRATEGIES", "")
+    parsed_strategies = [s.strip() for s in raw_strategies.split(";") if s.strip()]
     data = {
         "REDIS_URL": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
         "DATABASE_URL": os.getenv("DATABASE_URL", ""),
+        "EXCHANGE_NAME": os.getenv("EXCHANGE_NAME", "gmo"),
         "SYMBOLS": parsed_symbols,
         "STRATEGY_NAME": os.getenv("STRATEGY_NAME", "moving_average_cross"),
+        "STRATEGY_TIMEFRAME": os.getenv("STRATEGY_TIMEFRAME", "1s"),
+        "STRATEGIES": parsed_strategies,
+        "SHADOW_FAST_WINDOWS": os.getenv("SHADOW_FAST_WINDOWS", ""),
+        "SHADOW_SLOW_WINDOWS": os.getenv("SHADOW_SLOW_WINDOWS", ""),
+        "SHADOW_STREAM_PREFIX": os.getenv("SHADOW_STREAM_PREFIX", "shadow"),
+        "TIMEFRAMES": parsed_timeframes,
+        "ORDERBOOK_DEPTH": int(os.getenv("ORDERBOOK_DEPTH", "5")),
+        "TRADE_WINDOWS": parsed_trade_windows,
+        "TRADE_TAPE_CAPACITY": int(os.getenv("TRADE_TAPE_CAPACITY", "8192")),
         "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
+        "CONSUME_BATCH_SIZE": int(os.getenv("CONSUME_BATCH_SIZE", "100")),
+        "ACK_FLUSH_INTERVAL": float(os.getenv("ACK_FLUSH_INTERVAL", "0.1")),
+        "CONFLATE": os.getenv("CONFLATE", "false").lower() == "true",
+        "RECLAIM_MIN_IDLE_MS": int(os.getenv("RECLAIM_MIN_IDLE_MS", "60000")),
+        "RECLAIM_INTERVAL": float(os.getenv("RECLAIM_INTERVAL", "30.0")),
+        "MAX_DELIVERIES": int(os.getenv("MAX_DELIVERIES", "5")),
+        "DEAD_LETTER_STREAM": os.getenv("DEAD_LETTER_STREAM", "dlq:strategy"),
+        "CHECKPOINT_INTERVAL": float(os.getenv("CHECKPOINT_INTERVAL", "60.0")),
+        "CHECKPOINT_KEY": os.getenv("CHECKPOINT_KEY", ""),
+        "WARMUP_FROM_DB": os.getenv("WARMUP_FROM_DB", "true").lower() == "true",
+        "SHARD_INDEX": int(os.getenv("SHARD_INDEX", "0")),
+        "SHARD_COUNT": int(os.getenv("SHARD_COUNT", "1")),
+        "CONSUMER_NAME": os.getenv("CONSUMER_NAME", ""),
+        "MAX_IN_FLIGHT": int(os.getenv("MAX_IN_FLIGHT", "256")),
+        "PIPELINE_QUEUE_SIZE": int(os.getenv("PIPELINE_QUEUE_SIZE", "1000")),
+        "OHLCV_FLUSH_SIZE": int(os.getenv("OHLCV_FLUSH_SIZE", "500")),
+        "OHLCV_FLUSH_INTERVAL": float(os.getenv("OHLCV_FLUSH_INTERVAL", "1.0")),
+        "OHLCV_MAX_PENDING": int(os.getenv("OHLCV_MAX_PENDING", "10000")),
+        "SIGNAL_FLUSH_SIZE": int(os.getenv("SIGNAL_FLUSH_SIZE", "100")),
+        "SIGNAL_FLUSH_INTERVAL": float(os.getenv("SIGNAL_FLUSH_INTERVAL", "1.0")),
+        "SIGNAL_MAX_PENDING": int(os.getenv("SIGNAL_MAX_PENDING", "10000")),
+        "SIGNAL_OVERFLOW": os.getenv("SIGNAL_OVERFLOW", "drop_oldest"),
         "ENABLE_HTTP": os.getenv("ENABLE_HTTP", "false").lower() == "true",
         "HTTP_PORT": int(os.getenv("HTTP_PORT", "8000")),
     }
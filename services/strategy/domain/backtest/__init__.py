@@ -0,0 +1,14 @@
+"""Vectorized backtesting (columnar bars, long-only portfolio accounting)."""
+
+from .bars import BarArrays
+from .portfolio import ENTER_LONG, EXIT, NO_ACTION, BacktestResult, LongOnlyPortfolio, Trade
+
+__all__ = [
+    "ENTER_LONG",
+    "EXIT",
+    "NO_ACTION",
+    "BacktestResult",
+    "BarArrays",
+    "LongOnlyPortfolio",
+    "Trade",
+]
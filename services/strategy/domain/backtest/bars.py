@@ -0,0 +1,59 @@
+"""Columnar OHLCV bars.
+
+Domain layer: バックテスト用の列指向の OHLCV
+責務: 1シンボル・1時間足のバーの塊（チャンク）を、列ごとの NumPy 配列として保持する
+"""
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from shared.domain.models import OHLCV
+
+
+@dataclass(frozen=True)
+class BarArrays:
+    """OHLCV bars of one symbol as column arrays (oldest first).
+
+    timestamps は datetime64[ms]、価格・出来高は float64 の同じ長さの配列です。
+    """
+
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_ohlcvs(cls, ohlcvs: Sequence[OHLCV]) -> "BarArrays":
+        """OHLCV エンティティのリストを列の配列に変換します。
+
+        Args:
+            ohlcvs: OHLCV エンティティのリスト（古い順）
+
+        Returns:
+            BarArrays
+        """
+        return cls(
+            timestamps=np.array([ohlcv.timestamp for ohlcv in ohlcvs], dtype="datetime64[ms]"),
+            open=np.array([float(ohlcv.open) for ohlcv in ohlcvs], dtype=np.float64),
+            high=np.array([float(ohlcv.high) for ohlcv in ohlcvs], dtype=np.float64),
+            low=np.array([float(ohlcv.low) for ohlcv in ohlcvs], dtype=np.float64),
+            close=np.array([float(ohlcv.close) for ohlcv in ohlcvs], dtype=np.float64),
+            volume=np.array([float(ohlcv.volume) for ohlcv in ohlcvs], dtype=np.float64),
+        )
+
+    def slice(self, start: int, stop: int) -> "BarArrays":
+        """[start, stop) のバーを返します（配列はコピーせずビューを共有）。"""
+        return BarArrays(
+            timestamps=self.timestamps[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            volume=self.volume[start:stop],
+        )
@@ -0,0 +1,274 @@
+"""Vectorized long-only portfolio accounting.
+
+Domain layer: バックテストの損益計算
+責務: バーごとの行動（enter_long / exit）の配列から、ポジション・資産曲線・ドローダウン・取引一覧を
+      チャンク単位の NumPy 演算で計算し、チャンクをまたぐ状態（保有中の取引・資産・最高値）を引き継ぐ
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .bars import BarArrays
+
+# バーごとの行動（Strategy.decide_series が返す値）
+ENTER_LONG = 1
+EXIT = -1
+NO_ACTION = 0
+
+
+@dataclass
+class Trade:
+    """One round trip (entry at the close of the enter_long bar, exit at the close of the exit bar)."""
+
+    entry_time: datetime
+    entry_price: float
+    exit_time: Optional[datetime]
+    exit_price: Optional[float]
+    # 保有したバーの本数
+    bars: int
+    # 手数料控除後のリターン（保有中の取引は最後の終値での評価）
+    net_return: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entry_time": self.entry_time.isoformat(),
+            "entry_price": self.entry_price,
+            "exit_time": self.exit_time.isoformat() if self.exit_time else None,
+            "exit_price": self.exit_price,
+            "bars": self.bars,
+            "net_return": self.net_return,
+        }
+
+
+@dataclass
+class BacktestResult:
+    """Summary of a backtest run."""
+
+    bars: int
+    start: Optional[datetime]
+    end: Optional[datetime]
+    initial_capital: float
+    final_equity: float
+    max_drawdown: float
+    max_drawdown_at: Optional[datetime]
+    trades: List[Trade] = field(default_factory=list)
+
+    @property
+    def pnl(self) -> float:
+        """損益（最終資産 - 初期資産）。"""
+        return self.final_equity - self.initial_capital
+
+    @property
+    def total_return(self) -> float:
+        """初期資産に対するリターン。"""
+        return self.final_equity / self.initial_capital - 1.0
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        """決済済みの取引のうち、手数料控除後のリターンが正の取引の割合（取引がない場合は None）。"""
+        closed = [trade for trade in self.trades if trade.exit_time is not None]
+        if not closed:
+            return None
+        return sum(1 for trade in closed if trade.net_return > 0) / len(closed)
+
+    def to_dict(self, include_trades: bool = False) -> Dict[str, Any]:
+        """結果を JSON にシリアライズできる辞書に変換します。
+
+        Args:
+            include_trades: 取引一覧を含めるか
+
+        Returns:
+            結果の辞書
+        """
+        result: Dict[str, Any] = {
+            "bars": self.bars,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "initial_capital": self.initial_capital,
+            "final_equity": self.final_equity,
+            "pnl": self.pnl,
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_at": self.max_drawdown_at.isoformat() if self.max_drawdown_at else None,
+            "trades": len(self.trades),
+            "win_rate": self.win_rate,
+        }
+        if include_trades:
+            result["trade_list"] = [trade.to_dict() for trade in self.trades]
+        return result
+
+
+class LongOnlyPortfolio:
+    """Simulate a long-only, all-in position from per-bar actions, one chunk at a time.
+
+    enter_long で全資産を終値で買い、exit で終値で売ります（保有中の enter_long、未保有の exit は無視）。
+    売買のたびに資産に (1 - fee_rate) を掛けます。チャンクの分け方によらず結果は同じです。
+    """
+
+    def __init__(self, initial_capital: float = 1_000_000.0, fee_rate: float = 0.0) -> None:
+        """Initialize Long-Only Portfolio.
+
+        Args:
+            initial_capital: 初期資産
+            fee_rate: 売買ごとの手数料率（例: 0.0005 = 0.05%）
+
+        Raises:
+            ValueError: 初期資産が正でない、または手数料率が [0, 1) の範囲外の場合
+        """
+        if initial_capital <= 0:
+            raise ValueError(f"initial_capital must be positive: {initial_capital}")
+        if not 0.0 <= fee_rate < 1.0:
+            raise ValueError(f"fee_rate must be in [0, 1): {fee_rate}")
+        self.initial_capital = float(initial_capital)
+        self.fee_rate = float(fee_rate)
+        self._bars = 0
+        self._start: Optional[np.datetime64] = None
+        self._end: Optional[np.datetime64] = None
+        self._position = 0
+        self._last_close: Optional[float] = None
+        self._equity = self.initial_capital
+        self._peak = self.initial_capital
+        self._max_drawdown = 0.0
+        self._max_drawdown_at: Optional[np.datetime64] = None
+        # 保有中の取引（エントリーの時刻, 価格, 通しのバー番号）
+        self._open: Optional[tuple] = None
+        # 決済済みの取引（チャンクごとの配列）
+        self._entry_times: List[np.ndarray] = []
+        self._entry_prices: List[np.ndarray] = []
+        self._entry_index: List[np.ndarray] = []
+        self._exit_times: List[np.ndarray] = []
+        self._exit_prices: List[np.ndarray] = []
+        self._exit_index: List[np.ndarray] = []
+
+    def update(self, bars: BarArrays, actions: np.ndarray) -> None:
+        """1チャンク分のバーと行動で、ポジション・資産・取引を更新します。
+
+        Args:
+            bars: バーのチャンク（前回のチャンクの続き）
+            actions: バーごとの行動（ENTER_LONG / EXIT / NO_ACTION、bars と同じ長さ）
+
+        Raises:
+            ValueError: actions の長さが bars と異なる場合
+        """
+        count = len(bars)
+        if len(actions) != count:
+            raise ValueError(f"actions length {len(actions)} does not match bars length {count}")
+        if count == 0:
+            return
+
+        # 直近の行動を前方に引き継いでバーごとのポジションにする（行動がないバーは前回のポジション）
+        last_action = np.where(actions != NO_ACTION, np.arange(count), -1)
+        np.maximum.accumulate(last_action, out=last_action)
+        target = (actions == ENTER_LONG).astype(np.int8)
+        position = np.where(last_action >= 0, target[last_action], self._position).astype(np.int8)
+        held = np.empty(count, dtype=np.int8)
+        held[0] = self._position
+        held[1:] = position[:-1]
+        change = position - held
+
+        # 前のバーから保有していたポジションの値動きと、売買した手数料で資産を更新する
+        close = bars.close
+        prev_close = np.empty(count, dtype=np.float64)
+        prev_close[0] = close[0] if self._last_close is None else self._last_close
+        prev_close[1:] = close[:-1]
+        growth = (1.0 + held * (close / prev_close - 1.0)) * (1.0 - self.fee_rate * np.abs(change))
+        equity = self._equity * np.cumprod(growth)
+        peak = np.maximum(np.maximum.accumulate(equity), self._peak)
+        drawdown = 1.0 - equity / peak
+        deepest = int(np.argmax(drawdown))
+        if drawdown[deepest] > self._max_drawdown:
+            self._max_drawdown = float(drawdown[deepest])
+            self._max_drawdown_at = bars.timestamps[deepest]
+
+        self._record_trades(bars, np.flatnonzero(change > 0), np.flatnonzero(change < 0))
+
+        if self._start is None:
+            self._start = bars.timestamps[0]
+        self._end = bars.timestamps[-1]
+        self._bars += count
+        self._position = int(position[-1])
+        self._last_close = float(close[-1])
+        self._equity = float(equity[-1])
+        self._peak = float(peak[-1])
+
+    def _record_trades(self, bars: BarArrays, entries: np.ndarray, exits: np.ndarray) -> None:
+        """チャンク内のエントリー・決済を取引の組にします（売買は交互に発生する）。"""
+        times = bars.timestamps
+        prices = bars.close
+        if self._open is not None and len(exits):
+            open_time, open_price, open_index = self._open
+            self._open = None
+            self._entry_times.append(np.array([open_time], dtype="datetime64[ms]"))
+            self._entry_prices.append(np.array([open_price]))
+            self._entry_index.append(np.array([open_index]))
+            self._exit_times.append(times[exits[:1]])
+            self._exit_prices.append(prices[exits[:1]])
+            self._exit_index.append(exits[:1] + self._bars)
+            exits = exits[1:]
+
+        closed = entries[: len(exits)]
+        self._entry_times.append(times[closed])
+        self._entry_prices.append(prices[closed])
+        self._entry_index.append(closed + self._bars)
+        self._exit_times.append(times[exits])
+        self._exit_prices.append(prices[exits])
+        self._exit_index.append(exits + self._bars)
+        if len(entries) > len(exits):
+            last = entries[-1]
+            self._open = (times[last], float(prices[last]), int(last) + self._bars)
+
+    def result(self) -> BacktestResult:
+        """ここまでのバーのバックテスト結果を返します。
+
+        Returns:
+            BacktestResult（保有中の取引は最後の終値で評価し、exit_time は None）
+        """
+        trades: List[Trade] = []
+        if self._entry_prices:
+            entry_prices = np.concatenate(self._entry_prices)
+            exit_prices = np.concatenate(self._exit_prices)
+            net_returns = exit_prices / entry_prices * (1.0 - self.fee_rate) ** 2 - 1.0
+            trades = [
+                Trade(
+                    entry_time=entry_time,
+                    entry_price=entry_price,
+                    exit_time=exit_time,
+                    exit_price=exit_price,
+                    bars=exit_index - entry_index,
+                    net_return=net_return,
+                )
+                for entry_time, entry_price, entry_index, exit_time, exit_price, exit_index, net_return in zip(
+                    np.concatenate(self._entry_times).astype(datetime).tolist(),
+                    entry_prices.tolist(),
+                    np.concatenate(self._entry_index).tolist(),
+                    np.concatenate(self._exit_times).astype(datetime).tolist(),
+                    exit_prices.tolist(),
+                    np.concatenate(self._exit_index).tolist(),
+                    net_returns.tolist(),
+                )
+            ]
+        if self._open is not None and self._last_close is not None:
+            open_time, open_price, open_index = self._open
+            trades.append(
+                Trade(
+                    entry_time=open_time.astype(datetime),
+                    entry_price=open_price,
+                    exit_time=None,
+                    exit_price=None,
+                    bars=self._bars - 1 - open_index,
+                    net_return=self._last_close / open_price * (1.0 - self.fee_rate) - 1.0,
+                )
+            )
+
+        return BacktestResult(
+            bars=self._bars,
+            start=self._start.astype(datetime) if self._start is not None else None,
+            end=self._end.astype(datetime) if self._end is not None else None,
+            initial_capital=self.initial_capital,
+            final_equity=self._equity,
+            max_drawdown=self._max_drawdown,
+            max_drawdown_at=self._max_drawdown_at.astype(datetime) if self._max_drawdown_at is not None else None,
+            trades=trades,
+        )
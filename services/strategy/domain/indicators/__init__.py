@@ -0,0 +1,16 @@
+"""Incremental technical indicators."""
+
+from .engine import IndicatorEngine
+from .incremental import ExponentialMovingAverage, Macd, RollingRsi, RollingStats
+from .spec import DEFAULT_INDICATORS, IndicatorSpec, parse_indicators
+
+__all__ = [
+    "DEFAULT_INDICATORS",
+    "IndicatorEngine",
+    "IndicatorSpec",
+    "ExponentialMovingAverage",
+    "Macd",
+    "RollingRsi",
+    "RollingStats",
+    "parse_indicators",
+]
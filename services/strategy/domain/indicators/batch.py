@@ -0,0 +1,85 @@
+"""Vectorized indicator kernels.
+
+Domain layer: 複数シンボルの指標をまとめて計算するベクトル化カーネル
+責務: シンボル × 終値ウィンドウの2次元配列から、ウィンドウ型の指標（平均・標準偏差・RSI）と
+      再帰型の EMA を、シンボル方向に1回の NumPy 演算で計算する
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def window_mean_std(windows: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """各行の直近 window 本の平均と標本標準偏差（ddof=1）を計算します。
+
+    Args:
+        windows: 終値の2次元配列（シンボル × 本数、各行の末尾が最新値、不足分は NaN）
+        window: ウィンドウサイズ
+
+    Returns:
+        (平均, 標準偏差) の配列（本数が不足する行は NaN）
+    """
+    tail = windows[:, -window:]
+    mean = tail.mean(axis=1)
+    if window < 2:
+        return mean, np.full(len(windows), np.nan)
+    std = np.sqrt(((tail - mean[:, None]) ** 2).sum(axis=1) / (window - 1))
+    return mean, std
+
+
+def window_rsi(windows: np.ndarray, period: int) -> np.ndarray:
+    """各行の直近 period 本の値幅から RSI（単純移動平均ベース）を計算します。
+
+    RollingRsi と同じく、値幅がすべて 0 の場合は NaN（未定義）、下落がない場合は 100 を返します。
+
+    Args:
+        windows: 終値の2次元配列（シンボル × 本数、各行の末尾が最新値、不足分は NaN）
+        period: 期間
+
+    Returns:
+        RSI の配列（計算できない行は NaN）
+    """
+    deltas = np.diff(windows[:, -(period + 1) :], axis=1)
+    gain = np.where(deltas > 0, deltas, 0.0).sum(axis=1) / period
+    loss = np.where(deltas < 0, -deltas, 0.0).sum(axis=1) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    rsi = np.where(loss == 0.0, np.where(gain > 0.0, 100.0, np.nan), rsi)
+    # 本数が不足する行（NaN を含む値幅）は計算できない
+    return np.where(np.isnan(deltas).any(axis=1), np.nan, rsi)
+
+
+def ema_step(previous: np.ndarray, values: np.ndarray, span: int) -> np.ndarray:
+    """EMA を1本分だけ進めます（前回値が NaN の行は values で初期化）。
+
+    Args:
+        previous: 前回の EMA（未初期化の行は NaN）
+        values: 新しい値
+        span: EMA の期間
+
+    Returns:
+        更新後の EMA
+    """
+    alpha = 2.0 / (span + 1)
+    return np.where(np.isnan(previous), values, alpha * values + (1.0 - alpha) * previous)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """時系列全体の移動平均を累積和の差分から計算します（バックテスト用）。
+
+    桁落ちを抑えるため、先頭の値を引いてから累積和を取ります。
+
+    Args:
+        values: 時系列（古い順）
+        window: ウィンドウサイズ
+
+    Returns:
+        values と同じ長さの移動平均（本数が不足する先頭の window - 1 本は NaN）
+    """
+    mean = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return mean
+    offset = values[0]
+    sums = np.concatenate(([0.0], np.cumsum(values - offset)))
+    mean[window - 1 :] = (sums[window:] - sums[:-window]) / window + offset
+    return mean
@@ -0,0 +1,266 @@
+"""Incremental indicator engine.
+
+Domain layer: シンボル単位のインクリメンタル指標エンジン
+責務: 宣言された指標から重複のない計算グラフ（移動和・Welford 分散・再帰 EMA・RSI）を構築し、
+      終値1本ごとにグラフの各ノードを1回だけ O(1) で更新して、指標の辞書を返す
+      （同時にバーが確定した複数シンボルは update_batch でまとめてベクトル化して計算する）
+"""
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from domain.indicators.batch import ema_step, window_mean_std, window_rsi
+from domain.indicators.incremental import ExponentialMovingAverage, RollingRsi, RollingStats
+from domain.indicators.spec import IndicatorSpec, parse_indicators
+
+# 指標の辞書に値を書き込む関数（グラフのノードを参照する）
+_Emitter = Callable[[Dict[str, float]], None]
+
+
+class IndicatorEngine:
+    """Incremental indicator engine for a single symbol.
+
+    DataFrame を再構築せず、移動和・Welford 分散・再帰 EMA の内部状態だけで指標を更新します。
+    同じ期間の移動平均とボリンジャーバンドの中心線は1つの RollingStats を、
+    同じ期間の EMA と MACD の短期・長期 EMA は1つの ExponentialMovingAverage を共有します。
+    """
+
+    def __init__(self, indicators: Optional[Iterable[Union[str, IndicatorSpec]]] = None) -> None:
+        """Initialize Indicator Engine.
+
+        Args:
+            indicators: 計算する指標の宣言（例: ["ma:7", "ma:20"]、省略時は DEFAULT_INDICATORS）
+
+        Raises:
+            ValueError: 指標の宣言が不正な場合
+        """
+        self.specs: Tuple[IndicatorSpec, ...] = tuple(parse_indicators(indicators))
+        # 計算グラフのノード（期間・パラメータごとに1つ）
+        self._stats: Dict[int, RollingStats] = {}
+        self._rsi: Dict[int, RollingRsi] = {}
+        self._emas: Dict[int, ExponentialMovingAverage] = {}
+        self._signal_emas: Dict[Tuple[int, int, int], ExponentialMovingAverage] = {}
+        self._emitters: List[_Emitter] = [self._build(spec) for spec in self.specs]
+        self._count = 0
+        # update_batch で更新した後は、ウィンドウ型のノード（移動和・RSI）が最新の値を反映していない
+        self._windows_stale = False
+
+        # 各ウィンドウから抜ける値を参照するために、終値の履歴に必要な本数
+        lookback = max([*self._stats, *(period + 1 for period in self._rsi), 1])
+        self.required_history = lookback + 1
+
+    @property
+    def node_count(self) -> int:
+        """計算グラフのノード数（重複を除いた、1本ごとに更新する内部状態の数）。"""
+        return len(self._stats) + len(self._rsi) + len(self._emas) + len(self._signal_emas)
+
+    def update(self, closes: Sequence[float]) -> Dict[str, float]:
+        """終値の履歴に追加された最新の1本で指標を更新し、最新の指標を返します。
+
+        Args:
+            closes: 終値の時系列（古い順、末尾が最新値、required_history 本まで保持していること）
+
+        Returns:
+            指標の辞書（例: {'ma_5': 100.5, 'ma_20': 99.8, 'rsi': 65.2}、宣言順）
+        """
+        if self._windows_stale:
+            # 直前まで update_batch で更新されていた場合は、履歴からウィンドウの状態を作り直す
+            for node in (*self._stats.values(), *self._rsi.values()):
+                node.rebuild(closes[:-1])
+            self._windows_stale = False
+
+        self._count += 1
+        close = float(closes[-1])
+
+        for stats in self._stats.values():
+            stats.update(closes)
+        for rsi in self._rsi.values():
+            rsi.update(closes)
+        for ema in self._emas.values():
+            ema.update(close)
+        for (fast, slow, _), signal_ema in self._signal_emas.items():
+            signal_ema.update(self._emas[fast].value - self._emas[slow].value)
+
+        indicators: Dict[str, float] = {}
+        for emit in self._emitters:
+            emit(indicators)
+        return indicators
+
+    @staticmethod
+    def update_batch(engines: Sequence["IndicatorEngine"], windows: np.ndarray) -> List[Dict[str, float]]:
+        """同じ指標を宣言した複数シンボルのエンジンを、最新の1本でまとめて更新します。
+
+        ウィンドウ型の指標は直近の終値を積み上げた2次元配列から、EMA はシンボル方向の配列として、
+        指標ごとに1回の NumPy 演算で計算します（シンボル数に比例する Python の処理は値の出し入れのみ）。
+        結果は update をシンボルごとに呼んだ場合と（浮動小数点の誤差を除いて）一致します。
+
+        Args:
+            engines: 更新するエンジン（同じ specs で作成されていること、シンボルの重複なし）
+            windows: 終値の2次元配列（engines と同じ順のシンボル × required_history 本、
+                各行の末尾が最新値、履歴が不足する分は左側を NaN で埋める）
+
+        Returns:
+            engines と同じ順の指標の辞書のリスト（それぞれ宣言順）
+        """
+        if not engines:
+            return []
+        template = engines[0]
+        counts = np.empty(len(engines))
+        for row, engine in enumerate(engines):
+            engine._count += 1
+            engine._windows_stale = True
+            counts[row] = engine._count
+
+        stats = {window: window_mean_std(windows, window) for window in template._stats}
+        rsis = {period: window_rsi(windows, period) for period in template._rsi}
+        # EMA は各エンジンのノードから前回値を集め、まとめて更新して書き戻す
+        emas: Dict[int, np.ndarray] = {}
+        for span in template._emas:
+            nodes = [engine._emas[span] for engine in engines]
+            emas[span] = IndicatorEngine._advance(nodes, windows[:, -1], span)
+        signal_emas: Dict[Tuple[int, int, int], np.ndarray] = {}
+        for key in template._signal_emas:
+            fast, slow, signal = key
+            nodes = [engine._signal_emas[key] for engine in engines]
+            signal_emas[key] = IndicatorEngine._advance(nodes, emas[fast] - emas[slow], signal)
+
+        results: List[Dict[str, float]] = [{} for _ in engines]
+        for spec in template.specs:
+            columns, ready = IndicatorEngine._batch_columns(spec, counts, stats, rsis, emas, signal_emas)
+            ready_rows = ready.tolist()
+            for name, column in zip(spec.outputs, columns):
+                for out, value, is_ready in zip(results, column, ready_rows):
+                    if is_ready:
+                        out[name] = value
+        return results
+
+    @staticmethod
+    def _advance(nodes: List[ExponentialMovingAverage], values: np.ndarray, span: int) -> np.ndarray:
+        """EMA ノードの前回値を集めて1本分だけ進め、各ノードに書き戻します。"""
+        previous = np.array([math.nan if node.value is None else node.value for node in nodes])
+        updated = ema_step(previous, values, span)
+        for node, value in zip(nodes, updated.tolist()):
+            node.value = value
+        return updated
+
+    @staticmethod
+    def _batch_columns(
+        spec: IndicatorSpec,
+        counts: np.ndarray,
+        stats: Dict[int, Tuple[np.ndarray, np.ndarray]],
+        rsis: Dict[int, np.ndarray],
+        emas: Dict[int, np.ndarray],
+        signal_emas: Dict[Tuple[int, int, int], np.ndarray],
+    ) -> Tuple[List[List[float]], np.ndarray]:
+        """指標の出力ごとの値の列と、出力する行（_emit_* と同じ条件）を返します。"""
+        if spec.kind in ("ma", "bb"):
+            window = int(spec.params[0])
+            mean, std = stats[window]
+            ready = counts >= window
+            if spec.kind == "ma":
+                return [mean.tolist()], ready
+            num_std = spec.params[1]
+            return [mean.tolist(), (mean + num_std * std).tolist(), (mean - num_std * std).tolist()], ready
+
+        if spec.kind == "rsi":
+            rsi = rsis[int(spec.params[0])]
+            return [rsi.tolist()], ~np.isnan(rsi)
+
+        if spec.kind == "ema":
+            span = int(spec.params[0])
+            return [emas[span].tolist()], counts >= span
+
+        fast, slow, signal = (int(param) for param in spec.params)
+        macd = emas[fast] - emas[slow]
+        signal_line = signal_emas[(fast, slow, signal)]
+        return [macd.tolist(), signal_line.tolist(), (macd - signal_line).tolist()], counts >= slow + signal
+
+    def _build(self, spec: IndicatorSpec) -> _Emitter:
+        """指標に必要なノードをグラフに追加し（既存のノードは共有）、指標を書き込む関数を返します。"""
+        if spec.kind in ("ma", "bb"):
+            window = int(spec.params[0])
+            stats = self._stats.get(window)
+            if stats is None:
+                stats = self._stats[window] = RollingStats(window)
+            if spec.kind == "ma":
+                (name,) = spec.outputs
+                return lambda out: self._emit_ma(out, stats, name)
+            return lambda out: self._emit_bb(out, stats, spec.params[1], spec.outputs)
+
+        if spec.kind == "rsi":
+            period = int(spec.params[0])
+            rsi = self._rsi.get(period)
+            if rsi is None:
+                rsi = self._rsi[period] = RollingRsi(period)
+            (name,) = spec.outputs
+            return lambda out: self._emit_rsi(out, rsi, name)
+
+        if spec.kind == "ema":
+            span = int(spec.params[0])
+            ema = self._ema(span)
+            (name,) = spec.outputs
+            return lambda out: self._emit_ema(out, ema, span, name)
+
+        # macd
+        fast, slow, signal = (int(param) for param in spec.params)
+        ema_fast = self._ema(fast)
+        ema_slow = self._ema(slow)
+        key = (fast, slow, signal)
+        signal_ema = self._signal_emas.get(key)
+        if signal_ema is None:
+            signal_ema = self._signal_emas[key] = ExponentialMovingAverage(signal)
+        return lambda out: self._emit_macd(out, ema_fast, ema_slow, signal_ema, slow + signal, spec.outputs)
+
+    def _ema(self, span: int) -> ExponentialMovingAverage:
+        """終値の EMA ノードを取得します（存在しない場合は追加）。"""
+        ema = self._emas.get(span)
+        if ema is None:
+            ema = self._emas[span] = ExponentialMovingAverage(span)
+        return ema
+
+    @staticmethod
+    def _emit_ma(out: Dict[str, float], stats: RollingStats, name: str) -> None:
+        # 移動平均（MA）
+        if stats.ready:
+            out[name] = stats.mean
+
+    @staticmethod
+    def _emit_bb(
+        out: Dict[str, float], stats: RollingStats, num_std: float, names: Tuple[str, ...]
+    ) -> None:
+        # ボリンジャーバンド（中心線は同じ期間の MA と同一）
+        if stats.ready:
+            middle = stats.mean
+            std = stats.std
+            out[names[0]] = middle
+            out[names[1]] = middle + num_std * std
+            out[names[2]] = middle - num_std * std
+
+    @staticmethod
+    def _emit_rsi(out: Dict[str, float], rsi: RollingRsi, name: str) -> None:
+        # RSI（相対力指数）
+        value = rsi.value
+        if value is not None:
+            out[name] = value
+
+    def _emit_ema(self, out: Dict[str, float], ema: ExponentialMovingAverage, span: int, name: str) -> None:
+        # 指数移動平均（期間分の本数がそろうまでは出力しない）
+        if self._count >= span:
+            out[name] = ema.value
+
+    def _emit_macd(
+        self,
+        out: Dict[str, float],
+        ema_fast: ExponentialMovingAverage,
+        ema_slow: ExponentialMovingAverage,
+        signal_ema: ExponentialMovingAverage,
+        warmup: int,
+        names: Tuple[str, ...],
+    ) -> None:
+        # MACD（シグナル線が安定するだけの本数（slow + signal）がそろってから出力する）
+        if self._count >= warmup:
+            macd = ema_fast.value - ema_slow.value
+            out[names[0]] = macd
+            out[names[1]] = signal_ema.value
+            out[names[2]] = macd - signal_ema.value
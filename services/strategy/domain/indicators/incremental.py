@@ -0,0 +1,238 @@
+"""Incremental indicator primitives.
+
+Domain layer: インクリメンタル指標計算の基本要素
+責務: 終値が1本追加されるたびに、指標の内部状態を O(1) で更新する
+"""
+import math
+from typing import Optional, Sequence
+
+# 浮動小数点誤差の蓄積を防ぐため、この回数ごとにウィンドウ全体から再計算する（償却 O(1)）
+_RESYNC_INTERVAL = 10_000
+
+
+class RollingStats:
+    """固定ウィンドウの平均・標準偏差（スライディング Welford 法）。
+
+    pandas の `rolling(window).mean()` / `rolling(window).std()`（ddof=1）と同じ値を返します。
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initialize Rolling Stats.
+
+        Args:
+            window: ウィンドウサイズ
+        """
+        self.window = window
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates_since_resync = 0
+
+    @property
+    def ready(self) -> bool:
+        """ウィンドウが埋まっているかどうか。"""
+        return self._count >= self.window
+
+    @property
+    def mean(self) -> float:
+        """ウィンドウ内の平均値。"""
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        """ウィンドウ内の標本標準偏差（ddof=1）。"""
+        if self._count < 2:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self._count - 1))
+
+    def update(self, series: Sequence[float]) -> None:
+        """series の末尾に追加された値でウィンドウを更新します。
+
+        Args:
+            series: 終値の時系列（末尾が最新値、少なくとも window + 1 本を保持していること）
+        """
+        value = float(series[-1])
+        if self._count < self.window:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+            return
+
+        evicted = float(series[-(self.window + 1)])
+        old_mean = self._mean
+        self._mean += (value - evicted) / self.window
+        self._m2 += (value - evicted) * (value - self._mean + evicted - old_mean)
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= _RESYNC_INTERVAL:
+            self._resync(series)
+
+    def rebuild(self, series: Sequence[float]) -> None:
+        """直近の値だけからウィンドウの状態を作り直します（更新を読み飛ばした後の再同期用）。
+
+        Args:
+            series: 終値の時系列（末尾が最新値）
+        """
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates_since_resync = 0
+        for end in range(max(len(series) - self.window, 0) + 1, len(series) + 1):
+            self.update(series[:end])
+
+    def _resync(self, series: Sequence[float]) -> None:
+        """ウィンドウ全体から平均と二乗偏差和を再計算します。"""
+        values = [float(series[-i]) for i in range(1, self.window + 1)]
+        self._mean = sum(values) / self.window
+        self._m2 = sum((v - self._mean) ** 2 for v in values)
+        self._updates_since_resync = 0
+
+
+class ExponentialMovingAverage:
+    """再帰型の指数移動平均。
+
+    pandas の `ewm(span=span, adjust=False).mean()` と同じ漸化式で、最初の値で初期化します。
+    """
+
+    def __init__(self, span: int) -> None:
+        """Initialize Exponential Moving Average.
+
+        Args:
+            span: EMA の期間
+        """
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        """新しい値で EMA を更新します。
+
+        Args:
+            value: 新しい値
+
+        Returns:
+            更新後の EMA
+        """
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class RollingRsi:
+    """単純移動平均ベースの RSI。
+
+    直近 period 本の値幅（上昇幅・下落幅）の合計を保持し、
+    `IndicatorCalculatorUseCase` の従来の pandas 実装と同じ値を返します。
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        """Initialize Rolling RSI.
+
+        Args:
+            period: 期間（デフォルト: 14）
+        """
+        self.period = period
+        self._count = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        # 0 でない値幅の件数（合計が誤差で 0 にならない問題を避けるために使用）
+        self._gain_nonzero = 0
+        self._loss_nonzero = 0
+
+    @property
+    def ready(self) -> bool:
+        """period 本分の値幅が揃っているかどうか。"""
+        return self._count >= self.period + 1
+
+    def update(self, series: Sequence[float]) -> None:
+        """series の末尾に追加された値で値幅の合計を更新します。
+
+        Args:
+            series: 終値の時系列（末尾が最新値、少なくとも period + 2 本を保持していること）
+        """
+        self._count += 1
+        if self._count < 2:
+            return
+        self._apply(float(series[-1] - series[-2]), 1)
+        if self._count > self.period + 1:
+            self._apply(float(series[-(self.period + 1)] - series[-(self.period + 2)]), -1)
+
+    def rebuild(self, series: Sequence[float]) -> None:
+        """直近の値だけから値幅の合計を作り直します（更新を読み飛ばした後の再同期用）。
+
+        Args:
+            series: 終値の時系列（末尾が最新値）
+        """
+        self._count = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._gain_nonzero = 0
+        self._loss_nonzero = 0
+        for end in range(max(len(series) - (self.period + 1), 0) + 1, len(series) + 1):
+            self.update(series[:end])
+
+    def _apply(self, delta: float, sign: int) -> None:
+        """値幅を合計に加算（sign=1）または減算（sign=-1）します。"""
+        if delta > 0:
+            self._gain_nonzero += sign
+            self._gain_sum = self._gain_sum + sign * delta if self._gain_nonzero else 0.0
+        elif delta < 0:
+            self._loss_nonzero += sign
+            self._loss_sum = self._loss_sum - sign * delta if self._loss_nonzero else 0.0
+
+    @property
+    def value(self) -> Optional[float]:
+        """RSI 値（計算できない場合は None）。"""
+        if not self.ready:
+            return None
+        gain = self._gain_sum / self.period
+        loss = self._loss_sum / self.period
+        if loss == 0.0:
+            # 0/0 は未定義、それ以外は上昇のみで RSI=100
+            return 100.0 if gain > 0.0 else None
+        rs = gain / loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+
+class Macd:
+    """MACD（再帰型 EMA による MACD 線・シグナル線・ヒストグラム）。"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        """Initialize MACD.
+
+        Args:
+            fast: 短期EMA期間（デフォルト: 12）
+            slow: 長期EMA期間（デフォルト: 26）
+            signal: シグナル線の期間（デフォルト: 9）
+        """
+        self.slow = slow
+        self.signal_span = signal
+        self._ema_fast = ExponentialMovingAverage(fast)
+        self._ema_slow = ExponentialMovingAverage(slow)
+        self._ema_signal = ExponentialMovingAverage(signal)
+        self._count = 0
+        self.macd = math.nan
+        self.signal = math.nan
+
+    @property
+    def ready(self) -> bool:
+        """シグナル線が安定するだけの本数（slow + signal）が揃っているかどうか。"""
+        return self._count >= self.slow + self.signal_span
+
+    @property
+    def hist(self) -> float:
+        """ヒストグラム（MACD 線 - シグナル線）。"""
+        return self.macd - self.signal
+
+    def update(self, value: float) -> None:
+        """新しい終値で MACD を更新します。
+
+        Args:
+            value: 終値
+        """
+        self._count += 1
+        self.macd = self._ema_fast.update(value) - self._ema_slow.update(value)
+        self.signal = self._ema_signal.update(self.macd)
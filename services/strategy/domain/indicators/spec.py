@@ -0,0 +1,118 @@
+"""Indicator specifications.
+
+Domain layer: 指標の宣言（種類とパラメータ）
+責務: "ma:7" や "macd:12:26:9" のような指標の宣言をパースし、出力する指標名を決める
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# 指標の種類ごとのパラメータ数
+_ARITY: Dict[str, int] = {"ma": 1, "ema": 1, "rsi": 1, "bb": 2, "macd": 3}
+# パラメータを省略できる指標のデフォルト値（出力名に接尾辞が付かない）
+_DEFAULTS: Dict[str, Tuple[float, ...]] = {"rsi": (14,), "bb": (20, 2), "macd": (12, 26, 9)}
+
+
+def _number(value: Union[str, float]) -> float:
+    """パラメータを数値に変換します（整数値は int にする）。"""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """Declarative indicator request (kind + parameters).
+
+    文字列表記は "<種類>:<パラメータ>:..." です。
+    - "ma:<期間>": 単純移動平均 → ma_<期間>
+    - "ema:<期間>": 指数移動平均 → ema_<期間>
+    - "rsi[:<期間>]": RSI（デフォルト 14）→ rsi
+    - "bb[:<期間>[:<標準偏差の倍率>]]": ボリンジャーバンド（デフォルト 20, 2）→ bb_middle, bb_upper, bb_lower
+    - "macd[:<短期>[:<長期>[:<シグナル>]]]": MACD（デフォルト 12, 26, 9）→ macd, macd_signal, macd_hist
+    デフォルト以外のパラメータの rsi / bb / macd は、出力名にパラメータの接尾辞が付きます（例: rsi_7）。
+    """
+
+    kind: str
+    params: Tuple[float, ...]
+
+    @classmethod
+    def parse(cls, value: Union[str, "IndicatorSpec"]) -> "IndicatorSpec":
+        """文字列表記をパースします。
+
+        Args:
+            value: 文字列表記（例: "ma:7"）または IndicatorSpec
+
+        Returns:
+            IndicatorSpec
+
+        Raises:
+            ValueError: 種類が未対応、またはパラメータが不正な場合
+        """
+        if isinstance(value, IndicatorSpec):
+            return value
+        kind, *raw = [part.strip() for part in value.strip().split(":")]
+        arity = _ARITY.get(kind)
+        if arity is None:
+            raise ValueError(f"Unknown indicator: {value}")
+        defaults = _DEFAULTS.get(kind, ())
+        if len(raw) > arity or len(raw) + len(defaults) < arity:
+            raise ValueError(f"Invalid indicator parameters: {value}")
+        try:
+            params = tuple(_number(part) for part in raw) + tuple(defaults[len(raw) :])
+        except ValueError:
+            raise ValueError(f"Invalid indicator parameters: {value}") from None
+
+        # ボリンジャーバンドの倍率以外は正の整数（期間）
+        periods = params[:1] if kind == "bb" else params
+        if any(not isinstance(period, int) or period <= 0 for period in periods) or params[-1] <= 0:
+            raise ValueError(f"Invalid indicator parameters: {value}")
+        if kind == "macd" and params[0] >= params[1]:
+            raise ValueError(f"MACD fast period must be shorter than slow period: {value}")
+        return cls(kind, params)
+
+    @property
+    def suffix(self) -> str:
+        """出力名の接尾辞（デフォルトのパラメータの場合は空）。"""
+        if self.kind in ("ma", "ema"):
+            return f"_{self.params[0]}"
+        if self.params == _DEFAULTS[self.kind]:
+            return ""
+        return "_" + "_".join(str(param) for param in self.params)
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        """この指標が出力する指標名。"""
+        suffix = self.suffix
+        if self.kind == "bb":
+            return (f"bb_middle{suffix}", f"bb_upper{suffix}", f"bb_lower{suffix}")
+        if self.kind == "macd":
+            return (f"macd{suffix}", f"macd_signal{suffix}", f"macd_hist{suffix}")
+        return (f"{self.kind}{suffix}",)
+
+    def __str__(self) -> str:
+        return ":".join([self.kind, *(str(param) for param in self.params)])
+
+
+# 戦略が指標を宣言しない場合に計算する指標（従来の指標一式）
+DEFAULT_INDICATORS: Tuple[str, ...] = ("ma:5", "ma:20", "ma:50", "rsi:14", "bb:20:2", "macd:12:26:9")
+
+
+def parse_indicators(
+    values: Optional[Iterable[Union[str, IndicatorSpec]]] = None,
+) -> List[IndicatorSpec]:
+    """指標の宣言をパースし、重複を除いて返します（宣言順を保持）。
+
+    Args:
+        values: 指標の宣言のリスト（None または空の場合は DEFAULT_INDICATORS）
+
+    Returns:
+        IndicatorSpec のリスト
+
+    Raises:
+        ValueError: 宣言が不正な場合
+    """
+    specs: List[IndicatorSpec] = []
+    for value in list(values or ()) or DEFAULT_INDICATORS:
+        spec = IndicatorSpec.parse(value)
+        if spec not in specs:
+            specs.append(spec)
+    return specs
@@ -0,0 +1,17 @@
+"""In-memory market data structures (price history, bars, order books, trade tapes)."""
+
+from .bar_aggregator import BarAggregator, CascadingBarAggregator, parse_timeframe
+from .ohlcv_buffer import OHLCVRingBuffer
+from .order_book import OrderBook, OrderBookStore
+from .trade_tape import TradeTape, TradeTapeStore
+
+__all__ = [
+    "BarAggregator",
+    "CascadingBarAggregator",
+    "OHLCVRingBuffer",
+    "OrderBook",
+    "OrderBookStore",
+    "TradeTape",
+    "TradeTapeStore",
+    "parse_timeframe",
+]
@@ -0,0 +1,304 @@
+"""Streaming OHLCV bar aggregator.
+
+Domain layer: 時間足ごとのローソク足集約
+責務: 取引所・シンボルごとに未確定のバーを1本だけ保持し、ティックを O(1) で反映して、
+      時間足の境界を越えたときに確定した OHLCV を返す
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from shared.domain.models import OHLCV
+
+_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
+def parse_timeframe(timeframe: str) -> int:
+    """時間足の文字列をミリ秒に変換します。
+
+    Args:
+        timeframe: 時間足（例: "1s", "1m", "5m", "1h"）
+
+    Returns:
+        時間足の長さ（ミリ秒）
+
+    Raises:
+        ValueError: 時間足の形式が不正な場合
+    """
+    unit = timeframe[-1:]
+    amount = timeframe[:-1]
+    if unit not in _UNIT_MS or not amount.isdigit() or int(amount) <= 0:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    return int(amount) * _UNIT_MS[unit]
+
+
+class _OpenBar:
+    """未確定のバー（1取引所・1シンボル・1時間足につき1本）。"""
+
+    __slots__ = ("exchange", "start_ms", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        exchange: str,
+        start_ms: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        self.exchange = exchange
+        self.start_ms = start_ms
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+
+class BarAggregator:
+    """Aggregate ticks into OHLCV bars of a single timeframe.
+
+    バケットの判定にはメッセージのタイムスタンプ（ts）を使用するため、
+    壁時計に依存せず、過去データのリプレイでも同じバーが生成されます。
+    未確定のバーは ohlcv テーブルの一意制約と同じく（取引所, シンボル）ごとに保持します。
+    """
+
+    def __init__(self, timeframe: str = "1s") -> None:
+        """Initialize Bar Aggregator.
+
+        Args:
+            timeframe: 時間足（例: "1s", "1m", "5m"）
+        """
+        self.timeframe = timeframe
+        self.interval_ms = parse_timeframe(timeframe)
+        self._bars: Dict[Tuple[str, str], _OpenBar] = {}
+        # 未確定バーより前のバケットに属する（遅れて届いた）ため破棄したティックの件数
+        self.late_ticks = 0
+
+    def update(
+        self,
+        exchange: str,
+        symbol: str,
+        ts: int,
+        price: float,
+        volume: float = 0.0,
+    ) -> Optional[OHLCV]:
+        """ティックを未確定バーに反映します。
+
+        Args:
+            exchange: 取引所名（例: "gmo"）
+            symbol: シンボル（例: "BTC_JPY"）
+            ts: ティックのタイムスタンプ（エポックミリ秒）
+            price: 価格
+            volume: 出来高
+
+        Returns:
+            バケットの境界を越えた場合は確定した OHLCV、それ以外は None
+        """
+        closed = self._merge(exchange, symbol, ts, price, price, price, price, volume)
+        return self._to_ohlcv(symbol, closed) if closed else None
+
+    def _merge(
+        self,
+        exchange: str,
+        symbol: str,
+        ts: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> Optional[_OpenBar]:
+        """ティックまたは下位時間足のバーを未確定バーに反映します。
+
+        Returns:
+            バケットの境界を越えた場合は確定したバー、それ以外は None
+        """
+        start_ms = ts - ts % self.interval_ms
+        key = (exchange, symbol)
+        bar = self._bars.get(key)
+
+        if bar is None:
+            self._bars[key] = _OpenBar(exchange, start_ms, open, high, low, close, volume)
+            return None
+
+        if start_ms == bar.start_ms:
+            if high > bar.high:
+                bar.high = high
+            if low < bar.low:
+                bar.low = low
+            bar.close = close
+            bar.volume += volume
+            return None
+
+        if start_ms < bar.start_ms:
+            # 確定済みのバケットには戻れず、未確定バーの出来高に混ぜると永続化される出来高が狂うため、
+            # 件数だけ数えて破棄する
+            self.late_ticks += 1
+            return None
+
+        self._bars[key] = _OpenBar(exchange, start_ms, open, high, low, close, volume)
+        return bar
+
+    def _close_if_complete(self, exchange: str, symbol: str, covered_until_ms: int) -> Optional[_OpenBar]:
+        """未確定バーの期間がすべて埋まっていれば、次のティックを待たずに確定します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+            covered_until_ms: 反映済みのデータがカバーしている時刻（エポックミリ秒）
+
+        Returns:
+            確定したバー（未確定のままの場合は None）
+        """
+        key = (exchange, symbol)
+        bar = self._bars.get(key)
+        if bar is not None and covered_until_ms >= bar.start_ms + self.interval_ms:
+            del self._bars[key]
+            return bar
+        return None
+
+    def _to_ohlcv(self, symbol: str, bar: _OpenBar) -> OHLCV:
+        """未確定バーを OHLCV エンティティに変換します。"""
+        return OHLCV(
+            exchange=bar.exchange,
+            symbol=symbol,
+            timeframe=self.timeframe,
+            timestamp=datetime.fromtimestamp(bar.start_ms / 1000),
+            open=Decimal(str(bar.open)),
+            high=Decimal(str(bar.high)),
+            low=Decimal(str(bar.low)),
+            close=Decimal(str(bar.close)),
+            volume=Decimal(str(bar.volume)),
+        )
+
+
+class CascadingBarAggregator:
+    """Roll bars up through multiple timeframes (e.g. 1s -> 1m -> 5m -> 1h).
+
+    最小の時間足だけをティックから集約し、確定したバーを順に上位の時間足へ流し込みます。
+    生のティックや履歴を保持せず、リサンプリングも行いません。
+    """
+
+    def __init__(self, timeframes: Sequence[str]) -> None:
+        """Initialize Cascading Bar Aggregator.
+
+        Args:
+            timeframes: 時間足のリスト（例: ["1s", "1m", "5m"]、順不同・重複可）
+
+        Raises:
+            ValueError: 時間足が空、または上位の時間足が下位の時間足で割り切れない場合
+        """
+        unique = sorted(set(timeframes), key=parse_timeframe)
+        if not unique:
+            raise ValueError("At least one timeframe is required")
+        self._levels: List[BarAggregator] = [BarAggregator(timeframe) for timeframe in unique]
+        for lower, upper in zip(self._levels, self._levels[1:]):
+            if upper.interval_ms % lower.interval_ms != 0:
+                raise ValueError(
+                    f"Timeframe {upper.timeframe} is not a multiple of {lower.timeframe}"
+                )
+
+    @property
+    def timeframes(self) -> List[str]:
+        """集約対象の時間足（昇順）。"""
+        return [level.timeframe for level in self._levels]
+
+    def open_bar_ends(self, exchange: str, symbol: str) -> List[Tuple[str, Optional[int]]]:
+        """時間足ごとの未確定のバーの終了時刻を返します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+
+        Returns:
+            (時間足, 未確定のバーの終了時刻（エポックミリ秒、未確定のバーがない場合は None)) のリスト（下位の時間足から順）
+        """
+        key = (exchange, symbol)
+        result: List[Tuple[str, Optional[int]]] = []
+        for level in self._levels:
+            bar = level._bars.get(key)
+            result.append((level.timeframe, bar.start_ms + level.interval_ms if bar is not None else None))
+        return result
+
+    def export_open_bars(self) -> Dict[str, Dict[str, Dict[str, List[Any]]]]:
+        """未確定のバーをシリアライズ可能な形式で返します（チェックポイント用）。
+
+        Returns:
+            時間足 → 取引所 → シンボル → [開始時刻（エポックミリ秒）, 始値, 高値, 安値, 終値, 出来高] の辞書
+        """
+        state: Dict[str, Dict[str, Dict[str, List[Any]]]] = {}
+        for level in self._levels:
+            exchanges: Dict[str, Dict[str, List[Any]]] = {}
+            for (exchange, symbol), bar in level._bars.items():
+                exchanges.setdefault(exchange, {})[symbol] = [
+                    bar.start_ms, bar.open, bar.high, bar.low, bar.close, bar.volume
+                ]
+            state[level.timeframe] = exchanges
+        return state
+
+    def restore_open_bars(self, state: Dict[str, Dict[str, Dict[str, List[Any]]]]) -> None:
+        """export_open_bars で取得した未確定のバーを復元します。
+
+        集約対象でない時間足は無視します。
+
+        Args:
+            state: export_open_bars が返した辞書
+        """
+        for level in self._levels:
+            for exchange, symbols in state.get(level.timeframe, {}).items():
+                for symbol, values in symbols.items():
+                    start_ms, open, high, low, close, volume = values
+                    level._bars[(exchange, symbol)] = _OpenBar(
+                        exchange, int(start_ms), float(open), float(high), float(low), float(close), float(volume)
+                    )
+
+    def update(
+        self,
+        exchange: str,
+        symbol: str,
+        ts: int,
+        price: float,
+        volume: float = 0.0,
+    ) -> List[OHLCV]:
+        """ティックを反映し、確定したすべての時間足のバーを返します。
+
+        Args:
+            exchange: 取引所名（例: "gmo"）
+            symbol: シンボル（例: "BTC_JPY"）
+            ts: ティックのタイムスタンプ（エポックミリ秒）
+            price: 価格
+            volume: 出来高
+
+        Returns:
+            確定した OHLCV のリスト（下位の時間足から順、確定なしの場合は空）
+        """
+        base = self._levels[0]
+        closed = base._merge(exchange, symbol, ts, price, price, price, price, volume)
+        if closed is None:
+            return []
+
+        result: List[OHLCV] = []
+        pending = [closed]
+        for index, level in enumerate(self._levels):
+            result.extend(level._to_ohlcv(symbol, bar) for bar in pending)
+            if index + 1 == len(self._levels):
+                break
+
+            upper = self._levels[index + 1]
+            rolled: List[_OpenBar] = []
+            for bar in pending:
+                previous = upper._merge(
+                    bar.exchange, symbol, bar.start_ms, bar.open, bar.high, bar.low, bar.close, bar.volume
+                )
+                if previous:
+                    rolled.append(previous)
+                completed = upper._close_if_complete(bar.exchange, symbol, bar.start_ms + level.interval_ms)
+                if completed:
+                    rolled.append(completed)
+            if not rolled:
+                break
+            pending = rolled
+
+        return result
@@ -0,0 +1,178 @@
+"""OHLCV ring buffer.
+
+Domain layer: シンボル単位のローソク足履歴（固定容量のリングバッファ）
+責務: OHLCV をフィールドごとの float64 配列に保持し、時系列順のビューをコピーなしで提供する
+"""
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+from shared.domain.models import OHLCV
+
+FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# シリアライズ形式のヘッダー（容量, 本数）。続けてフィールドごとに本数分の float64（リトルエンディアン）が並ぶ
+_HEADER = struct.Struct("<II")
+_DTYPE = np.dtype("<f8")
+
+
+class OHLCVRingBuffer:
+    """Fixed-capacity OHLCV ring buffer (struct of arrays).
+
+    各フィールドを容量の2倍の配列に二重書き込みすることで、
+    古い順に並んだ直近 N 本を常に連続したスライス（ゼロコピーのビュー）として参照できます。
+    メモリ使用量は容量 × 6 フィールド × 16 バイトで一定です。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize OHLCV Ring Buffer.
+
+        Args:
+            capacity: 保持するローソク足の最大本数
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self._arrays: Dict[str, np.ndarray] = {
+            field: np.zeros(2 * capacity, dtype=np.float64) for field in FIELDS
+        }
+        self._pos = 0  # 次に書き込む位置（0 <= _pos < capacity）
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        timestamp: float,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        """ローソク足を1本追加します（容量を超えた場合は最も古い1本を上書き）。
+
+        Args:
+            timestamp: エポック秒
+            open: 始値
+            high: 高値
+            low: 安値
+            close: 終値
+            volume: 出来高
+        """
+        pos = self._pos
+        mirror = pos + self.capacity
+        for field, value in (
+            ("timestamp", timestamp),
+            ("open", open),
+            ("high", high),
+            ("low", low),
+            ("close", close),
+            ("volume", volume),
+        ):
+            array = self._arrays[field]
+            array[pos] = value
+            array[mirror] = value
+
+        self._pos = (pos + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def append_ohlcv(self, ohlcv: OHLCV) -> None:
+        """OHLCV エンティティを1本追加します。
+
+        Args:
+            ohlcv: OHLCV エンティティ
+        """
+        self.append(
+            ohlcv.timestamp.timestamp(),
+            float(ohlcv.open),
+            float(ohlcv.high),
+            float(ohlcv.low),
+            float(ohlcv.close),
+            float(ohlcv.volume),
+        )
+
+    def to_bytes(self) -> bytes:
+        """保持しているローソク足をバイナリ形式にシリアライズします（チェックポイント用）。
+
+        Returns:
+            ヘッダーとフィールドごとの float64 配列（古い順）を連結したバイト列
+        """
+        parts = [_HEADER.pack(self.capacity, self._size)]
+        parts.extend(self.view(field).astype(_DTYPE, copy=False).tobytes() for field in FIELDS)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: Optional[int] = None) -> "OHLCVRingBuffer":
+        """to_bytes でシリアライズしたバイト列からリングバッファを復元します。
+
+        Args:
+            data: to_bytes が返したバイト列
+            capacity: 復元後の容量（省略した場合はシリアライズ時の容量、
+                保持していた本数より小さい場合は新しい方から capacity 本を復元）
+
+        Returns:
+            OHLCVRingBuffer インスタンス
+
+        Raises:
+            ValueError: バイト列の形式が不正な場合
+        """
+        stored_capacity, size = _HEADER.unpack_from(data)
+        if len(data) != _HEADER.size + len(FIELDS) * size * _DTYPE.itemsize:
+            raise ValueError(f"Invalid OHLCV buffer data: {len(data)} bytes for {size} bars")
+        buffer = cls(capacity or stored_capacity)
+        columns = np.frombuffer(data, dtype=_DTYPE, offset=_HEADER.size).reshape(len(FIELDS), size)
+        keep = min(size, buffer.capacity)
+        for field, column in zip(FIELDS, columns):
+            array = buffer._arrays[field]
+            array[:keep] = column[size - keep :]
+            array[buffer.capacity : buffer.capacity + keep] = column[size - keep :]
+        buffer._pos = keep % buffer.capacity
+        buffer._size = keep
+        return buffer
+
+    def view(self, field: str) -> np.ndarray:
+        """フィールドの時系列ビューを返します（古い順、末尾が最新）。
+
+        Args:
+            field: フィールド名（"timestamp", "open", "high", "low", "close", "volume"）
+
+        Returns:
+            読み取り専用のビュー（バッファ更新後は参照しないこと）
+        """
+        end = self._pos + self.capacity
+        view = self._arrays[field][end - self._size : end]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        """タイムスタンプ（エポック秒）のビュー。"""
+        return self.view("timestamp")
+
+    @property
+    def open(self) -> np.ndarray:
+        """始値のビュー。"""
+        return self.view("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        """高値のビュー。"""
+        return self.view("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        """安値のビュー。"""
+        return self.view("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        """終値のビュー。"""
+        return self.view("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        """出来高のビュー。"""
+        return self.view("volume")
@@ -0,0 +1,216 @@
+"""L2 order book.
+
+Domain layer: 取引所・シンボル単位の板情報（価格レベルごとの数量）
+責務: 板のスナップショット・差分更新を反映し、最良気配・スプレッド・板厚・板の偏りを提供する
+"""
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 板の価格レベル（[価格, 数量] の配列、または {"price": ..., "size": ...}）
+Level = Any
+
+
+def _level(level: Level) -> Tuple[float, float]:
+    """価格レベルを (価格, 数量) に変換します。"""
+    if isinstance(level, dict):
+        return float(level["price"]), float(level["size"])
+    return float(level[0]), float(level[1])
+
+
+class _BookSide:
+    """板の片側（買い板または売り板）。
+
+    価格を sign 倍したキーを昇順のリストに保持し、最良気配を常に末尾に置きます。
+    更新の大半は最良気配付近で発生するため、挿入・削除で移動する要素も少なくて済みます。
+    """
+
+    __slots__ = ("sign", "keys", "sizes")
+
+    def __init__(self, sign: float) -> None:
+        # 買い板は sign=1（価格の昇順、末尾が最高値）、売り板は sign=-1（価格の降順、末尾が最安値）
+        self.sign = sign
+        self.keys: List[float] = []
+        self.sizes: List[float] = []
+
+    def replace(self, levels: Iterable[Level]) -> None:
+        """片側の板をスナップショットで置き換えます。"""
+        sign = self.sign
+        pairs = [(sign * price, size) for price, size in map(_level, levels) if size > 0]
+        # 取引所のスナップショットは最良気配から順に並んでいるため、通常は反転だけで済む
+        pairs.reverse()
+        if any(pairs[i][0] >= pairs[i + 1][0] for i in range(len(pairs) - 1)):
+            merged: Dict[float, float] = dict(pairs)
+            pairs = sorted(merged.items())
+        self.keys = [key for key, _ in pairs]
+        self.sizes = [size for _, size in pairs]
+
+    def update(self, price: float, size: float) -> None:
+        """価格レベルの数量を更新します（数量 0 で削除）。O(log n) の探索 + 末尾付近の挿入・削除。"""
+        key = self.sign * price
+        keys = self.keys
+        index = bisect_left(keys, key)
+        exists = index < len(keys) and keys[index] == key
+        if size > 0:
+            if exists:
+                self.sizes[index] = size
+            else:
+                keys.insert(index, key)
+                self.sizes.insert(index, size)
+        elif exists:
+            del keys[index]
+            del self.sizes[index]
+
+    def best(self) -> Optional[float]:
+        """最良気配の価格（板が空の場合は None）。"""
+        return self.sign * self.keys[-1] if self.keys else None
+
+    def depth(self, levels: int) -> float:
+        """最良気配から levels 本分の数量の合計。"""
+        return sum(self.sizes[-levels:]) if levels > 0 else 0.0
+
+
+class OrderBook:
+    """In-memory L2 order book for one symbol."""
+
+    def __init__(self) -> None:
+        """Initialize Order Book."""
+        self.bids = _BookSide(1.0)
+        self.asks = _BookSide(-1.0)
+        self.ts = 0
+
+    def apply_snapshot(self, bids: Iterable[Level], asks: Iterable[Level], ts: int = 0) -> None:
+        """板全体をスナップショットで置き換えます。
+
+        Args:
+            bids: 買い板の価格レベル
+            asks: 売り板の価格レベル
+            ts: スナップショットのタイムスタンプ（エポックミリ秒）
+        """
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self.ts = ts
+
+    def apply_update(
+        self, bids: Iterable[Level] = (), asks: Iterable[Level] = (), ts: int = 0
+    ) -> None:
+        """差分（変更された価格レベル）を反映します（数量 0 のレベルは削除）。
+
+        Args:
+            bids: 変更された買い板の価格レベル
+            asks: 変更された売り板の価格レベル
+            ts: 差分のタイムスタンプ（エポックミリ秒）
+        """
+        for price, size in map(_level, bids):
+            self.bids.update(price, size)
+        for price, size in map(_level, asks):
+            self.asks.update(price, size)
+        self.ts = ts
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        """最良買い気配。"""
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        """最良売り気配。"""
+        return self.asks.best()
+
+    def features(self, depth: int = 5) -> Dict[str, float]:
+        """板の特徴量を返します。
+
+        Args:
+            depth: 板厚・板の偏りを計算する価格レベルの本数
+
+        Returns:
+            特徴量の辞書（best_bid, best_ask, spread, mid_price, bid_depth, ask_depth, book_imbalance）。
+            片側の板が空の場合は計算できる値のみを含みます
+        """
+        result: Dict[str, float] = {}
+        best_bid = self.best_bid
+        best_ask = self.best_ask
+        if best_bid is not None:
+            result["best_bid"] = best_bid
+        if best_ask is not None:
+            result["best_ask"] = best_ask
+        if best_bid is not None and best_ask is not None:
+            result["spread"] = best_ask - best_bid
+            result["mid_price"] = (best_ask + best_bid) / 2
+
+        bid_depth = self.bids.depth(depth)
+        ask_depth = self.asks.depth(depth)
+        result["bid_depth"] = bid_depth
+        result["ask_depth"] = ask_depth
+        total = bid_depth + ask_depth
+        if total > 0:
+            # +1 に近いほど買い板が厚く、-1 に近いほど売り板が厚い
+            result["book_imbalance"] = (bid_depth - ask_depth) / total
+        return result
+
+
+class OrderBookStore:
+    """Order books for all markets handled by a worker.
+
+    OHLCV 生成側が md:orderbook のメッセージを反映し、指標計算側が特徴量を参照します。
+    板は ohlcv テーブルの一意制約と同じく（取引所, シンボル）ごとに保持します。
+    """
+
+    def __init__(self, depth: int = 5) -> None:
+        """Initialize Order Book Store.
+
+        Args:
+            depth: 板厚・板の偏りを計算する価格レベルの本数
+        """
+        self.depth = depth
+        self._books: Dict[Tuple[str, str], OrderBook] = {}
+
+    def get(self, exchange: str, symbol: str) -> Optional[OrderBook]:
+        """取引所・シンボルの板を取得します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+
+        Returns:
+            OrderBook（板情報を受信していない場合は None）
+        """
+        return self._books.get((exchange, symbol))
+
+    def apply(self, exchange: str, symbol: str, data: Dict[str, Any], ts: int = 0) -> OrderBook:
+        """md:orderbook のデータを反映します。
+
+        data["type"] が "update" の場合は差分、それ以外はスナップショットとして扱います。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+            data: 板情報（bids, asks を含む）
+            ts: タイムスタンプ（エポックミリ秒）
+
+        Returns:
+            更新後の OrderBook
+        """
+        key = (exchange, symbol)
+        book = self._books.get(key)
+        if book is None:
+            book = self._books[key] = OrderBook()
+        bids: Sequence[Level] = data.get("bids") or ()
+        asks: Sequence[Level] = data.get("asks") or ()
+        if data.get("type") == "update":
+            book.apply_update(bids, asks, ts)
+        else:
+            book.apply_snapshot(bids, asks, ts)
+        return book
+
+    def features(self, exchange: str, symbol: str) -> Dict[str, float]:
+        """取引所・シンボルの板の特徴量を返します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+
+        Returns:
+            特徴量の辞書（板情報を受信していない場合は空）
+        """
+        book = self._books.get((exchange, symbol))
+        return book.features(self.depth) if book else {}
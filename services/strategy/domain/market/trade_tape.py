@@ -0,0 +1,241 @@
+"""Trade tape.
+
+Domain layer: 取引所・シンボル単位の約定履歴（固定容量のリングバッファ）と時間窓の約定特徴量
+責務: 約定を struct-of-arrays に保持し、時間窓ごとの VWAP・売買差・約定頻度・平均約定サイズを
+      約定1件あたり償却 O(1) で更新する
+"""
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from domain.market.bar_aggregator import parse_timeframe
+
+# 浮動小数点誤差の蓄積を防ぐため、この回数の削除ごとに窓内の合計を再計算する（償却 O(1)）
+_RESYNC_INTERVAL = 10_000
+
+
+class _Window:
+    """1つの時間窓の集計値（窓内の約定の合計）。"""
+
+    __slots__ = ("label", "length_ms", "tail", "count", "volume", "notional", "delta", "evictions")
+
+    def __init__(self, label: str, length_ms: int) -> None:
+        self.label = label
+        self.length_ms = length_ms
+        self.tail = 0  # 窓内で最も古い約定の通し番号
+        self.count = 0
+        self.volume = 0.0
+        self.notional = 0.0  # 価格 × 数量の合計
+        self.delta = 0.0  # 買い数量 - 売り数量
+        self.evictions = 0
+
+
+class TradeTape:
+    """Fixed-capacity trade ring buffer with sliding time-window features.
+
+    各時間窓は窓内の合計と最も古い約定の位置だけを保持し、約定の追加時に合計へ加算、
+    窓から外れた約定を古い順に減算します。各約定は窓ごとに1回ずつ加算・減算されるため、
+    約定1件あたりの計算量は償却 O(1) です。
+    容量を超えて約定が上書きされる場合、その約定は窓からも除外されます（窓は容量分の約定に制限される）。
+    """
+
+    def __init__(self, windows: Sequence[str] = ("10s", "1m"), capacity: int = 8192) -> None:
+        """Initialize Trade Tape.
+
+        Args:
+            windows: 特徴量を計算する時間窓（例: ["10s", "1m"]）
+            capacity: 保持する約定の最大件数
+
+        Raises:
+            ValueError: 容量または時間窓の形式が不正な場合
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self.ts = array("q", bytes(8 * capacity))
+        self.price = array("d", bytes(8 * capacity))
+        self.size = array("d", bytes(8 * capacity))
+        self.side = array("b", bytes(capacity))  # 1: 買い, -1: 売り, 0: 不明
+        self._windows: List[_Window] = [_Window(label, parse_timeframe(label)) for label in windows]
+        self._next = 0  # 次に追加する約定の通し番号
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        """最新の約定のタイムスタンプ（約定がない場合は None）。"""
+        return self.ts[(self._next - 1) % self.capacity] if self._next else None
+
+    def append(self, ts: int, price: float, size: float, side: int = 0) -> None:
+        """約定を追加し、各時間窓を更新します。
+
+        Args:
+            ts: 約定のタイムスタンプ（エポックミリ秒）
+            price: 約定価格
+            size: 約定数量
+            side: テイカーの売買方向（1: 買い, -1: 売り, 0: 不明）
+        """
+        seq = self._next
+        oldest = seq - self.capacity
+        if oldest >= 0:
+            # 上書きされる約定をまだ含んでいる窓から除外する
+            for window in self._windows:
+                if window.tail <= oldest:
+                    self._evict_until(window, oldest + 1)
+
+        index = seq % self.capacity
+        self.ts[index] = ts
+        self.price[index] = price
+        self.size[index] = size
+        self.side[index] = side
+        self._next = seq + 1
+
+        notional = price * size
+        signed = side * size
+        for window in self._windows:
+            window.count += 1
+            window.volume += size
+            window.notional += notional
+            window.delta += signed
+            self._expire(window, ts)
+
+    def features(self, as_of_ms: Optional[int] = None) -> Dict[str, float]:
+        """時間窓ごとの約定特徴量を返します。
+
+        約定の追加時には最新の約定時刻を基準に窓を更新するため、約定が途絶えている間も
+        特徴量が減衰するように、参照時に as_of_ms を基準に窓から外れた約定を除外します。
+
+        Args:
+            as_of_ms: 窓の基準時刻（エポックミリ秒、例: バーの終了時刻、省略時は最新の約定時刻）
+
+        Returns:
+            特徴量の辞書（例: vwap_10s, volume_delta_10s, trade_intensity_10s, avg_trade_size_10s）。
+            窓内に約定がない時間窓は含みません
+        """
+        result: Dict[str, float] = {}
+        for window in self._windows:
+            if as_of_ms is not None:
+                self._expire(window, as_of_ms)
+            if window.count == 0 or window.volume <= 0:
+                continue
+            label = window.label
+            result[f"vwap_{label}"] = window.notional / window.volume
+            result[f"volume_delta_{label}"] = window.delta
+            # 1秒あたりの約定件数
+            result[f"trade_intensity_{label}"] = window.count * 1000.0 / window.length_ms
+            result[f"avg_trade_size_{label}"] = window.volume / window.count
+        return result
+
+    def _expire(self, window: _Window, now_ms: int) -> None:
+        """窓の期間（now_ms - length_ms, now_ms] から外れた約定を除外します。"""
+        cutoff = now_ms - window.length_ms
+        end = self._next
+        tail = window.tail
+        ts = self.ts
+        capacity = self.capacity
+        while tail < end and ts[tail % capacity] <= cutoff:
+            tail += 1
+        if tail != window.tail:
+            self._evict_until(window, tail)
+
+    def _evict_until(self, window: _Window, new_tail: int) -> None:
+        """通し番号 new_tail より前の約定を窓から除外します。"""
+        capacity = self.capacity
+        for seq in range(window.tail, new_tail):
+            index = seq % capacity
+            size = self.size[index]
+            window.count -= 1
+            window.volume -= size
+            window.notional -= self.price[index] * size
+            window.delta -= self.side[index] * size
+        window.evictions += new_tail - window.tail
+        window.tail = new_tail
+        if window.count == 0:
+            # 窓が空になった時点で誤差をリセットする
+            window.volume = window.notional = window.delta = 0.0
+            window.evictions = 0
+        elif window.evictions >= _RESYNC_INTERVAL:
+            self._resync(window)
+
+    def _resync(self, window: _Window) -> None:
+        """窓内の約定から合計を再計算します。"""
+        capacity = self.capacity
+        volume = notional = delta = 0.0
+        for seq in range(window.tail, self._next):
+            index = seq % capacity
+            size = self.size[index]
+            volume += size
+            notional += self.price[index] * size
+            delta += self.side[index] * size
+        window.volume = volume
+        window.notional = notional
+        window.delta = delta
+        window.evictions = 0
+
+
+class TradeTapeStore:
+    """Trade tapes for all markets handled by a worker.
+
+    OHLCV 生成側が md:trade の約定を追加し、指標計算側が特徴量を参照します。
+    約定履歴は ohlcv テーブルの一意制約と同じく（取引所, シンボル）ごとに保持します。
+    """
+
+    def __init__(self, windows: Sequence[str] = ("10s", "1m"), capacity: int = 8192) -> None:
+        """Initialize Trade Tape Store.
+
+        Args:
+            windows: 特徴量を計算する時間窓（例: ["10s", "1m"]）
+            capacity: 取引所・シンボルごとに保持する約定の最大件数
+
+        Raises:
+            ValueError: 時間窓の形式が不正な場合
+        """
+        # 時間窓の形式を最初の約定を受信する前に検証する
+        for label in windows:
+            parse_timeframe(label)
+        self.windows = tuple(windows)
+        self.capacity = capacity
+        self._tapes: Dict[Tuple[str, str], TradeTape] = {}
+
+    def get(self, exchange: str, symbol: str) -> Optional[TradeTape]:
+        """取引所・シンボルの約定履歴を取得します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+
+        Returns:
+            TradeTape（約定を受信していない場合は None）
+        """
+        return self._tapes.get((exchange, symbol))
+
+    def append(self, exchange: str, symbol: str, ts: int, price: float, size: float, side: int = 0) -> None:
+        """約定を追加します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+            ts: 約定のタイムスタンプ（エポックミリ秒）
+            price: 約定価格
+            size: 約定数量
+            side: テイカーの売買方向（1: 買い, -1: 売り, 0: 不明）
+        """
+        key = (exchange, symbol)
+        tape = self._tapes.get(key)
+        if tape is None:
+            tape = self._tapes[key] = TradeTape(self.windows, self.capacity)
+        tape.append(ts, price, size, side)
+
+    def features(self, exchange: str, symbol: str, as_of_ms: Optional[int] = None) -> Dict[str, float]:
+        """取引所・シンボルの約定特徴量を返します。
+
+        Args:
+            exchange: 取引所名
+            symbol: シンボル
+            as_of_ms: 窓の基準時刻（エポックミリ秒、省略時は最新の約定時刻）
+
+        Returns:
+            特徴量の辞書（約定を受信していない場合は空）
+        """
+        tape = self._tapes.get((exchange, symbol))
+        return tape.features(as_of_ms) if tape else {}
@@ -0,0 +1,6 @@
+"""Bar sources for backtesting (ohlcv table, CSV files)."""
+
+from .csv_bar_source import CsvBarSource
+from .database_bar_source import DatabaseBarSource
+
+__all__ = ["CsvBarSource", "DatabaseBarSource"]
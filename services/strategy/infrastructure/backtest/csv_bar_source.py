@@ -0,0 +1,98 @@
+"""CSV bar source.
+
+Infrastructure layer: CSV ファイルからのバーの読み込み
+責務: エクスポート済みの OHLCV の CSV を大きなチャンクごとに読み込み、列の NumPy 配列に変換する
+"""
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from application.interfaces.bar_source import BarSource
+from domain.backtest import BarArrays
+
+logger = logging.getLogger(__name__)
+
+_PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class CsvBarSource(BarSource):
+    """Stream bars from a CSV file in large chunks.
+
+    列は timestamp, open, high, low, close, volume（ohlcv テーブルと同じ名前、古い順）です。
+    exchange / symbol / timeframe の列がある場合はその値で絞り込みます。
+    timestamp は ISO 8601 の文字列（タイムゾーンなしは UTC）または UNIX ミリ秒です。
+    チャンクの読み込みはスレッドで実行し、イベントループを止めません。
+    """
+
+    def __init__(self, path: Union[str, Path], chunk_size: int = 1_000_000) -> None:
+        """Initialize CSV Bar Source.
+
+        Args:
+            path: CSV ファイルのパス
+            chunk_size: 1チャンクで読み込む行数
+        """
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+
+    async def iter_chunks(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator[BarArrays]:
+        """[start, end) のバーを古い順にチャンク単位で返します。
+
+        Args:
+            exchange: 取引所（exchange 列がある場合に絞り込む）
+            symbol: シンボル（symbol 列がある場合に絞り込む）
+            timeframe: 時間足（timeframe 列がある場合に絞り込む）
+            start: 開始時刻（省略時は最初のバーから）
+            end: 終了時刻（省略時は最後のバーまで）
+
+        Yields:
+            BarArrays（最大 chunk_size 本）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            KeyError: 必要な列がない場合
+        """
+        filters = {"exchange": exchange, "symbol": symbol, "timeframe": timeframe}
+        lower = np.datetime64(start, "ms") if start is not None else None
+        upper = np.datetime64(end, "ms") if end is not None else None
+
+        reader = pd.read_csv(self.path, chunksize=self.chunk_size)
+        try:
+            while (frame := await asyncio.to_thread(next, reader, None)) is not None:
+                for name, value in filters.items():
+                    if name in frame.columns:
+                        frame = frame[frame[name] == value]
+                bars = self._to_arrays(frame)
+                if lower is not None or upper is not None:
+                    mask = np.ones(len(bars), dtype=bool)
+                    if lower is not None:
+                        mask &= bars.timestamps >= lower
+                    if upper is not None:
+                        mask &= bars.timestamps < upper
+                    bars = BarArrays(**{name: values[mask] for name, values in vars(bars).items()})
+                if len(bars):
+                    yield bars
+        finally:
+            reader.close()
+
+    @staticmethod
+    def _to_arrays(frame: pd.DataFrame) -> BarArrays:
+        """CSV のチャンクを列の配列に変換します。"""
+        raw = frame["timestamp"]
+        if pd.api.types.is_numeric_dtype(raw):
+            timestamps = raw.to_numpy(dtype=np.int64).astype("datetime64[ms]")
+        else:
+            timestamps = pd.to_datetime(raw, utc=True).dt.tz_localize(None).to_numpy().astype("datetime64[ms]")
+        columns = {name: frame[name].to_numpy(dtype=np.float64) for name in _PRICE_COLUMNS}
+        return BarArrays(timestamps=timestamps, **columns)
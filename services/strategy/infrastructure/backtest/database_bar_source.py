@@ -0,0 +1,105 @@
+"""Database bar source.
+
+Infrastructure layer: ohlcv テーブルからのバーの読み込み
+責務: 1シンボル・1時間足のバーをサーバーサイドカーソルで古い順に読み込み、
+      大きなチャンクごとに列の NumPy 配列に変換する
+"""
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+
+from application.interfaces.bar_source import BarSource
+from domain.backtest import BarArrays
+from shared.infrastructure.database.connection import Database
+from shared.infrastructure.database.schema import ohlcv
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseBarSource(BarSource):
+    """Stream bars from the ohlcv table in large chunks.
+
+    時刻（UNIX 秒）と価格・出来高は SQL で倍精度浮動小数点数に変換して取得するため、
+    Decimal・datetime のオブジェクトを経由せずに NumPy 配列に変換できます。
+    メモリ使用量はチャンクの大きさで決まり、期間の長さには依存しません。
+    """
+
+    def __init__(self, database: Database, chunk_size: int = 500_000) -> None:
+        """Initialize Database Bar Source.
+
+        Args:
+            database: データベース接続オブジェクト（shared の Database クラス）
+            chunk_size: 1チャンクのバーの本数
+        """
+        self.database = database
+        self.chunk_size = chunk_size
+
+    async def iter_chunks(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> AsyncIterator[BarArrays]:
+        """[start, end) のバーを古い順にチャンク単位で返します（uq_ohlcv のインデックスを使用）。
+
+        Args:
+            exchange: 取引所
+            symbol: シンボル
+            timeframe: 時間足
+            start: 開始時刻（省略時は最初のバーから）
+            end: 終了時刻（省略時は最後のバーまで）
+
+        Yields:
+            BarArrays（最大 chunk_size 本）
+
+        Raises:
+            RuntimeError: データベース接続が初期化されていない場合
+            sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
+        """
+        stmt = select(
+            cast(func.extract("epoch", ohlcv.c.timestamp), Float),
+            cast(ohlcv.c.open, Float),
+            cast(ohlcv.c.high, Float),
+            cast(ohlcv.c.low, Float),
+            cast(ohlcv.c.close, Float),
+            cast(ohlcv.c.volume, Float),
+        ).where(
+            ohlcv.c.exchange == exchange,
+            ohlcv.c.symbol == symbol,
+            ohlcv.c.timeframe == timeframe,
+        )
+        if start is not None:
+            stmt = stmt.where(ohlcv.c.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(ohlcv.c.timestamp < end)
+        stmt = stmt.order_by(ohlcv.c.timestamp).execution_options(yield_per=self.chunk_size)
+
+        total = 0
+        async with self.database.get_session() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions(self.chunk_size):
+                total += len(rows)
+                yield self._to_arrays(rows)
+
+        logger.debug(
+            "Streamed OHLCV: exchange=%s, symbol=%s, timeframe=%s, rows=%d", exchange, symbol, timeframe, total
+        )
+
+    @staticmethod
+    def _to_arrays(rows: Sequence[Any]) -> BarArrays:
+        """SELECT の結果の行（UNIX 秒, open, high, low, close, volume）を列の配列に変換します。"""
+        data = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        timestamps = np.rint(data[:, 0] * 1000.0).astype(np.int64).astype("datetime64[ms]")
+        return BarArrays(
+            timestamps=timestamps,
+            open=data[:, 1].copy(),
+            high=data[:, 2].copy(),
+            low=data[:, 3].copy(),
+            close=data[:, 4].copy(),
+            volume=data[:, 5].copy(),
+        )
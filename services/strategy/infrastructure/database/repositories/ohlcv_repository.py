@@ -1,8 +1,12 @@
 """OHLCV repository implementation using SQLAlchemy."""
 import logging
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence, Tuple
 
+from sqlalchemy import String, column, select, true, values
 from sqlalchemy.dialects.postgresql import insert
 
+from infrastructure.database.write_behind import WriteBehindBuffer
 from shared.application.interfaces.i_ohlcv_repository import IOhlcvRepository
 from shared.domain.models import OHLCV
 from shared.infrastructure.database.connection import Database
@@ -10,6 +14,9 @@ from shared.infrastructure.database.schema import ohlcv
 
 logger = logging.getLogger(__name__)
 
+# 1回の INSERT 文に含める最大行数（asyncpg のバインドパラメータ上限 32767 / 9 列を下回るように設定）
+_INSERT_CHUNK_SIZE = 1000
+
 
 class OhlcvRepository(IOhlcvRepository):
     """OHLCV リポジトリの実装。
@@ -35,43 +42,217 @@ class OhlcvRepository(IOhlcvRepository):
             RuntimeError: データベース接続が初期化されていない場合
             sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
         """
+        await self.save_many([ohlcv_entity])
+
+    async def save_many(self, ohlcv_entities: Sequence[OHLCV]) -> None:
+        """複数の OHLCV を1回のトランザクションでデータベースに保存します。
+
+        複数行の INSERT ... ON CONFLICT DO NOTHING（uq_ohlcv）を使用するため、
+        既に保存済みのバーやバッチ内の重複は無視されます。
+
+        Args:
+            ohlcv_entities: 保存する OHLCV エンティティのリスト
+
+        Raises:
+            RuntimeError: データベース接続が初期化されていない場合
+            sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
+        """
+        if not ohlcv_entities:
+            return
         try:
             async with self.database.get_session() as session:
-                stmt = (
-                    insert(ohlcv)
-                    .values(
-                        exchange=ohlcv_entity.exchange,
-                        symbol=ohlcv_entity.symbol,
-                        timeframe=ohlcv_entity.timeframe,
-                        timestamp=ohlcv_entity.timestamp,
-                        open=float(ohlcv_entity.open),
-                        high=float(ohlcv_entity.high),
-                        low=float(ohlcv_entity.low),
-                        close=float(ohlcv_entity.close),
-                        volume=float(ohlcv_entity.volume),
-                    )
-                    .on_conflict_do_nothing(
-                        index_elements=["exchange", "symbol", "timeframe", "timestamp"]
+                for offset in range(0, len(ohlcv_entities), _INSERT_CHUNK_SIZE):
+                    chunk = ohlcv_entities[offset : offset + _INSERT_CHUNK_SIZE]
+                    stmt = (
+                        insert(ohlcv)
+                        .values([self._to_row(ohlcv_entity) for ohlcv_entity in chunk])
+                        .on_conflict_do_nothing(
+                            index_elements=["exchange", "symbol", "timeframe", "timestamp"]
+                        )
                     )
-                )
-                await session.execute(stmt)
+                    await session.execute(stmt)
                 await session.commit()
 
-            logger.debug(
-                "Saved OHLCV: exchange=%s, symbol=%s, timeframe=%s, timestamp=%s",
-                ohlcv_entity.exchange,
-                ohlcv_entity.symbol,
-                ohlcv_entity.timeframe,
-                ohlcv_entity.timestamp,
-            )
+            logger.debug("Saved OHLCV: count=%d", len(ohlcv_entities))
         except Exception as e:
+            first = ohlcv_entities[0]
             logger.error(
-                "Failed to save OHLCV: exchange=%s, symbol=%s, timeframe=%s, error=%s",
-                ohlcv_entity.exchange,
-                ohlcv_entity.symbol,
-                ohlcv_entity.timeframe,
+                "Failed to save OHLCV: count=%d, exchange=%s, symbol=%s, timeframe=%s, error=%s",
+                len(ohlcv_entities),
+                first.exchange,
+                first.symbol,
+                first.timeframe,
                 e,
                 exc_info=True,
             )
             raise
 
+    async def fetch_recent(
+        self, markets: Sequence[Tuple[str, str]], timeframes: Sequence[str], limit: int
+    ) -> List[OHLCV]:
+        """取引所・シンボル・時間足ごとに直近 limit 本の OHLCV を1回のクエリで取得します。
+
+        (取引所, シンボル, 時間足) の組を VALUES で渡し、LATERAL サブクエリで組ごとに
+        ORDER BY timestamp DESC LIMIT を実行します（uq_ohlcv のインデックスを後方から読む）。
+        シンボル数に関係なく、データベースとの往復は1回です。
+
+        Args:
+            markets: (取引所, シンボル) のリスト（例: [("gmo", "BTC_JPY"), ("gmo", "ETH_JPY")]）
+            timeframes: 時間足のリスト（例: ["1s", "1m"]）
+            limit: 取引所・シンボル・時間足ごとに取得する最大本数
+
+        Returns:
+            OHLCV エンティティのリスト（取引所・シンボル・時間足ごとに古い順）
+
+        Raises:
+            RuntimeError: データベース接続が初期化されていない場合
+            sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
+        """
+        if not markets or not timeframes or limit <= 0:
+            return []
+
+        keys = values(
+            column("exchange", String), column("symbol", String), column("timeframe", String), name="keys"
+        ).data([(exchange, symbol, timeframe) for exchange, symbol in markets for timeframe in timeframes])
+        latest = (
+            select(ohlcv)
+            .where(
+                ohlcv.c.exchange == keys.c.exchange,
+                ohlcv.c.symbol == keys.c.symbol,
+                ohlcv.c.timeframe == keys.c.timeframe,
+            )
+            .order_by(ohlcv.c.timestamp.desc())
+            .limit(limit)
+            .lateral("latest")
+        )
+        stmt = (
+            select(latest)
+            .select_from(keys.join(latest, true()))
+            .order_by(latest.c.exchange, latest.c.symbol, latest.c.timeframe, latest.c.timestamp)
+        )
+
+        async with self.database.get_session() as session:
+            result = await session.execute(stmt)
+            rows = result.mappings().all()
+
+        logger.debug(
+            "Fetched recent OHLCV: markets=%d, timeframes=%s, limit=%d, rows=%d",
+            len(markets),
+            list(timeframes),
+            limit,
+            len(rows),
+        )
+        return [self._to_entity(row) for row in rows]
+
+    @staticmethod
+    def _to_entity(row: Any) -> OHLCV:
+        """SELECT の結果の行を OHLCV エンティティに変換します。"""
+        return OHLCV(
+            exchange=row["exchange"],
+            symbol=row["symbol"],
+            timeframe=row["timeframe"],
+            timestamp=row["timestamp"],
+            open=Decimal(row["open"]),
+            high=Decimal(row["high"]),
+            low=Decimal(row["low"]),
+            close=Decimal(row["close"]),
+            volume=Decimal(row["volume"]),
+        )
+
+    @staticmethod
+    def _to_row(ohlcv_entity: OHLCV) -> Dict[str, Any]:
+        """OHLCV エンティティを INSERT 用の行に変換します。"""
+        return {
+            "exchange": ohlcv_entity.exchange,
+            "symbol": ohlcv_entity.symbol,
+            "timeframe": ohlcv_entity.timeframe,
+            "timestamp": ohlcv_entity.timestamp,
+            "open": float(ohlcv_entity.open),
+            "high": float(ohlcv_entity.high),
+            "low": float(ohlcv_entity.low),
+            "close": float(ohlcv_entity.close),
+            "volume": float(ohlcv_entity.volume),
+        }
+
+
+class WriteBehindOhlcvRepository(IOhlcvRepository):
+    """Buffer OHLCV bars in memory and persist them in batches.
+
+    save はメモリ上のバッファに追加するだけで、バッファは件数または時間のしきい値で
+    save_many（複数行 INSERT）にまとめて書き込まれます。バーごとのコミット待ちがなくなります。
+    使用前に start を、終了時に close を呼び出してください（close で残りのバーを書き込みます）。
+    """
+
+    def __init__(
+        self,
+        repository: IOhlcvRepository,
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        """Initialize Write-Behind OHLCV Repository.
+
+        Args:
+            repository: 実際に書き込むリポジトリ（save_many を使用）
+            max_batch: 1回に書き込む最大件数
+            flush_interval: 書き込み間隔（秒）
+            max_pending: 未書き込みの最大件数（上限に達すると save が待機）
+        """
+        self.repository = repository
+        self._buffer: WriteBehindBuffer[OHLCV] = WriteBehindBuffer(
+            repository.save_many,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            max_pending=max_pending,
+            name="ohlcv",
+        )
+
+    @property
+    def pending(self) -> int:
+        """未書き込みの OHLCV の件数。"""
+        return self._buffer.pending
+
+    def start(self) -> None:
+        """バックグラウンドの書き込みを開始します。"""
+        self._buffer.start()
+
+    async def save(self, ohlcv_entity: OHLCV) -> None:
+        """OHLCV を書き込みバッファに追加します。
+
+        Args:
+            ohlcv_entity: 保存する OHLCV エンティティ
+        """
+        await self._buffer.put(ohlcv_entity)
+
+    async def save_many(self, ohlcv_entities: Sequence[OHLCV]) -> None:
+        """複数の OHLCV を書き込みバッファに追加します。
+
+        Args:
+            ohlcv_entities: 保存する OHLCV エンティティのリスト
+        """
+        for ohlcv_entity in ohlcv_entities:
+            await self._buffer.put(ohlcv_entity)
+
+    async def fetch_recent(
+        self, markets: Sequence[Tuple[str, str]], timeframes: Sequence[str], limit: int
+    ) -> List[OHLCV]:
+        """取引所・シンボル・時間足ごとに直近 limit 本の OHLCV を取得します（バッファ内の OHLCV を書き込んでから読み込む）。
+
+        Args:
+            markets: (取引所, シンボル) のリスト
+            timeframes: 時間足のリスト
+            limit: 取引所・シンボル・時間足ごとに取得する最大本数
+
+        Returns:
+            OHLCV エンティティのリスト（取引所・シンボル・時間足ごとに古い順）
+        """
+        await self._buffer.flush()
+        return await self.repository.fetch_recent(markets, timeframes, limit)
+
+    async def flush(self) -> None:
+        """バッファ内の OHLCV をすべて書き込みます。"""
+        await self._buffer.flush()
+
+    async def close(self) -> None:
+        """バックグラウンドの書き込みを停止し、残りの OHLCV を書き込みます。"""
+        await self._buffer.close()
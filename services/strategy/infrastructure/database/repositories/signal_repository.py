@@ -1,8 +1,10 @@
 """Signal repository implementation using SQLAlchemy."""
 import logging
+from typing import Any, Dict, Sequence
 
 from sqlalchemy import insert
 
+from infrastructure.database.write_behind import WriteBehindBuffer
 from shared.application.interfaces.i_signal_repository import ISignalRepository
 from shared.domain.models import Signal
 from shared.infrastructure.database.connection import Database
@@ -10,6 +12,9 @@ from shared.infrastructure.database.schema import signals
 
 logger = logging.getLogger(__name__)
 
+# 1回の INSERT 文に含める最大行数（asyncpg のバインドパラメータ上限を下回るように設定）
+_INSERT_CHUNK_SIZE = 1000
+
 
 class SignalRepository(ISignalRepository):
     """Signal リポジトリの実装。
@@ -35,38 +40,130 @@ class SignalRepository(ISignalRepository):
             RuntimeError: データベース接続が初期化されていない場合
             sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
         """
+        await self.save_many([signal_entity])
+
+    async def save_many(self, signal_entities: Sequence[Signal]) -> None:
+        """複数のシグナルを1回のトランザクションでデータベースに保存します.
+
+        Args:
+            signal_entities: 保存する Signal エンティティのリスト
+
+        Raises:
+            RuntimeError: データベース接続が初期化されていない場合
+            sqlalchemy.exc.SQLAlchemyError: データベース操作に失敗した場合
+        """
+        if not signal_entities:
+            return
         try:
             async with self.database.get_session() as session:
-                stmt = insert(signals).values(
-                    exchange=signal_entity.exchange,
-                    symbol=signal_entity.symbol,
-                    strategy=signal_entity.strategy,
-                    action=signal_entity.action,
-                    confidence=float(signal_entity.confidence),
-                    price_ref=float(signal_entity.price_ref),
-                    indicators=signal_entity.indicators,  # dict をそのまま渡す（JSONB に自動変換）
-                    meta=signal_entity.meta,  # dict をそのまま渡す（JSONB に自動変換）
-                    timestamp=signal_entity.timestamp,
-                )
-                await session.execute(stmt)
+                for offset in range(0, len(signal_entities), _INSERT_CHUNK_SIZE):
+                    chunk = signal_entities[offset : offset + _INSERT_CHUNK_SIZE]
+                    stmt = insert(signals).values([self._to_row(signal_entity) for signal_entity in chunk])
+                    await session.execute(stmt)
                 await session.commit()
 
-            logger.debug(
-                "Saved Signal: exchange=%s, symbol=%s, strategy=%s, action=%s, timestamp=%s",
-                signal_entity.exchange,
-                signal_entity.symbol,
-                signal_entity.strategy,
-                signal_entity.action,
-                signal_entity.timestamp,
-            )
+            logger.debug("Saved Signal: count=%d", len(signal_entities))
         except Exception as e:
+            first = signal_entities[0]
             logger.error(
-                "Failed to save Signal: exchange=%s, symbol=%s, strategy=%s, error=%s",
-                signal_entity.exchange,
-                signal_entity.symbol,
-                signal_entity.strategy,
+                "Failed to save Signal: count=%d, exchange=%s, symbol=%s, strategy=%s, error=%s",
+                len(signal_entities),
+                first.exchange,
+                first.symbol,
+                first.strategy,
                 e,
                 exc_info=True,
             )
             raise
 
+    @staticmethod
+    def _to_row(signal_entity: Signal) -> Dict[str, Any]:
+        """Signal エンティティを INSERT 用の行に変換します。"""
+        return {
+            "exchange": signal_entity.exchange,
+            "symbol": signal_entity.symbol,
+            "strategy": signal_entity.strategy,
+            "action": signal_entity.action,
+            "confidence": float(signal_entity.confidence),
+            "price_ref": float(signal_entity.price_ref),
+            "indicators": signal_entity.indicators,  # dict をそのまま渡す（JSONB に自動変換）
+            "meta": signal_entity.meta,  # dict をそのまま渡す（JSONB に自動変換）
+            "timestamp": signal_entity.timestamp,
+        }
+
+
+class SignalOutbox(ISignalRepository):
+    """Asynchronous outbox that persists signals in batches off the hot path.
+
+    save はメモリ上のバッファに追加するだけで、シグナルはバックグラウンドタスクが
+    件数・時間のしきい値で save_many（複数行 INSERT）にまとめて書き込みます。
+    シグナルの配信と ACK が Postgres のコミットを待たなくなります。
+    データベースが遅くバッファが上限に達した場合の動作は overflow で指定します。
+    使用前に start を、終了時に close を呼び出してください（close で残りのシグナルを書き込みます）。
+    """
+
+    def __init__(
+        self,
+        repository: ISignalRepository,
+        max_batch: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+        overflow: str = "drop_oldest",
+    ) -> None:
+        """Initialize Signal Outbox.
+
+        Args:
+            repository: 実際に書き込むリポジトリ（save_many を使用）
+            max_batch: 1回に書き込む最大件数
+            flush_interval: 書き込み間隔（秒）
+            max_pending: 未書き込みの最大件数
+            overflow: 上限に達したときの動作（"drop_oldest": 古いシグナルを破棄、"block": save が待機）
+        """
+        self.repository = repository
+        self._buffer: WriteBehindBuffer[Signal] = WriteBehindBuffer(
+            repository.save_many,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            max_pending=max_pending,
+            overflow=overflow,
+            name="signal",
+        )
+
+    @property
+    def pending(self) -> int:
+        """未書き込みのシグナルの件数。"""
+        return self._buffer.pending
+
+    @property
+    def dropped(self) -> int:
+        """バッファが上限に達して破棄したシグナルの件数。"""
+        return self._buffer.dropped
+
+    def start(self) -> None:
+        """バックグラウンドの書き込みを開始します。"""
+        self._buffer.start()
+
+    async def save(self, signal_entity: Signal) -> None:
+        """シグナルを outbox に追加します.
+
+        Args:
+            signal_entity: 保存する Signal エンティティ
+        """
+        await self._buffer.put(signal_entity)
+
+    async def save_many(self, signal_entities: Sequence[Signal]) -> None:
+        """複数のシグナルを outbox に追加します.
+
+        Args:
+            signal_entities: 保存する Signal エンティティのリスト
+        """
+        for signal_entity in signal_entities:
+            await self._buffer.put(signal_entity)
+
+    async def flush(self) -> None:
+        """outbox 内のシグナルをすべて書き込みます。"""
+        await self._buffer.flush()
+
+    async def close(self) -> None:
+        """バックグラウンドの書き込みを停止し、残りのシグナルを書き込みます。"""
+        await self._buffer.close()
@@ -0,0 +1,185 @@
+"""Write-behind buffer.
+
+Infrastructure layer: 書き込みの遅延バッチ化
+責務: 保存対象をメモリ上に溜め、件数または経過時間のしきい値でまとめて書き込む
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 未書き込みが上限に達したときの動作
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+
+class WriteBehindBuffer(Generic[T]):
+    """Collect items in memory and flush them in batches from a background task.
+
+    バッチは max_batch 件に達したとき、または flush_interval 秒が経過したときに書き込みます。
+    未書き込みの件数は max_pending で制限されます。上限に達した場合、overflow="block" では
+    put が空くまで待機し（呼び出し元へバックプレッシャーをかける）、overflow="drop_oldest" では
+    最も古い未書き込みの項目を破棄して put は待機しません（呼び出し元のレイテンシを優先する）。
+    書き込みに失敗したバッチは max_retries 回まで次回の書き込みで再試行し、それでも失敗した場合は破棄します。
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[None]],
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+        max_retries: int = 3,
+        overflow: str = "block",
+        name: str = "write-behind",
+    ) -> None:
+        """Initialize Write-Behind Buffer.
+
+        Args:
+            flush: バッチを書き込む関数
+            max_batch: 1回に書き込む最大件数（この件数に達すると即座に書き込む）
+            flush_interval: 書き込み間隔（秒）
+            max_pending: 未書き込みの最大件数
+            max_retries: 書き込みに失敗したバッチを再試行する回数
+            overflow: 未書き込みが上限に達したときの動作（"block" または "drop_oldest"）
+            name: ログ出力用の名前
+
+        Raises:
+            ValueError: 件数・間隔・overflow の指定が不正な場合
+        """
+        if max_batch < 1 or max_pending < max_batch:
+            raise ValueError(
+                f"max_batch must be positive and not exceed max_pending: {max_batch}, {max_pending}"
+            )
+        if flush_interval <= 0:
+            raise ValueError(f"flush_interval must be positive: {flush_interval}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}: {overflow}")
+        self._flush = flush
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.overflow = overflow
+        self.name = name
+        # drop_oldest により破棄した件数
+        self.dropped = 0
+        self._items: List[T] = []
+        # 書き込み中のバッチの件数（drop_oldest で書き込み中の項目を破棄しないために使用）
+        self._in_flight = 0
+        self._failures = 0
+        self._batch_ready = asyncio.Event()
+        self._space_available = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """未書き込みの件数。"""
+        return len(self._items)
+
+    def start(self) -> None:
+        """バックグラウンドの書き込みタスクを開始します。"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, item: T) -> None:
+        """保存対象を追加します（未書き込みが上限に達している場合は空くまで待機）。
+
+        Args:
+            item: 保存対象
+
+        Raises:
+            RuntimeError: close 後に呼び出された場合
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name} buffer is closed")
+        if len(self._items) >= self.max_pending and self.overflow == "drop_oldest":
+            self._drop_oldest()
+        if len(self._items) >= self.max_pending:
+            async with self._space_available:
+                await self._space_available.wait_for(lambda: len(self._items) < self.max_pending)
+        self._items.append(item)
+        if len(self._items) >= self.max_batch:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """未書き込みの保存対象をすべて書き込みます。"""
+        async with self._flush_lock:
+            while self._items:
+                batch = self._items[: self.max_batch]
+                self._in_flight = len(batch)
+                try:
+                    await self._flush(batch)
+                except Exception as e:
+                    self._in_flight = 0
+                    self._failures += 1
+                    if self._failures <= self.max_retries:
+                        # データベースの一時的な障害を想定し、バッチを残して次回再試行する
+                        logger.warning(
+                            "Failed to flush %s batch (attempt %d/%d): size=%d, error=%s",
+                            self.name,
+                            self._failures,
+                            self.max_retries + 1,
+                            len(batch),
+                            e,
+                        )
+                        return
+                    logger.error(
+                        "Dropping %s batch after %d attempts: size=%d, error=%s",
+                        self.name,
+                        self._failures,
+                        len(batch),
+                        e,
+                        exc_info=True,
+                    )
+                self._failures = 0
+                self._in_flight = 0
+                del self._items[: len(batch)]
+                async with self._space_available:
+                    self._space_available.notify_all()
+
+    async def close(self) -> None:
+        """バックグラウンドタスクを停止し、残りの保存対象を書き込みます。"""
+        self._closed = True
+        if self._task is not None:
+            # 書き込み中のバッチを中断しないよう、キャンセルせずにループの終了を待つ
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        # シャットダウン時は再試行を待たずに書き込む
+        for _ in range(self.max_retries + 1):
+            await self.flush()
+            if not self._items:
+                break
+        if self._items:
+            logger.error("Discarding unflushed %s items on shutdown: count=%d", self.name, len(self._items))
+            self._items.clear()
+
+    def _drop_oldest(self) -> None:
+        """書き込み中のバッチを除く最も古い項目を破棄します。"""
+        if self._in_flight >= len(self._items):
+            # すべて書き込み中の場合は破棄できないため、put は書き込みの完了を待つ
+            return
+        del self._items[self._in_flight]
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 1000 == 0:
+            logger.warning(
+                "%s buffer is full, dropping oldest items: dropped=%d, max_pending=%d",
+                self.name,
+                self.dropped,
+                self.max_pending,
+            )
+
+    async def _run(self) -> None:
+        """件数または時間のしきい値に達するたびに書き込みます。"""
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
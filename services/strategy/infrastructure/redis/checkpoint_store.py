@@ -0,0 +1,119 @@
+"""Redis checkpoint store.
+
+Infrastructure layer: チェックポイントの保存先（Redis Hash）
+責務: StrategyCheckpoint を1つの Hash にアトミックに書き込み、起動時に読み込む
+"""
+import logging
+import time
+from typing import Dict, Optional
+
+import orjson
+import redis.asyncio as aioredis
+
+from application.services.checkpoint import CHECKPOINT_VERSION, StrategyCheckpoint
+
+logger = logging.getLogger(__name__)
+
+# Hash のフィールド: メタデータ（JSON）と、取引所・シンボルごとのOHLCV履歴（バイナリ、"history:<取引所>:<シンボル>"）
+_META_FIELD = b"meta"
+_HISTORY_PREFIX = b"history:"
+
+
+class RedisCheckpointStore:
+    """Store strategy checkpoints in a Redis hash.
+
+    小さなメタデータ（Stream ID・未確定のバー・戦略の状態・配信できなかったシグナル）は JSON、
+    OHLCV履歴はリングバッファのバイナリ（float64 配列）のまま1つの Hash に保存します。
+    前回のチェックポイントは MULTI/EXEC で置き換えるため、読み込み側が書き込み途中の状態を見ることはありません。
+    """
+
+    def __init__(self, redis_url: str, key: str) -> None:
+        """Initialize Redis Checkpoint Store.
+
+        Args:
+            redis_url: Redis 接続URL（例: redis://localhost:6379/0）
+            key: チェックポイントを保存する Hash のキー（例: "checkpoint:strategy"）
+        """
+        self.redis_url = redis_url
+        self.key = key
+        self.redis: Optional[aioredis.Redis] = None
+
+    async def connect(self) -> None:
+        """Redis 接続を確立します。"""
+        if self.redis is None:
+            # OHLCV履歴はバイナリのため、レスポンスをデコードしない
+            self.redis = await aioredis.from_url(self.redis_url, decode_responses=False)
+
+    async def close(self) -> None:
+        """Redis 接続を閉じます。"""
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+
+    async def save(self, checkpoint: StrategyCheckpoint) -> None:
+        """チェックポイントを保存します（前回のチェックポイントを置き換え）。
+
+        Args:
+            checkpoint: 保存する StrategyCheckpoint
+        """
+        if not self.redis:
+            await self.connect()
+
+        meta = {
+            "version": checkpoint.version,
+            "created_at": checkpoint.created_at or time.time(),
+            "stream_ids": checkpoint.stream_ids,
+            "open_bars": checkpoint.open_bars,
+            "strategy": checkpoint.strategy,
+            "unpublished": checkpoint.unpublished,
+        }
+        mapping: Dict[bytes, bytes] = {_META_FIELD: orjson.dumps(meta)}
+        for exchange, symbols in checkpoint.history.items():
+            for symbol, data in symbols.items():
+                mapping[_HISTORY_PREFIX + f"{exchange}:{symbol}".encode()] = data
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self.key)
+            pipe.hset(self.key, mapping=mapping)
+            await pipe.execute()
+        logger.debug(
+            "Saved checkpoint: key=%s, symbols=%d, bytes=%d",
+            self.key,
+            len(mapping) - 1,
+            sum(len(value) for value in mapping.values()),
+        )
+
+    async def load(self) -> Optional[StrategyCheckpoint]:
+        """最新のチェックポイントを読み込みます。
+
+        Returns:
+            StrategyCheckpoint（チェックポイントがない、または形式のバージョンが異なる場合は None）
+        """
+        if not self.redis:
+            await self.connect()
+
+        fields = await self.redis.hgetall(self.key)
+        if not fields or _META_FIELD not in fields:
+            return None
+
+        meta = orjson.loads(fields[_META_FIELD])
+        if meta.get("version") != CHECKPOINT_VERSION:
+            logger.warning(
+                "Ignoring checkpoint with unsupported version: key=%s, version=%s", self.key, meta.get("version")
+            )
+            return None
+
+        history: Dict[str, Dict[str, bytes]] = {}
+        for field, value in fields.items():
+            if field.startswith(_HISTORY_PREFIX):
+                exchange, _, symbol = field[len(_HISTORY_PREFIX) :].decode().partition(":")
+                history.setdefault(exchange, {})[symbol] = value
+        return StrategyCheckpoint(
+            stream_ids=meta.get("stream_ids", {}),
+            open_bars=meta.get("open_bars", {}),
+            history=history,
+            strategy=meta.get("strategy", {}),
+            unpublished=meta.get("unpublished", []),
+            created_at=meta.get("created_at", 0.0),
+            version=meta["version"],
+        )
@@ -0,0 +1,96 @@
+"""Market-data wire codec.
+
+Infrastructure layer: Redis Stream メッセージのデコード
+責務: Stream のフィールドを必要になったものだけ遅延デコードし、
+      data フィールドを codec フィールドに応じた形式（JSON / msgpack）でデコードする
+"""
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # msgpack はオプション（pip install ".[msgpack]"）
+    msgpack = None
+
+# data フィールドの形式を指定するフィールド名（未指定の場合は JSON）
+CODEC_FIELD = "codec"
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+
+
+class StreamFields(Mapping[str, str]):
+    """Lazily decoded view over the raw (bytes) fields of a stream entry.
+
+    XREADGROUP が返すバイト列のフィールドを保持し、アクセスされたフィールドだけを
+    UTF-8 でデコードします（結果はキャッシュ）。data のような大きなフィールドは
+    raw で文字列化せずに取り出し、codec で直接デコードできます。
+    """
+
+    __slots__ = ("_raw", "_decoded")
+
+    def __init__(self, raw: Dict[bytes, bytes]) -> None:
+        """Initialize Stream Fields.
+
+        Args:
+            raw: XREADGROUP が返したフィールド（キー・値ともにバイト列）
+        """
+        self._raw = raw
+        self._decoded: Dict[str, str] = {}
+
+    def raw(self, key: str) -> Optional[bytes]:
+        """フィールドの値をデコードせずに返します。
+
+        Args:
+            key: フィールド名
+
+        Returns:
+            フィールドの値（バイト列、存在しない場合は None）
+        """
+        return self._raw.get(key.encode())
+
+    def __getitem__(self, key: str) -> str:
+        value = self._decoded.get(key)
+        if value is None:
+            value = self._decoded[key] = self._raw[key.encode()].decode()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.decode() for key in self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"StreamFields({self._raw!r})"
+
+
+def decode_data(fields: Mapping[str, Any]) -> Any:
+    """メッセージの data フィールドを codec フィールドに応じてデコードします。
+
+    Args:
+        fields: メッセージのフィールド（StreamFields または文字列の辞書）
+
+    Returns:
+        デコードされたデータ（data フィールドがない場合は空の辞書）
+
+    Raises:
+        ValueError: 未対応の codec が指定された場合、またはデータが不正な場合
+        RuntimeError: msgpack が指定されたが msgpack がインストールされていない場合
+    """
+    data: Union[bytes, str, Any, None]
+    data = fields.raw("data") if isinstance(fields, StreamFields) else fields.get("data")
+    if data is None:
+        return {}
+    if not isinstance(data, (bytes, str)):
+        # デコード済み（テストや内部で生成したメッセージ）
+        return data
+
+    codec = fields.get(CODEC_FIELD) or CODEC_JSON
+    if codec == CODEC_JSON:
+        return orjson.loads(data)
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack codec requested but msgpack is not installed")
+        return msgpack.unpackb(data.encode() if isinstance(data, str) else data, raw=False)
+    raise ValueError(f"Unsupported codec: {codec}")
@@ -5,10 +5,12 @@ Infrastructure layer: Redis Stream からの購読実装
 """
 import asyncio
 import logging
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import redis.asyncio as aioredis
 
+from infrastructure.redis.codec import StreamFields
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ class RedisStreamConsumer:
 
     Redis Stream から XREADGROUP を使用してメッセージを購読します。
     Consumer Group を使用することで、再起動時も取りこぼしゼロを実現します。
+    フィールドはバイト列のまま受け取り、StreamFields で使用するものだけを遅延デコードします。
     """
 
     def __init__(self, redis_url: str) -> None:
@@ -28,11 +31,14 @@ class RedisStreamConsumer:
         self.redis_url = redis_url
         self.redis: Optional[aioredis.Redis] = None
         self._running = False
+        # Stream 名のデコード結果（Stream の種類は少ないためキャッシュする）
+        self._stream_names: Dict[bytes, str] = {}
 
     async def connect(self) -> None:
         """Redis 接続を確立します。"""
         if self.redis is None:
-            self.redis = await aioredis.from_url(self.redis_url, decode_responses=True)
+            # フィールドは必要なものだけデコードするため、レスポンスはバイト列のまま受け取る
+            self.redis = await aioredis.from_url(self.redis_url, decode_responses=False)
             logger.info("Connected to Redis: %s", self.redis_url)
 
     async def close(self) -> None:
@@ -76,25 +82,28 @@ class RedisStreamConsumer:
                 else:
                     raise
 
-    async def consume(
+    async def consume_batches(
         self,
         group_name: str,
         consumer_name: str,
         streams: Dict[str, str],
         block: int = 1000,
         count: int = 10,
-    ) -> AsyncIterator[Dict[str, Any]]:
-        """Redis Stream からメッセージを購読します。
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Redis Stream からメッセージをバッチ単位で購読します。
+
+        1回の XREADGROUP で取得したメッセージ（全 Stream 分）を1つのリストとして返します。
+        処理後は ack_many でまとめて ACK してください。
 
         Args:
             group_name: Consumer Group 名（例: "strategy"）
             consumer_name: Consumer 名（例: "strategy-1"）
             streams: Stream 名と開始位置の辞書（例: {"md:ticker": ">", "md:orderbook": ">"}）
             block: ブロック時間（ミリ秒、0 で非ブロッキング）
-            count: 一度に取得するメッセージ数
+            count: Stream ごとに一度に取得する最大メッセージ数
 
         Yields:
-            メッセージの辞書（stream名、message_id、フィールドを含む）
+            メッセージの辞書（stream名、message_id、フィールド（StreamFields）を含む）のリスト
         """
         if not self.redis:
             await self.connect()
@@ -122,15 +131,18 @@ class RedisStreamConsumer:
                 )
 
                 if messages:
-                    for stream_name, stream_messages in messages:
-                        for message_id, fields in stream_messages:
-                            # メッセージを辞書形式に変換
-                            message = {
-                                "stream": stream_name,
-                                "id": message_id,
-                                "fields": dict(fields),
-                            }
-                            yield message
+                    # メッセージを辞書形式に変換
+                    batch = [
+                        {
+                            "stream": self._stream_name(stream_name),
+                            "id": message_id.decode(),
+                            "fields": StreamFields(fields),
+                        }
+                        for stream_name, stream_messages in messages
+                        for message_id, fields in stream_messages
+                    ]
+                    if batch:
+                        yield batch
 
             except asyncio.CancelledError:
                 logger.info("Consumer cancelled")
@@ -140,6 +152,225 @@ class RedisStreamConsumer:
                 # エラー時は少し待機してから再試行
                 await asyncio.sleep(1)
 
+    async def consume(
+        self,
+        group_name: str,
+        consumer_name: str,
+        streams: Dict[str, str],
+        block: int = 1000,
+        count: int = 10,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Redis Stream からメッセージを1件ずつ購読します。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            consumer_name: Consumer 名（例: "strategy-1"）
+            streams: Stream 名と開始位置の辞書（例: {"md:ticker": ">", "md:orderbook": ">"}）
+            block: ブロック時間（ミリ秒、0 で非ブロッキング）
+            count: 一度に取得するメッセージ数
+
+        Yields:
+            メッセージの辞書（stream名、message_id、フィールドを含む）
+        """
+        async for batch in self.consume_batches(group_name, consumer_name, streams, block, count):
+            for message in batch:
+                yield message
+
+    async def last_delivered_id(self, group_name: str, stream_name: str) -> Optional[str]:
+        """Consumer Group に最後に配信されたメッセージIDを XINFO GROUPS で取得します。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            stream_name: Stream 名（例: "md:ticker"）
+
+        Returns:
+            メッセージID（Stream または Consumer Group が存在しない場合は None）
+        """
+        if not self.redis:
+            await self.connect()
+
+        try:
+            groups = await self.redis.xinfo_groups(stream_name)
+        except aioredis.ResponseError:
+            # Stream が存在しない
+            return None
+        for group in groups:
+            name = group["name"]
+            if (name.decode() if isinstance(name, bytes) else name) == group_name:
+                last_id = group["last-delivered-id"]
+                return last_id.decode() if isinstance(last_id, bytes) else last_id
+        return None
+
+    async def read_range(
+        self, stream_name: str, after_id: str, end_id: str = "+", count: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """after_id より後から end_id までのメッセージを XRANGE で順に取得します（Consumer Group を使用しない）。
+
+        Args:
+            stream_name: Stream 名（例: "md:ticker"）
+            after_id: 取得を開始する位置（このIDのメッセージは含まない）
+            end_id: 取得を終了する位置（このIDのメッセージを含む、"+" で末尾まで）
+            count: 一度に取得する最大メッセージ数
+
+        Yields:
+            メッセージのリスト（consume_batches と同じ形式）
+        """
+        if not self.redis:
+            await self.connect()
+
+        start = f"({after_id}"
+        while True:
+            entries = await self.redis.xrange(stream_name, min=start, max=end_id, count=count)
+            if not entries:
+                return
+            yield [
+                {"stream": stream_name, "id": message_id.decode(), "fields": StreamFields(fields)}
+                for message_id, fields in entries
+            ]
+            if len(entries) < count:
+                return
+            start = f"({entries[-1][0].decode()}"
+
+    async def pending_ids(
+        self, group_name: str, stream_name: str, after_id: str, end_id: str = "+", count: int = 1000
+    ) -> List[str]:
+        """after_id より後から end_id までの pending メッセージ（配信済みで未 ACK）のIDを XPENDING で取得します。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            stream_name: Stream 名（例: "md:ticker"）
+            after_id: 取得を開始する位置（このIDのメッセージは含まない）
+            end_id: 取得を終了する位置（このIDのメッセージを含む、"+" で末尾まで）
+            count: 一度に取得する最大件数
+
+        Returns:
+            pending メッセージのIDのリスト（古い順）
+        """
+        if not self.redis:
+            await self.connect()
+
+        message_ids: List[str] = []
+        start = f"({after_id}"
+        while True:
+            entries = await self.redis.xpending_range(stream_name, group_name, min=start, max=end_id, count=count)
+            message_ids.extend(entry["message_id"].decode() for entry in entries)
+            if len(entries) < count:
+                return message_ids
+            start = f"({message_ids[-1]}"
+
+    async def autoclaim(
+        self,
+        group_name: str,
+        consumer_name: str,
+        stream_name: str,
+        min_idle_ms: int,
+        start_id: str = "0-0",
+        count: int = 100,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """一定時間 ACK されていない pending メッセージを XAUTOCLAIM で引き取ります。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            consumer_name: 引き取る Consumer 名（例: "strategy-0"）
+            stream_name: Stream 名（例: "md:ticker"）
+            min_idle_ms: 引き取る対象とする最小アイドル時間（ミリ秒）
+            start_id: 走査を開始するメッセージID
+            count: 一度に引き取る最大メッセージ数
+
+        Returns:
+            (次回の走査開始ID（"0-0" の場合は走査完了）, 引き取ったメッセージのリスト)
+        """
+        if not self.redis:
+            await self.connect()
+
+        response = await self.redis.xautoclaim(
+            stream_name, group_name, consumer_name, min_idle_ms, start_id=start_id, count=count
+        )
+        next_id, claimed = response[0], response[1]
+        messages = [
+            {
+                "stream": stream_name,
+                "id": message_id.decode(),
+                "fields": StreamFields(fields),
+            }
+            for message_id, fields in claimed
+            # 引き取る前に Stream から削除されたメッセージはフィールドが空になる
+            if fields
+        ]
+        return next_id.decode(), messages
+
+    async def delivery_counts(
+        self, group_name: str, stream_name: str, message_ids: List[str]
+    ) -> Dict[str, int]:
+        """pending メッセージの配信回数を XPENDING で取得します。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            stream_name: Stream 名（例: "md:ticker"）
+            message_ids: メッセージIDのリスト
+
+        Returns:
+            メッセージIDと配信回数の辞書（pending でないメッセージは含まない）
+        """
+        if not message_ids:
+            return {}
+        if not self.redis:
+            await self.connect()
+
+        # ID ごとに範囲を1件に絞った XPENDING をパイプラインで1往復で送信する
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message_id in message_ids:
+                pipe.xpending_range(stream_name, group_name, min=message_id, max=message_id, count=1)
+            results = await pipe.execute()
+        return {
+            entry["message_id"].decode(): entry["times_delivered"]
+            for entries in results
+            for entry in entries
+        }
+
+    async def dead_letter(
+        self, group_name: str, dead_letter_stream: str, messages: List[Dict[str, Any]], reason: str
+    ) -> None:
+        """メッセージを dead-letter Stream に移動します（XADD と XACK を1つのトランザクションで実行）。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            dead_letter_stream: 移動先の Stream 名（例: "dlq:strategy"）
+            messages: 移動するメッセージのリスト
+            reason: 移動の理由（dead-letter のフィールドに記録）
+        """
+        if not messages:
+            return
+        if not self.redis:
+            await self.connect()
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for message in messages:
+                source = message["fields"]
+                # data がバイナリ（msgpack）の場合もあるため、デコードせずにそのまま書き込む
+                fields: Dict[str, Any] = (
+                    {key: source.raw(key) for key in source}
+                    if isinstance(source, StreamFields)
+                    else dict(source)
+                )
+                fields.update(
+                    {
+                        "dlq_stream": message["stream"],
+                        "dlq_id": message["id"],
+                        "dlq_group": group_name,
+                        "dlq_reason": reason,
+                    }
+                )
+                pipe.xadd(dead_letter_stream, fields, maxlen=100000, approximate=True)
+                pipe.xack(message["stream"], group_name, message["id"])
+            await pipe.execute()
+        logger.warning(
+            "Moved messages to dead-letter stream: stream=%s, count=%d, reason=%s",
+            dead_letter_stream,
+            len(messages),
+            reason,
+        )
+
     async def ack(self, stream_name: str, group_name: str, message_id: str) -> None:
         """メッセージの処理完了を通知します（ACK）。
 
@@ -158,6 +389,45 @@ class RedisStreamConsumer:
             logger.error("Error ACKing message %s from stream %s: %s", message_id, stream_name, e, exc_info=True)
             raise
 
+    async def ack_many(self, group_name: str, message_ids: Dict[str, List[str]]) -> int:
+        """複数メッセージの処理完了をまとめて通知します（パイプライン化した XACK）。
+
+        Stream ごとに1つの XACK コマンドにまとめ、非トランザクションのパイプラインで
+        1往復で送信します。
+
+        Args:
+            group_name: Consumer Group 名（例: "strategy"）
+            message_ids: Stream 名とメッセージIDリストの辞書（例: {"md:ticker": ["1734123456789-0"]}）
+
+        Returns:
+            ACK されたメッセージ数
+        """
+        targets = {stream: ids for stream, ids in message_ids.items() if ids}
+        if not targets:
+            return 0
+
+        if not self.redis:
+            await self.connect()
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for stream_name, ids in targets.items():
+                    pipe.xack(stream_name, group_name, *ids)
+                results = await pipe.execute()
+            acked = sum(results)
+            logger.debug("ACKed messages: streams=%s, count=%s", list(targets.keys()), acked)
+            return acked
+        except Exception as e:
+            logger.error("Error ACKing messages from streams %s: %s", list(targets.keys()), e, exc_info=True)
+            raise
+
+    def _stream_name(self, raw: bytes) -> str:
+        """Stream 名をデコードします（キャッシュ付き）。"""
+        name = self._stream_names.get(raw)
+        if name is None:
+            name = self._stream_names[raw] = raw.decode()
+        return name
+
     def stop(self) -> None:
         """購読を停止します。"""
         self._running = False
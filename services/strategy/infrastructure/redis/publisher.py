@@ -5,12 +5,15 @@ Infrastructure layer: Redis Stream への配信実装
 """
 import json
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import redis.asyncio as aioredis
 
 logger = logging.getLogger(__name__)
 
+# Stream ごとに保持するメッセージ数の上限（概算）
+STREAM_MAXLEN = 10000
+
 
 class RedisStreamPublisher:
     """Redis Stream Publisher.
@@ -63,17 +66,54 @@ class RedisStreamPublisher:
             await self.connect()
 
         try:
-            # ペイロードをフィールドに変換（JSON 文字列化）
-            fields = {}
-            for key, value in payload.items():
-                if isinstance(value, (dict, list)):
-                    fields[key] = json.dumps(value)
-                else:
-                    fields[key] = str(value)
-
             # XADD でメッセージを追加（* は自動ID生成）
-            message_id = await self.redis.xadd(stream, fields, maxlen=10000, approximate=True)
+            message_id = await self.redis.xadd(
+                stream, self._to_fields(payload), maxlen=STREAM_MAXLEN, approximate=True
+            )
             logger.debug("Published to stream: %s, message_id: %s", stream, message_id)
         except Exception as e:
             logger.error("Error publishing to Redis Stream %s: %s", stream, e, exc_info=True)
             raise
+
+    async def publish_many(self, messages: Sequence[Tuple[str, dict]]) -> List[str]:
+        """複数のメッセージを1回の往復で配信します。
+
+        トランザクションなしのパイプラインで XADD をまとめて送信するため、
+        複数の Stream（例: 多数のシンボルのシグナル）への配信でも往復は1回です。
+        メッセージは渡された順に追加されます。
+
+        Args:
+            messages: (Stream 名, 配信するデータ) のリスト
+
+        Returns:
+            追加されたメッセージIDのリスト（messages と同じ順序）
+        """
+        if not messages:
+            return []
+        if not self.redis:
+            await self.connect()
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for stream, payload in messages:
+                    pipe.xadd(stream, self._to_fields(payload), maxlen=STREAM_MAXLEN, approximate=True)
+                message_ids = await pipe.execute()
+            logger.debug("Published %d messages in one pipeline", len(message_ids))
+            return message_ids
+        except Exception as e:
+            logger.error("Error publishing %d messages to Redis Streams: %s", len(messages), e, exc_info=True)
+            raise
+
+    @staticmethod
+    def _to_fields(payload: Dict[str, Any]) -> Dict[str, str]:
+        """ペイロードを Stream のフィールドに変換します（dict・list は JSON 文字列化）。"""
+        fields = {}
+        for key, value in payload.items():
+            value_type = type(value)
+            if value_type is str:
+                fields[key] = value
+            elif value_type is dict or value_type is list:
+                fields[key] = json.dumps(value)
+            else:
+                fields[key] = str(value)
+        return fields
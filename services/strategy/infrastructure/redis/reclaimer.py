@@ -0,0 +1,120 @@
+"""Pending entry reclaimer.
+
+Infrastructure layer: 未 ACK メッセージの回収
+責務: 一定時間 ACK されていない pending メッセージを XAUTOCLAIM で引き取り、再処理に回す。
+      配信回数が上限を超えたメッセージは dead-letter Stream に移動する
+"""
+import logging
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+
+from infrastructure.redis.consumer import RedisStreamConsumer
+
+logger = logging.getLogger(__name__)
+
+
+class PendingReclaimer:
+    """Reclaim idle pending entries with XAUTOCLAIM in batches.
+
+    ワーカーのクラッシュや処理の失敗で ACK されなかったメッセージは pending に残ります。
+    起動時と定期的に pending を走査して引き取り、通常のパイプラインで再処理します。
+    再処理しても失敗し続けるメッセージは、配信回数が max_deliveries を超えた時点で
+    dead-letter Stream に移動して ACK します（手動での ACK やデータの破棄は不要）。
+    """
+
+    def __init__(
+        self,
+        consumer: RedisStreamConsumer,
+        group_name: str,
+        consumer_name: str,
+        streams: Sequence[str],
+        min_idle_ms: int = 60_000,
+        max_deliveries: int = 5,
+        batch_size: int = 100,
+        dead_letter_stream: str = "dlq:strategy",
+    ) -> None:
+        """Initialize Pending Reclaimer.
+
+        Args:
+            consumer: Redis Stream Consumer
+            group_name: Consumer Group 名（例: "strategy"）
+            consumer_name: 引き取る Consumer 名（例: "strategy-0"）
+            streams: 走査する Stream 名のリスト
+            min_idle_ms: 引き取る対象とする最小アイドル時間（ミリ秒、処理中のメッセージを引き取らない長さ）
+            max_deliveries: dead-letter に移動するまでの最大配信回数
+            batch_size: 一度に引き取る最大メッセージ数
+            dead_letter_stream: dead-letter Stream 名
+        """
+        self.consumer = consumer
+        self.group_name = group_name
+        self.consumer_name = consumer_name
+        self.streams = list(streams)
+        self.min_idle_ms = min_idle_ms
+        self.max_deliveries = max_deliveries
+        self.batch_size = batch_size
+        self.dead_letter_stream = dead_letter_stream
+
+    async def reclaim(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """アイドル状態の pending メッセージを引き取り、再処理するバッチを順に返します。
+
+        各 Stream の pending を先頭から1回だけ走査するため、pending の件数に比例した時間で終了します。
+
+        Yields:
+            再処理するメッセージのリスト（consume_batches と同じ形式）
+        """
+        for stream_name in self.streams:
+            start_id = "0-0"
+            reclaimed = 0
+            dead_lettered = 0
+            while True:
+                try:
+                    start_id, messages = await self.consumer.autoclaim(
+                        self.group_name,
+                        self.consumer_name,
+                        stream_name,
+                        self.min_idle_ms,
+                        start_id=start_id,
+                        count=self.batch_size,
+                    )
+                    if messages:
+                        retry, exhausted = await self._split_exhausted(stream_name, messages)
+                        if exhausted:
+                            await self.consumer.dead_letter(
+                                self.group_name,
+                                self.dead_letter_stream,
+                                exhausted,
+                                reason=f"delivered more than {self.max_deliveries} times",
+                            )
+                            dead_lettered += len(exhausted)
+                        if retry:
+                            reclaimed += len(retry)
+                            yield retry
+                except Exception as e:
+                    # 回収に失敗しても次回の走査で再試行されるため、この Stream の走査を打ち切る
+                    logger.error("Failed to reclaim pending messages from %s: %s", stream_name, e, exc_info=True)
+                    break
+                if start_id == "0-0":
+                    break
+
+            if reclaimed or dead_lettered:
+                logger.info(
+                    "Reclaimed pending messages: stream=%s, reprocessed=%d, dead_lettered=%d",
+                    stream_name,
+                    reclaimed,
+                    dead_lettered,
+                )
+
+    async def _split_exhausted(
+        self, stream_name: str, messages: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """配信回数が上限以内のメッセージと上限を超えたメッセージに分けます。"""
+        counts = await self.consumer.delivery_counts(
+            self.group_name, stream_name, [message["id"] for message in messages]
+        )
+        retry: List[Dict[str, Any]] = []
+        exhausted: List[Dict[str, Any]] = []
+        for message in messages:
+            if counts.get(message["id"], 0) > self.max_deliveries:
+                exhausted.append(message)
+            else:
+                retry.append(message)
+        return retry, exhausted
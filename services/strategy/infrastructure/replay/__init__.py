@@ -0,0 +1,5 @@
+"""Recorded market data for replays (JSON Lines message logs, signal output)."""
+
+from .message_log import JsonlSignalWriter, read_messages
+
+__all__ = ["JsonlSignalWriter", "read_messages"]
@@ -0,0 +1,95 @@
+"""JSON Lines message log.
+
+Infrastructure layer: リプレイ用のメッセージ記録の読み書き
+責務: 記録した md:* のメッセージ（1行1メッセージの JSON Lines、.gz も可）を読み込み、
+      リプレイで生成したシグナルを配信と同じ形式で JSON Lines に書き出す
+"""
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    """拡張子が .gz の場合は gzip として開きます。"""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_messages(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """記録したメッセージを1件ずつ読み込みます。
+
+    各行は Redis Stream から取得したメッセージと同じ形式の JSON です
+    （例: {"stream": "md:ticker", "id": "1732312345000-0", "fields": {"exchange": "gmo", "symbol": "BTC_JPY",
+    "ts": "1732312345000", "data": "{\\"last\\": 15000000}"}}）。ts の順に記録されていること。
+
+    Args:
+        path: JSON Lines ファイルのパス（.gz の場合は gzip）
+
+    Yields:
+        メッセージの辞書
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: JSON として不正な行がある場合
+    """
+    path = Path(path)
+    with _open(path, "r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid message at {path}:{line_number}: {e}") from e
+
+
+class JsonlSignalWriter:
+    """Write published signals to a JSON Lines file instead of Redis.
+
+    RedisStreamPublisher と同じ publish / publish_many を持ち、SignalPublisherService の配信先として使用できます。
+    各行は {"stream": ..., "payload": ...} です。
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Initialize JSON Lines Signal Writer.
+
+        Args:
+            path: 書き出すファイルのパス（.gz の場合は gzip、既存のファイルは上書き）
+        """
+        self.path = Path(path)
+        self._file: Optional[IO[str]] = None
+        self.written = 0
+
+    async def publish(self, stream: str, payload: dict) -> None:
+        """1件のシグナルを書き出します。
+
+        Args:
+            stream: Stream 名
+            payload: 配信内容
+        """
+        await self.publish_many([(stream, payload)])
+
+    async def publish_many(self, messages: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """複数のシグナルを書き出します。
+
+        Args:
+            messages: (Stream 名, 配信内容) のリスト
+        """
+        if self._file is None:
+            self._file = _open(self.path, "w")
+        for stream, payload in messages:
+            self._file.write(json.dumps({"stream": stream, "payload": payload}, ensure_ascii=False, sort_keys=True))
+            self._file.write("\n")
+        self.written += len(messages)
+
+    def close(self) -> None:
+        """ファイルを閉じます。"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info("Wrote signals: path=%s, count=%d", self.path, self.written)
@@ -5,33 +5,71 @@ Infrastructure layer: 移動平均クロス戦略の実装
 """
 import logging
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+
+from application.interfaces.strategy import BatchStrategy
+from domain.indicators.batch import rolling_mean
 from infrastructure.strategies.base import BaseStrategy
 from shared.domain.models import OHLCV, Signal
 
 logger = logging.getLogger(__name__)
 
 
-class MovingAverageCrossStrategy(BaseStrategy):
+class MovingAverageCrossStrategy(BaseStrategy, BatchStrategy):
     """Moving Average Cross Strategy.
 
     短期移動平均と長期移動平均のクロス（ゴールデンクロス/デッドクロス）で
     シグナルを生成します。
     """
 
-    def __init__(self, fast_window: int = 5, slow_window: int = 20) -> None:
+    def __init__(self, fast_window: int = 5, slow_window: int = 20, timeframe: str = "1s") -> None:
         """Initialize Moving Average Cross Strategy.
 
         Args:
             fast_window: 短期MAの期間（デフォルト: 5）
             slow_window: 長期MAの期間（デフォルト: 20）
+            timeframe: 判断に使用する時間足（デフォルト: "1s"）
         """
         self.fast_window = fast_window
         self.slow_window = slow_window
-        # 前回のMA値を保持（クロス判定用）
-        self._prev_fast_ma: Dict[str, float] = {}
-        self._prev_slow_ma: Dict[str, float] = {}
+        self.timeframe = timeframe
+        # (取引所, シンボル) ごとに前回のMA値を保持（クロス判定用）
+        self._prev_fast_ma: Dict[Tuple[str, str], float] = {}
+        self._prev_slow_ma: Dict[Tuple[str, str], float] = {}
+
+    def required_indicators(self) -> Sequence[str]:
+        """判断に使用する短期MA・長期MAを返します（この2本だけが計算される）。
+
+        Returns:
+            指標の宣言（例: ["ma:5", "ma:20"]）
+        """
+        return (f"ma:{self.fast_window}", f"ma:{self.slow_window}")
+
+    def export_state(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """クロス判定用の前回のMA値を取引所・シンボルごとに返します（チェックポイント用）。
+
+        Returns:
+            取引所 → シンボル → {"prev_fast_ma": ..., "prev_slow_ma": ...} の辞書
+        """
+        state: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (exchange, symbol), fast_ma in self._prev_fast_ma.items():
+            slow_ma = self._prev_slow_ma.get((exchange, symbol))
+            if slow_ma is not None:
+                state.setdefault(exchange, {})[symbol] = {"prev_fast_ma": fast_ma, "prev_slow_ma": slow_ma}
+        return state
+
+    def restore_state(self, state: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+        """export_state で取得した前回のMA値を復元します。
+
+        Args:
+            state: export_state が返した辞書
+        """
+        for exchange, symbols in state.items():
+            for symbol, values in symbols.items():
+                self._prev_fast_ma[(exchange, symbol)] = float(values["prev_fast_ma"])
+                self._prev_slow_ma[(exchange, symbol)] = float(values["prev_slow_ma"])
 
     def calculate_indicators(self, ohlcv: OHLCV) -> Dict[str, float]:
         """OHLCV から移動平均を計算します。
@@ -44,10 +82,10 @@ class MovingAverageCrossStrategy(BaseStrategy):
         """
         # このメソッドは IndicatorCalculatorUseCase で計算されるため、
         # ここでは前回の値を返すだけ（実際の計算は IndicatorCalculatorUseCase で行う）
-        symbol = ohlcv.symbol
+        key = (ohlcv.exchange, ohlcv.symbol)
         return {
-            "ma_fast": self._prev_fast_ma.get(symbol, float(ohlcv.close)),
-            "ma_slow": self._prev_slow_ma.get(symbol, float(ohlcv.close)),
+            "ma_fast": self._prev_fast_ma.get(key, float(ohlcv.close)),
+            "ma_slow": self._prev_slow_ma.get(key, float(ohlcv.close)),
         }
 
     def decide(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
@@ -55,28 +93,29 @@ class MovingAverageCrossStrategy(BaseStrategy):
 
         Args:
             ohlcv: OHLCV エンティティ
-            indicators: 指標の辞書（ma_fast, ma_slow を含む）
+            indicators: 指標の辞書（ma_<fast_window>, ma_<slow_window>、または ma_fast, ma_slow を含む）
 
         Returns:
             Signal エンティティ（シグナルなしの場合は None）
         """
         symbol = ohlcv.symbol
+        key = (ohlcv.exchange, symbol)
 
-        # 指標から移動平均を取得
-        fast_ma = indicators.get("ma_fast") or indicators.get(f"ma_{self.fast_window}")
-        slow_ma = indicators.get("ma_slow") or indicators.get(f"ma_{self.slow_window}")
+        # 指標から移動平均を取得（required_indicators で宣言した期間の MA）
+        fast_ma = indicators.get(f"ma_{self.fast_window}", indicators.get("ma_fast"))
+        slow_ma = indicators.get(f"ma_{self.slow_window}", indicators.get("ma_slow"))
 
         if fast_ma is None or slow_ma is None:
             # 移動平均が計算されていない場合はシグナルなし
             return None
 
         # 前回の値を取得
-        prev_fast = self._prev_fast_ma.get(symbol)
-        prev_slow = self._prev_slow_ma.get(symbol)
+        prev_fast = self._prev_fast_ma.get(key)
+        prev_slow = self._prev_slow_ma.get(key)
 
         # 現在の値を更新
-        self._prev_fast_ma[symbol] = fast_ma
-        self._prev_slow_ma[symbol] = slow_ma
+        self._prev_fast_ma[key] = fast_ma
+        self._prev_slow_ma[key] = slow_ma
 
         if prev_fast is None or prev_slow is None:
             # 前回の値がない場合はシグナルなし（初回）
@@ -108,21 +147,114 @@ class MovingAverageCrossStrategy(BaseStrategy):
             )
 
         if action:
-            return Signal(
-                exchange=ohlcv.exchange,
-                symbol=ohlcv.symbol,
-                strategy="moving_average_cross",
-                action=action,
-                confidence=confidence,
-                price_ref=ohlcv.close,
-                indicators=indicators,
-                meta={
-                    "fast_window": self.fast_window,
-                    "slow_window": self.slow_window,
-                    "fast_ma": fast_ma,
-                    "slow_ma": slow_ma,
-                },
-                timestamp=ohlcv.timestamp,
-            )
+            return self.make_signal(ohlcv, action, confidence, indicators)
 
         return None
+
+    def decide_batch(
+        self, markets: Sequence[Tuple[str, str]], closes: np.ndarray, indicators: Mapping[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """同時に確定した複数シンボルの移動平均クロスを、まとめて判定します.
+
+        decide と同じ条件で、シンボル方向の配列の比較1回で全シンボルのクロスを判定します。
+
+        Args:
+            markets: (取引所, シンボル) のリスト（重複なし）
+            closes: 終値の配列
+            indicators: 指標名 → シンボルごとの値の配列（値がないシンボルは NaN）
+
+        Returns:
+            (行動の配列（シグナルなしは空文字）, 信頼度の配列)
+        """
+        count = len(markets)
+        fast_ma = indicators.get(f"ma_{self.fast_window}")
+        if fast_ma is None:
+            fast_ma = indicators.get("ma_fast")
+        slow_ma = indicators.get(f"ma_{self.slow_window}")
+        if slow_ma is None:
+            slow_ma = indicators.get("ma_slow")
+        if fast_ma is None or slow_ma is None:
+            return np.full(count, "", dtype=object), np.full(count, 0.5)
+
+        # 前回の値を集め、移動平均が計算されたシンボルだけ現在の値で更新する
+        prev_fast = np.array([self._prev_fast_ma.get(market, np.nan) for market in markets])
+        prev_slow = np.array([self._prev_slow_ma.get(market, np.nan) for market in markets])
+        valid = ~(np.isnan(fast_ma) | np.isnan(slow_ma))
+        for market, fast, slow, is_valid in zip(markets, fast_ma.tolist(), slow_ma.tolist(), valid.tolist()):
+            if is_valid:
+                self._prev_fast_ma[market] = fast
+                self._prev_slow_ma[market] = slow
+
+        # ゴールデンクロス・デッドクロス（前回の値がない NaN の比較は False になり、シグナルなし）
+        golden = valid & (prev_fast <= prev_slow) & (fast_ma > slow_ma)
+        dead = valid & ~golden & (prev_fast >= prev_slow) & (fast_ma < slow_ma)
+        actions = np.full(count, "", dtype=object)
+        actions[golden] = "enter_long"
+        actions[dead] = "exit"
+        for row in np.flatnonzero(golden | dead).tolist():
+            logger.info(
+                "%s cross detected: symbol=%s, fast_ma=%.2f, slow_ma=%.2f",
+                "Golden" if golden[row] else "Dead",
+                markets[row][1],
+                fast_ma[row],
+                slow_ma[row],
+            )
+        return actions, np.where(golden | dead, 0.7, 0.5)
+
+    @property
+    def series_history(self) -> int:
+        """decide_series がチャンクの前に必要とする終値の本数（1本前の長期MAの計算に必要な本数）。"""
+        return max(self.fast_window, self.slow_window)
+
+    def decide_series(self, closes: np.ndarray, start: int) -> Optional[np.ndarray]:
+        """終値の時系列全体の移動平均クロスを、まとめて判定します（ベクトル化バックテスト用）.
+
+        decide と同じ条件で、時系列全体の移動平均を累積和から計算し、1本前の値との比較でクロスを判定します。
+
+        Args:
+            closes: 終値の時系列（closes[:start] は前のチャンクから引き継いだ履歴）
+            start: 判定するバーの先頭の位置
+
+        Returns:
+            closes[start:] のバーごとの行動（1: enter_long、-1: exit、0: シグナルなし）
+        """
+        fast_ma = rolling_mean(closes, self.fast_window)
+        slow_ma = rolling_mean(closes, self.slow_window)
+        # 1本前の値（時系列の先頭は前回の値がないため NaN、NaN の比較は False になりシグナルなし）
+        prev_fast = np.concatenate(([np.nan], fast_ma[:-1]))[start:]
+        prev_slow = np.concatenate(([np.nan], slow_ma[:-1]))[start:]
+        fast_ma = fast_ma[start:]
+        slow_ma = slow_ma[start:]
+
+        golden = (prev_fast <= prev_slow) & (fast_ma > slow_ma)
+        dead = ~golden & (prev_fast >= prev_slow) & (fast_ma < slow_ma)
+        return golden.astype(np.int8) - dead.astype(np.int8)
+
+    def make_signal(self, ohlcv: OHLCV, action: str, confidence: Decimal, indicators: Dict[str, float]) -> Signal:
+        """移動平均クロスの Signal を生成します.
+
+        Args:
+            ohlcv: OHLCV エンティティ
+            action: 行動（"enter_long" / "exit"）
+            confidence: 信頼度
+            indicators: 指標の辞書
+
+        Returns:
+            Signal エンティティ
+        """
+        return Signal(
+            exchange=ohlcv.exchange,
+            symbol=ohlcv.symbol,
+            strategy="moving_average_cross",
+            action=action,
+            confidence=confidence,
+            price_ref=ohlcv.close,
+            indicators=indicators,
+            meta={
+                "fast_window": self.fast_window,
+                "slow_window": self.slow_window,
+                "fast_ma": indicators.get(f"ma_{self.fast_window}", indicators.get("ma_fast")),
+                "slow_ma": indicators.get(f"ma_{self.slow_window}", indicators.get("ma_slow")),
+            },
+            timestamp=ohlcv.timestamp,
+        )
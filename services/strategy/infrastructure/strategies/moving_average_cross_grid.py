@@ -0,0 +1,137 @@
+"""Moving Average Cross parameter grid.
+
+Infrastructure layer: 移動平均クロス戦略のパラメータグリッド
+責務: 多数の (短期MA, 長期MA) の組み合わせを、共有の終値履歴の累積和から1回のベクトル化した演算で評価し、
+      組み合わせごとのシャドーシグナル（ペーパートレード用）を生成する
+"""
+import logging
+from decimal import Decimal
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from application.interfaces.strategy import StrategyGrid
+from shared.domain.models import OHLCV, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class MovingAverageCrossGrid(StrategyGrid):
+    """Evaluate many MovingAverageCrossStrategy parameter pairs at once.
+
+    期間ごとの移動平均を直近の終値の累積和の差分からまとめて計算し、
+    組み合わせごとの「短期MA - 長期MA」を取引所・シンボルごとの NumPy 配列に保持してクロスを判定します。
+    判定の条件とシグナルの内容は MovingAverageCrossStrategy と同じです。
+    クロス判定用の前回の値がないシンボル（起動直後など）は、共有の履歴から1本前の値を計算して補います。
+    """
+
+    def __init__(
+        self,
+        fast_windows: Iterable[int],
+        slow_windows: Iterable[int],
+        timeframe: str = "1s",
+    ) -> None:
+        """Initialize Moving Average Cross Grid.
+
+        Args:
+            fast_windows: 短期MAの期間の候補
+            slow_windows: 長期MAの期間の候補（短期MAより長い組み合わせだけを評価する）
+            timeframe: 判断に使用する時間足（デフォルト: "1s"）
+
+        Raises:
+            ValueError: 評価する組み合わせがない、または期間が正でない場合
+        """
+        pairs = [
+            (fast, slow)
+            for fast in sorted(set(int(window) for window in fast_windows))
+            for slow in sorted(set(int(window) for window in slow_windows))
+            if fast < slow
+        ]
+        if not pairs:
+            raise ValueError("Parameter grid has no (fast_window < slow_window) pairs")
+        if pairs[0][0] <= 0:
+            raise ValueError(f"Moving average windows must be positive: {pairs[0][0]}")
+
+        self.timeframe = timeframe
+        # 組み合わせ（短期, 長期）と、移動平均を計算する期間の一覧
+        self.pairs = np.array(pairs, dtype=np.int64)
+        self.windows = np.unique(self.pairs)
+        self._fast_index = np.searchsorted(self.windows, self.pairs[:, 0])
+        self._slow_index = np.searchsorted(self.windows, self.pairs[:, 1])
+        # (取引所, シンボル) → 組み合わせごとの前回の「短期MA - 長期MA」
+        self._prev_diff: Dict[Tuple[str, str], np.ndarray] = {}
+
+    @property
+    def required_history(self) -> int:
+        """クロス判定に必要な終値の本数（最長の期間 + 1本前）。"""
+        return int(self.windows[-1]) + 1
+
+    def moving_averages(self, closes: Sequence[float]) -> np.ndarray:
+        """すべての期間の移動平均を、直近の終値の累積和からまとめて計算します。
+
+        Args:
+            closes: 終値の時系列（古い順、末尾が最新値）
+
+        Returns:
+            self.windows と同じ順の移動平均（本数が不足する期間は NaN）
+        """
+        tail = np.asarray(closes[-int(self.windows[-1]) :], dtype=np.float64)
+        count = len(tail)
+        sums = np.concatenate(([0.0], np.cumsum(tail)))
+        start = np.maximum(count - self.windows, 0)
+        return np.where(self.windows <= count, (sums[count] - sums[start]) / self.windows, np.nan)
+
+    def evaluate(self, ohlcv: OHLCV, closes: Sequence[float]) -> List[Signal]:
+        """最新のバーで全組み合わせのクロスを判定し、シャドーシグナルを返します。
+
+        Args:
+            ohlcv: 確定した OHLCV エンティティ（closes の末尾のバー）
+            closes: 取引所・シンボルの終値の時系列（古い順、required_history 本まで保持していること）
+
+        Returns:
+            クロスが発生した組み合わせの Signal のリスト（strategy は "moving_average_cross:<短期>:<長期>"）
+        """
+        symbol = ohlcv.symbol
+        averages = self.moving_averages(closes)
+        fast_ma = averages[self._fast_index]
+        slow_ma = averages[self._slow_index]
+        diff = fast_ma - slow_ma
+
+        key = (ohlcv.exchange, symbol)
+        prev = self._prev_diff.get(key)
+        if prev is None:
+            prev = self._diff(closes[:-1]) if len(closes) > 1 else np.full(len(self.pairs), np.nan)
+        self._prev_diff[key] = diff
+
+        # ゴールデンクロス（短期MAが長期MAを上抜け）・デッドクロス（下抜け）、NaN の組み合わせは判定しない
+        golden = (prev <= 0.0) & (diff > 0.0)
+        dead = (prev >= 0.0) & (diff < 0.0)
+        crossed = np.flatnonzero(golden | dead)
+        if not len(crossed):
+            return []
+
+        signals = [
+            Signal(
+                exchange=ohlcv.exchange,
+                symbol=symbol,
+                strategy=f"moving_average_cross:{fast}:{slow}",
+                action="enter_long" if is_golden else "exit",
+                confidence=Decimal("0.7"),
+                price_ref=ohlcv.close,
+                meta={"fast_window": fast, "slow_window": slow, "fast_ma": fast_value, "slow_ma": slow_value},
+                timestamp=ohlcv.timestamp,
+            )
+            for (fast, slow), is_golden, fast_value, slow_value in zip(
+                self.pairs[crossed].tolist(),
+                golden[crossed].tolist(),
+                fast_ma[crossed].tolist(),
+                slow_ma[crossed].tolist(),
+            )
+        ]
+        logger.debug("Grid crosses detected: symbol=%s, pairs=%d/%d", symbol, len(signals), len(self.pairs))
+        return signals
+
+    def _diff(self, closes: Sequence[float]) -> np.ndarray:
+        """組み合わせごとの「短期MA - 長期MA」を計算します。"""
+        averages = self.moving_averages(closes)
+        return averages[self._fast_index] - averages[self._slow_index]
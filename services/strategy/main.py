@@ -5,9 +5,12 @@ Redis Stream から市場データを購読し、OHLCV生成、指標計算、
 """
 import asyncio
 import logging
+import re
 import sys
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from config import Settings, load_settings
 
@@ -16,19 +19,35 @@ shared_path = Path(__file__).parent.parent / "shared"
 if str(shared_path) not in sys.path:
     sys.path.append(str(shared_path))
 
+from application.services.checkpoint import stream_id_key
+from application.services.conflation import conflate_tickers
+from application.services.message_time import message_ts
+from application.services.shard_router import ShardRouter
 from application.services.signal_publisher import SignalPublisherService
 from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.main import StrategyPipeline
 from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
 from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
-from infrastructure.database.repositories.ohlcv_repository import OhlcvRepository
-from infrastructure.database.repositories.signal_repository import SignalRepository
+from domain.market import OrderBookStore, TradeTapeStore, parse_timeframe
+from infrastructure.database.repositories.ohlcv_repository import (
+    OhlcvRepository,
+    WriteBehindOhlcvRepository,
+)
+from infrastructure.database.repositories.signal_repository import SignalOutbox, SignalRepository
+from infrastructure.redis.checkpoint_store import RedisCheckpointStore
+from infrastructure.redis.codec import decode_data
 from infrastructure.redis.consumer import RedisStreamConsumer
 from infrastructure.redis.publisher import RedisStreamPublisher
+from infrastructure.redis.reclaimer import PendingReclaimer
 from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from infrastructure.strategies.moving_average_cross_grid import MovingAverageCrossGrid
 from shared.infrastructure.database.connection import Database
 
 logger = logging.getLogger(__name__)
 
+# 戦略インスタンスの宣言（例: "ma_5_20=moving_average_cross(fast_window=5,slow_window=20)"）
+_STRATEGY_SPEC = re.compile(r"^(?:(?P<id>[\w.:-]+)\s*=\s*)?(?P<name>\w+)\s*(?:\((?P<params>[^()]*)\))?$")
+
 
 def create_strategy(strategy_name: str, **kwargs: Any) -> Any:
     """Strategy インスタンスを作成します。
@@ -43,11 +62,137 @@ def create_strategy(strategy_name: str, **kwargs: Any) -> Any:
     if strategy_name == "moving_average_cross":
         fast_window = kwargs.get("fast_window", 5)
         slow_window = kwargs.get("slow_window", 20)
-        return MovingAverageCrossStrategy(fast_window=fast_window, slow_window=slow_window)
+        timeframe = kwargs.get("timeframe", "1s")
+        return MovingAverageCrossStrategy(
+            fast_window=fast_window, slow_window=slow_window, timeframe=timeframe
+        )
     else:
         raise ValueError(f"Unknown strategy: {strategy_name}")
 
 
+def _parse_param(value: str) -> Any:
+    """戦略のパラメータの値を変換します（整数・小数・文字列）。"""
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def create_strategies(specs: List[str], default_name: str, timeframe: str) -> Dict[str, Any]:
+    """STRATEGIES の宣言から戦略インスタンスを作成します。
+
+    Args:
+        specs: 戦略インスタンスの宣言のリスト（例: ["ma_5_20=moving_average_cross(fast_window=5,slow_window=20)"]、
+            インスタンスID を省略した場合は戦略名、空の場合は default_name の1つだけ）
+        default_name: 宣言がない場合の戦略名（STRATEGY_NAME）
+        timeframe: パラメータで指定されない場合の時間足（STRATEGY_TIMEFRAME）
+
+    Returns:
+        インスタンスID → Strategy インスタンスの辞書（宣言順）
+
+    Raises:
+        ValueError: 宣言が不正、またはインスタンスID が重複する場合
+    """
+    strategies: Dict[str, Any] = {}
+    for spec in specs or [default_name]:
+        match = _STRATEGY_SPEC.match(spec.strip())
+        if match is None:
+            raise ValueError(f"Invalid strategy spec: {spec}")
+        params: Dict[str, Any] = {"timeframe": timeframe}
+        for item in filter(None, (part.strip() for part in (match["params"] or "").split(","))):
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Invalid strategy parameter: {item} in {spec}")
+            params[key.strip()] = _parse_param(value.strip())
+        instance_id = match["id"] or match["name"]
+        if instance_id in strategies:
+            raise ValueError(f"Duplicate strategy instance id: {instance_id}")
+        strategies[instance_id] = create_strategy(match["name"], **params)
+    return strategies
+
+
+def parse_windows(value: str) -> List[int]:
+    """期間の候補をパースします。
+
+    Args:
+        value: カンマ区切りの期間、または "<開始>:<終了>:<刻み>" の範囲（終了を含む、例: "5:50:5,100"）
+
+    Returns:
+        期間のリスト
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    windows: List[int] = []
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        bounds = [int(bound) for bound in item.split(":")]
+        if len(bounds) == 1:
+            windows.append(bounds[0])
+            continue
+        start, stop, step = (bounds + [1])[:3] if len(bounds) <= 3 else (0, 0, 0)
+        if step <= 0:
+            raise ValueError(f"Invalid window range: {item}")
+        windows.extend(range(start, stop + 1, step))
+    return windows
+
+
+def create_usecases(
+    settings: Settings, ohlcv_repository: Any = None
+) -> Tuple[
+    OHLCVGeneratorUseCase,
+    IndicatorCalculatorUseCase,
+    SignalGeneratorUseCase,
+    Optional[MovingAverageCrossGrid],
+]:
+    """設定から OHLCV生成 → 指標計算 → シグナル生成のユースケースを作成します（ワーカーとリプレイで共通）。
+
+    Args:
+        settings: 設定オブジェクト
+        ohlcv_repository: OHLCV リポジトリ（オプション）
+
+    Returns:
+        (OHLCV 生成, 指標計算, シグナル生成, パラメータグリッド（未設定の場合は None）)
+
+    Raises:
+        ValueError: 戦略・期間の宣言が不正な場合
+    """
+    # 1つのワーカーで複数の戦略インスタンスを実行し、バーの集約と指標の計算を共有する
+    signal_generator = SignalGeneratorUseCase(
+        strategies=create_strategies(settings.strategies, settings.strategy_name, settings.strategy_timeframe)
+    )
+    timeframe = signal_generator.strategy.timeframe
+    # 板情報: OHLCV 生成側が md:orderbook を反映し、指標計算側が特徴量を参照する
+    order_books = OrderBookStore(depth=settings.orderbook_depth)
+    # 約定履歴: OHLCV 生成側が md:trade を追加し、指標計算側が時間窓の特徴量を参照する
+    trade_tapes = TradeTapeStore(windows=settings.trade_windows, capacity=settings.trade_tape_capacity)
+    ohlcv_generator = OHLCVGeneratorUseCase(
+        repository=ohlcv_repository,
+        timeframes=[*settings.timeframes, timeframe],
+        decode_data=decode_data,
+        order_books=order_books,
+        trade_tapes=trade_tapes,
+    )
+    # パラメータグリッドのシャドー評価（短期・長期の候補が両方設定されている場合のみ）
+    shadow_grid = None
+    if settings.shadow_fast_windows and settings.shadow_slow_windows:
+        shadow_grid = MovingAverageCrossGrid(
+            parse_windows(settings.shadow_fast_windows),
+            parse_windows(settings.shadow_slow_windows),
+            timeframe=timeframe,
+        )
+    # 各戦略が宣言した指標の和集合だけを計算する（重複する移動和・EMA は共有される）
+    indicator_calculator = IndicatorCalculatorUseCase(
+        # グリッドの最長の期間まで終値の履歴を保持する
+        max_history_size=max(200, shadow_grid.required_history if shadow_grid else 0),
+        order_books=order_books,
+        trade_tapes=trade_tapes,
+        indicators=signal_generator.required_indicators(),
+    )
+    return ohlcv_generator, indicator_calculator, signal_generator, shadow_grid
+
+
 async def run_worker(settings: Settings) -> None:
     """Main worker loop.
 
@@ -60,24 +205,81 @@ async def run_worker(settings: Settings) -> None:
     redis_consumer = RedisStreamConsumer(settings.redis_url)
     redis_publisher = RedisStreamPublisher(settings.redis_url)
 
+    # シャーディング: 担当シンボルのメッセージのみ処理し、シャードごとに別の Consumer Group を使用する
+    shard_router = ShardRouter(settings.shard_index, settings.shard_count)
+    group_name = shard_router.consumer_group("strategy")
+    consumer_name = settings.consumer_name or f"strategy-{settings.shard_index}"
+
+    database: Database | None = None
+    ohlcv_repo: WriteBehindOhlcvRepository | None = None
+    signal_repo: SignalOutbox | None = None
+    pipeline: StrategyPipeline | None = None
+    reclaim_task: asyncio.Task | None = None
+    checkpoint_store: RedisCheckpointStore | None = None
+    checkpoint_task: asyncio.Task | None = None
+    ack_task: asyncio.Task | None = None
+    # 処理が完了し、ACK 待ちのメッセージID（Stream ごと）
+    completed: Dict[str, List[str]] = defaultdict(list)
+
+    async def flush_acks() -> None:
+        """処理が完了したメッセージをまとめて ACK します（パイプライン化した ACK）。"""
+        nonlocal completed
+        if not completed:
+            return
+        message_ids, completed = completed, defaultdict(list)
+        try:
+            await redis_consumer.ack_many(group_name=group_name, message_ids=message_ids)
+        except Exception as ack_error:
+            # ACK されなかったメッセージは pending に残り、再配信の対象になる
+            logger.error("Failed to ACK messages: %s", ack_error, exc_info=True)
+
+    async def flush_acks_later() -> None:
+        """ACK_FLUSH_INTERVAL 秒待ってから、それまでに処理が完了したメッセージを ACK します。"""
+        await asyncio.sleep(settings.ack_flush_interval)
+        await flush_acks()
+
+    def schedule_ack_flush() -> None:
+        """ACK の予約がなければ予約します（新着メッセージの有無に関係なく ACK する）。"""
+        nonlocal ack_task
+        if ack_task is None or ack_task.done():
+            ack_task = asyncio.create_task(flush_acks_later())
+
+    async def save_checkpoint() -> None:
+        """パイプラインの状態のチェックポイントを保存します。"""
+        try:
+            await checkpoint_store.save(await pipeline.checkpoint())
+        except Exception as checkpoint_error:
+            logger.error("Failed to save checkpoint: %s", checkpoint_error, exc_info=True)
+
     try:
         await redis_consumer.connect()
         await redis_publisher.connect()
 
         # データベース接続を初期化（オプショナル）
         # 注意: マイグレーションは Alembic で管理します（起動前に `alembic upgrade head` を実行）
-        database: Database | None = None
-        ohlcv_repo: OhlcvRepository | None = None
-        signal_repo: SignalRepository | None = None
-
         if settings.database_url:
             try:
                 database = Database(settings.database_url)
                 await database.connect()
 
                 # リポジトリを初期化
-                ohlcv_repo = OhlcvRepository(database)
-                signal_repo = SignalRepository(database)
+                # OHLCV はバッファに溜めて複数行 INSERT でまとめて書き込む（バーごとのコミットを避ける）
+                ohlcv_repo = WriteBehindOhlcvRepository(
+                    OhlcvRepository(database),
+                    max_batch=settings.ohlcv_flush_size,
+                    flush_interval=settings.ohlcv_flush_interval,
+                    max_pending=settings.ohlcv_max_pending,
+                )
+                ohlcv_repo.start()
+                # シグナルは outbox 経由でバックグラウンドから書き込む（配信・ACK はコミットを待たない）
+                signal_repo = SignalOutbox(
+                    SignalRepository(database),
+                    max_batch=settings.signal_flush_size,
+                    flush_interval=settings.signal_flush_interval,
+                    max_pending=settings.signal_max_pending,
+                    overflow=settings.signal_overflow,
+                )
+                signal_repo.start()
                 logger.info("Database repositories initialized")
             except Exception as e:
                 logger.error("Failed to initialize database connection: %s", e, exc_info=True)
@@ -87,11 +289,19 @@ async def run_worker(settings: Settings) -> None:
                 signal_repo = None
 
         # Application 層のユースケースを初期化
-        ohlcv_generator = OHLCVGeneratorUseCase(repository=ohlcv_repo)
-        indicator_calculator = IndicatorCalculatorUseCase()
-        strategy = create_strategy(settings.strategy_name)
-        signal_generator = SignalGeneratorUseCase(strategy=strategy)
+        ohlcv_generator, indicator_calculator, signal_generator, shadow_grid = create_usecases(settings, ohlcv_repo)
+        strategy = signal_generator.strategy
+        if shadow_grid is not None:
+            logger.info(
+                "Shadow parameter grid enabled: pairs=%d, windows=%d, stream=%s:<exchange>:<symbol>",
+                len(shadow_grid.pairs),
+                len(shadow_grid.windows),
+                settings.shadow_stream_prefix,
+            )
         signal_publisher = SignalPublisherService(publisher=redis_publisher)
+        shadow_publisher = SignalPublisherService(
+            publisher=redis_publisher, stream_prefix=settings.shadow_stream_prefix, log_level=logging.DEBUG
+        )
 
         # Consumer Group で市場データを購読
         streams = {
@@ -101,74 +311,199 @@ async def run_worker(settings: Settings) -> None:
         }
 
         logger.info(
-            "Starting strategy worker: group=strategy, streams=%s",
+            "Starting strategy worker: group=%s, consumer=%s, shard=%s/%s, owned_symbols=%s, streams=%s, "
+            "strategies=%s, indicators=%s",
+            group_name,
+            consumer_name,
+            settings.shard_index,
+            settings.shard_count,
+            shard_router.owned_symbols(settings.symbols) if settings.symbols else "all",
             list(streams.keys()),
+            list(signal_generator.strategies),
+            [str(spec) for spec in indicator_calculator.indicators],
         )
 
-        async for message in redis_consumer.consume(
-            group_name="strategy",
-            consumer_name="strategy-1",
-            streams=streams,
-            block=1000,  # 1秒ブロック
-            count=10,  # 一度に10件取得
-        ):
-            try:
-                # OHLCV 生成
-                ohlcv = ohlcv_generator.execute(message)
-                if not ohlcv:
-                    # OHLCV が生成されない場合でも ACK を送信（無効なメッセージとして処理済み）
-                    await redis_consumer.ack(
-                        stream_name=message["stream"],
-                        group_name="strategy",
-                        message_id=message["id"],
-                    )
-                    continue
+        def mark_done(message: Dict[str, Any]) -> None:
+            """パイプラインで処理が完了したメッセージを ACK 待ちに登録します。"""
+            # OHLCV が生成されない（バー未確定・無効な）メッセージも処理済みとして ACK する
+            completed[message["stream"]].append(message["id"])
+            schedule_ack_flush()
+
+        def mark_failed(message: Dict[str, Any]) -> None:
+            """処理に失敗したメッセージは ACK せず、pending に残して回収の対象にします。"""
+            logger.warning(
+                "Message left pending for retry: stream=%s, id=%s", message["stream"], message["id"]
+            )
+
+        conflation_bucket_ms = parse_timeframe(ohlcv_generator.base_timeframe)
+        if settings.conflate:
+            logger.info("Ticker conflation enabled: bucket=%s", ohlcv_generator.base_timeframe)
+
+        # decode → aggregate → indicators → decide → publish/persist を上限付きキューで接続する
+        pipeline = StrategyPipeline(
+            ohlcv_generator=ohlcv_generator,
+            indicator_calculator=indicator_calculator,
+            signal_generator=signal_generator,
+            publisher=signal_publisher,
+            on_done=mark_done,
+            on_failed=mark_failed,
+            shadow_grid=shadow_grid,
+            shadow_publisher=shadow_publisher,
+            ohlcv_repository=ohlcv_repo,
+            signal_repository=signal_repo,
+            queue_size=settings.pipeline_queue_size,
+            max_in_flight=settings.max_in_flight,
+        )
 
-                # OHLCV を保存
-                if ohlcv_repo:
-                    try:
-                        await ohlcv_repo.save(ohlcv)
-                    except Exception as e:
-                        logger.error("Failed to save OHLCV: %s", e, exc_info=True)
-
-                # 指標計算
-                indicators = indicator_calculator.execute(ohlcv)
-
-                # シグナル生成
-                signal = signal_generator.execute(ohlcv, indicators)
-
-                if signal:
-                    # シグナルを配信
-                    await signal_publisher.publish(signal)
-
-                    # シグナルを保存
-                    if signal_repo:
-                        try:
-                            await signal_repo.save(signal)
-                        except Exception as e:
-                            logger.error("Failed to save signal: %s", e, exc_info=True)
-
-                # メッセージ処理完了を通知（ACK）
-                await redis_consumer.ack(
-                    stream_name=message["stream"],
-                    group_name="strategy",
-                    message_id=message["id"],
+        async def restore_from_checkpoint() -> None:
+            """最新のチェックポイントを復元し、それ以降に処理済みのメッセージをリプレイします。"""
+            started = time.perf_counter()
+            checkpoint = await checkpoint_store.load()
+            if checkpoint is None:
+                logger.info("No checkpoint found: key=%s", checkpoint_store.key)
+                return
+            pipeline.restore(checkpoint)
+
+            # チェックポイント以降、停止前に Consumer Group に配信済みのメッセージで状態を追いつかせる
+            # （未配信のメッセージは XREADGROUP で通常どおり処理される）
+            replay: List[Dict[str, Any]] = []
+            pending: Set[str] = set()
+            for stream_name, after_id in checkpoint.stream_ids.items():
+                end_id = await redis_consumer.last_delivered_id(group_name, stream_name)
+                if end_id is None or stream_id_key(end_id) <= stream_id_key(after_id):
+                    continue
+                pending.update(await redis_consumer.pending_ids(group_name, stream_name, after_id, end_id))
+                async for entries in redis_consumer.read_range(stream_name, after_id, end_id):
+                    replay.extend(entries)
+            if shard_router.enabled:
+                replay = [m for m in replay if shard_router.owns(m["fields"].get("symbol", ""))]
+            replay.sort(key=message_ts)
+            for message in replay:
+                # 未 ACK のメッセージはリプレイで処理を完了させる: シグナルは start 後に配信し、
+                # 回収で状態に二重に反映されないように、回収より前に ACK する
+                owned = message["id"] in pending
+                await pipeline.replay(message, publish=owned)
+                if owned:
+                    completed[message["stream"]].append(message["id"])
+            await flush_acks()
+
+            logger.info(
+                "Restored checkpoint: key=%s, age=%.1fs, symbols=%d, replayed=%d, pending=%d, elapsed_ms=%.1f",
+                checkpoint_store.key,
+                time.time() - checkpoint.created_at,
+                sum(len(symbols) for symbols in checkpoint.history.values()),
+                len(replay),
+                len(pending),
+                (time.perf_counter() - started) * 1000,
+            )
+
+        async def checkpoint_loop() -> None:
+            """一定間隔でチェックポイントを保存します。"""
+            while True:
+                await asyncio.sleep(settings.checkpoint_interval)
+                await save_checkpoint()
+
+        # データベースの直近のバーで指標を初期化する（全シンボルを1回のクエリで取得）
+        # チェックポイントがあるシンボルは、この後にチェックポイントの状態で上書きされる
+        warmup_symbols = shard_router.owned_symbols(settings.symbols)
+        if settings.warmup_from_db and ohlcv_repo and warmup_symbols:
+            try:
+                started = time.perf_counter()
+                bars = await ohlcv_repo.fetch_recent(
+                    [(settings.exchange_name, symbol) for symbol in warmup_symbols],
+                    [strategy.timeframe],
+                    indicator_calculator.history_capacity,
+                )
+                warmed = pipeline.warm_up(bars)
+                logger.info(
+                    "Warmed up indicators from database: symbols=%d/%d, bars=%d, elapsed_ms=%.1f",
+                    warmed,
+                    len(warmup_symbols),
+                    len(bars),
+                    (time.perf_counter() - started) * 1000,
                 )
+            except Exception as e:
+                logger.error("Failed to warm up indicators from database: %s", e, exc_info=True)
 
+        # 前回のチェックポイントから指標・戦略の状態を復元する（ウォームアップを待たずにシグナルを出せる）
+        if settings.checkpoint_interval > 0:
+            checkpoint_store = RedisCheckpointStore(
+                settings.redis_url, settings.checkpoint_key or f"checkpoint:{group_name}"
+            )
+            try:
+                await restore_from_checkpoint()
             except Exception as e:
-                logger.error("Error processing message: %s", e, exc_info=True)
-                # エラーが発生した場合でも ACK を送信（無限ループを防ぐため）
-                # 注意: エラー時に ACK を送信すると、そのメッセージは再処理されません
-                # 再処理が必要な場合は、ACK を送信せずに continue する
-                try:
-                    await redis_consumer.ack(
-                        stream_name=message["stream"],
-                        group_name="strategy",
-                        message_id=message["id"],
-                    )
-                except Exception as ack_error:
-                    logger.error("Failed to ACK message after error: %s", ack_error, exc_info=True)
-                continue
+                logger.error("Failed to restore checkpoint: %s", e, exc_info=True)
+
+        await pipeline.start()
+        if checkpoint_store:
+            checkpoint_task = asyncio.create_task(checkpoint_loop())
+
+        async def dispatch(batch: List[Dict[str, Any]]) -> None:
+            """取得したメッセージをパイプラインに投入し、処理が完了したメッセージを ACK します。"""
+            # 担当外のシンボルはデータをデコードせずに処理済みとする
+            if shard_router.enabled:
+                owned = []
+                for message in batch:
+                    if shard_router.owns(message["fields"].get("symbol", "")):
+                        owned.append(message)
+                    else:
+                        completed[message["stream"]].append(message["id"])
+                batch = owned
+
+            # Stream ごとに返されるため、ts で Stream をまたいだ時系列順に並べ替える
+            # （ticker と trade の順序が逆転すると、確定済みのバーに届いた trade として扱われるため）
+            batch.sort(key=message_ts)
+
+            # 間引きモード: 同じシンボル・同じバケットの途中のティッカーを処理せずに ACK する
+            if settings.conflate:
+                batch, superseded = conflate_tickers(batch, conflation_bucket_ms)
+                for message in superseded:
+                    completed[message["stream"]].append(message["id"])
+
+            # パイプラインに投入（キューが満杯の場合はここで待機して XREADGROUP を抑制する）
+            for message in batch:
+                await pipeline.submit(message)
+
+            # ここまでに処理が完了したメッセージを ACK（実行中のものは次回以降に ACK）
+            await flush_acks()
+
+        # 前回の停止・失敗で ACK されなかったメッセージを XAUTOCLAIM で引き取り、再処理する
+        reclaimer = PendingReclaimer(
+            redis_consumer,
+            group_name=group_name,
+            consumer_name=consumer_name,
+            streams=list(streams.keys()),
+            min_idle_ms=settings.reclaim_min_idle_ms,
+            max_deliveries=settings.max_deliveries,
+            batch_size=settings.consume_batch_size,
+            dead_letter_stream=settings.dead_letter_stream,
+        )
+
+        async def reclaim_pending() -> None:
+            """pending メッセージを回収してパイプラインに投入します。"""
+            async for reclaimed in reclaimer.reclaim():
+                await dispatch(reclaimed)
+
+        async def reclaim_loop() -> None:
+            """一定間隔で pending メッセージを回収します。"""
+            while True:
+                await asyncio.sleep(settings.reclaim_interval)
+                await reclaim_pending()
+
+        # 起動時の回収（新着メッセージより先に、前回処理できなかったメッセージを処理する）
+        await reclaim_pending()
+        if settings.reclaim_interval > 0:
+            reclaim_task = asyncio.create_task(reclaim_loop())
+
+        async for batch in redis_consumer.consume_batches(
+            group_name=group_name,
+            consumer_name=consumer_name,
+            streams=streams,
+            block=1000,  # 1秒ブロック
+            count=settings.consume_batch_size,
+        ):
+            await dispatch(batch)
 
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
@@ -178,9 +513,39 @@ async def run_worker(settings: Settings) -> None:
     finally:
         # クリーンアップ
         redis_consumer.stop()
+        for task in (reclaim_task, checkpoint_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        # パイプライン内のメッセージの処理完了を待ってから ACK する
+        try:
+            if pipeline:
+                await pipeline.stop()
+            # 予約済みの ACK はキャンセルせずに待つ（ACK 中にキャンセルすると pending に残るため）
+            if ack_task:
+                await asyncio.gather(ack_task, return_exceptions=True)
+            await flush_acks()
+        except Exception as e:
+            logger.error("Failed to drain in-flight messages: %s", e, exc_info=True)
+
+        # 停止時点の状態を保存する（次回の起動時のリプレイを最小にする）
+        if checkpoint_store:
+            if pipeline:
+                await save_checkpoint()
+            await checkpoint_store.close()
+
         await redis_consumer.close()
         await redis_publisher.close()
 
+        # 書き込みバッファに残っている OHLCV・シグナルを書き込む
+        for buffered_repo in (ohlcv_repo, signal_repo):
+            if buffered_repo:
+                try:
+                    await buffered_repo.close()
+                except Exception as e:
+                    logger.error("Failed to flush write buffer: %s", e, exc_info=True)
+
         # データベース接続を閉じる
         if database:
             try:
@@ -211,9 +576,10 @@ def main() -> None:
     configure_logging(settings.log_level)
 
     logger.info(
-        "Starting strategy module: symbols=%s, strategy=%s, redis_url=%s",
+        "Starting strategy module: symbols=%s, strategy=%s, timeframe=%s, redis_url=%s",
         settings.symbols,
         settings.strategy_name,
+        settings.strategy_timeframe,
         settings.redis_url,
     )
 
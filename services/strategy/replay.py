@@ -0,0 +1,105 @@
+"""Replay entrypoint for strategy module.
+
+記録した md:* のメッセージ（JSON Lines）を本番と同じ設定の OHLCV生成 → 指標計算 → シグナル生成に
+CPU の限界の速度で通し、スループット（messages/sec）とシグナル数を JSON で出力します。
+
+使用例:
+    python replay.py --input md_20241122.jsonl.gz --output signals.jsonl
+    STRATEGIES="ma_5_20=moving_average_cross(fast_window=5,slow_window=20)" python replay.py --input md.jsonl
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from config import load_settings
+from main import configure_logging, create_usecases
+
+from application.services.signal_publisher import SignalPublisherService
+from application.usecases.strategy.main import StrategyPipeline
+from application.usecases.strategy.replay import ReplayUseCase
+from infrastructure.replay import JsonlSignalWriter, read_messages
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数をパースします。
+
+    Args:
+        argv: 引数のリスト（省略時は sys.argv）
+
+    Returns:
+        パースした引数
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded market data through the strategy pipeline.")
+    parser.add_argument("--input", required=True, help="記録したメッセージの JSON Lines ファイル（.gz も可）")
+    parser.add_argument("--output", help="生成したシグナルを書き出す JSON Lines ファイル（省略時は書き出さない）")
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        help="戦略インスタンスの宣言（STRATEGIES と同じ形式、複数指定可、省略時は STRATEGIES / STRATEGY_NAME）",
+    )
+    parser.add_argument("--batch-size", type=int, default=256, help="indicators/decide でまとめて処理するメッセージ数")
+    return parser.parse_args(argv)
+
+
+async def run_replay(args: argparse.Namespace) -> dict:
+    """引数で指定されたリプレイを実行します。
+
+    Args:
+        args: parse_args の結果
+
+    Returns:
+        リプレイ結果の要約の辞書
+    """
+    settings = load_settings()
+    if args.strategy:
+        settings.strategies = args.strategy
+    ohlcv_generator, indicator_calculator, signal_generator, shadow_grid = create_usecases(settings)
+
+    writer = JsonlSignalWriter(args.output) if args.output else None
+    publisher = SignalPublisherService(publisher=writer, log_level=logging.DEBUG) if writer else None
+    shadow_publisher = (
+        SignalPublisherService(publisher=writer, stream_prefix=settings.shadow_stream_prefix, log_level=logging.DEBUG)
+        if writer
+        else None
+    )
+    pipeline = StrategyPipeline(
+        ohlcv_generator=ohlcv_generator,
+        indicator_calculator=indicator_calculator,
+        signal_generator=signal_generator,
+        publisher=publisher,
+        on_done=lambda message: None,
+        shadow_grid=shadow_grid,
+        shadow_publisher=shadow_publisher,
+        stage_batch_size=args.batch_size,
+    )
+    try:
+        replay = ReplayUseCase(
+            pipeline, batch_size=args.batch_size, publisher=publisher, shadow_publisher=shadow_publisher
+        )
+        report = await replay.execute(read_messages(args.input), keep_signals=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    return report.to_dict()
+
+
+def main() -> None:
+    """Replay entrypoint."""
+    args = parse_args()
+    configure_logging(load_settings().log_level)
+    try:
+        summary = asyncio.run(run_replay(args))
+    except Exception as e:
+        logger.error("Replay failed: %s", e, exc_info=True)
+        sys.exit(1)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Shared helpers for the strategy pipeline integration tests.
+
+パイプラインの統合テストで共通に使用する Publisher・リポジトリの代替と、メッセージ・パイプラインの生成
+"""
+import asyncio
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Any, List, Mapping, Optional, Sequence
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.interfaces.strategy import Strategy
+from application.services.signal_publisher import SignalPublisherService
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.main import StrategyPipeline
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+
+BASE_TS = 1732312345000
+
+# メッセージID の連番（同じ ts のメッセージでも ID が重複しないようにする）
+_sequence = itertools.count()
+
+
+class FakePublisher:
+    """XADD の代わりに配信内容を記録する Publisher。
+
+    release をクリアすると、セットされるまで配信を止めます（下流の詰まりのシミュレーション）。
+    """
+
+    def __init__(self) -> None:
+        self.published: List[tuple] = []
+        self.round_trips = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def publish(self, stream: str, payload: dict) -> str:
+        return (await self.publish_many([(stream, payload)]))[0]
+
+    async def publish_many(self, messages: list) -> List[str]:
+        await self.release.wait()
+        self.round_trips += 1
+        start = len(self.published)
+        self.published.extend(messages)
+        return [f"{start + i + 1}-0" for i in range(len(messages))]
+
+
+class FakeRepository:
+    """INSERT の代わりに保存内容を記録するリポジトリ。"""
+
+    def __init__(self) -> None:
+        self.saved: list = []
+
+    async def save(self, entity) -> None:
+        self.saved.append(entity)
+
+    async def save_many(self, entities) -> None:
+        self.saved.extend(entities)
+
+
+def ticker_message(ts: int, price: float, symbol: str = "BTC_JPY", exchange: str = "gmo") -> dict:
+    """Redis Stream の ticker メッセージをシミュレートします。"""
+    return {
+        "stream": "md:ticker",
+        "id": f"{ts}-{next(_sequence)}",
+        "fields": {
+            "exchange": exchange,
+            "symbol": symbol,
+            "ts": str(ts),
+            "data": json.dumps({"last": price}),
+        },
+    }
+
+
+def build_pipeline(
+    publisher: Any,
+    strategies: Optional[Mapping[str, Strategy]] = None,
+    timeframes: Sequence[str] = ("1s",),
+    done: Optional[list] = None,
+    **kwargs: Any,
+) -> StrategyPipeline:
+    """テスト用の StrategyPipeline を生成します。
+
+    Args:
+        publisher: 配信先（SignalPublisherService 以外は SignalPublisherService で包む）
+        strategies: インスタンスID → Strategy の辞書（省略時は MovingAverageCrossStrategy(5, 20) のみ、
+            指定した場合は各インスタンスが宣言した指標だけを計算する）
+        timeframes: 生成する時間足
+        done: 処理が完了したメッセージID を記録するリスト（on_done を指定しない場合）
+        **kwargs: StrategyPipeline に渡すその他の引数（shadow_grid を指定した場合は、ワーカーと同様に
+            グリッドの評価に必要な本数の履歴を保持する）
+
+    Returns:
+        StrategyPipeline
+    """
+    if strategies:
+        generator = SignalGeneratorUseCase(strategies=strategies)
+        indicators = generator.required_indicators()
+    else:
+        generator = SignalGeneratorUseCase(MovingAverageCrossStrategy(fast_window=5, slow_window=20))
+        indicators = None
+    shadow_grid = kwargs.get("shadow_grid")
+    max_history_size = max(200, shadow_grid.required_history if shadow_grid else 0)
+    if not isinstance(publisher, SignalPublisherService):
+        publisher = SignalPublisherService(publisher=publisher)
+    if "on_done" not in kwargs:
+        kwargs["on_done"] = (lambda message: done.append(message["id"])) if done is not None else (lambda message: None)
+    return StrategyPipeline(
+        ohlcv_generator=OHLCVGeneratorUseCase(timeframes=timeframes),
+        indicator_calculator=IndicatorCalculatorUseCase(indicators=indicators, max_history_size=max_history_size),
+        signal_generator=generator,
+        publisher=publisher,
+        **kwargs,
+    )
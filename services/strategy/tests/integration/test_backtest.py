@@ -0,0 +1,177 @@
+"""Integration test: Vectorized backtesting.
+
+保存済みのバーをチャンク単位で読み込み、戦略の判定と損益をベクトル化して計算する動作確認テスト
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.backtest.backtest_runner import BacktestUseCase
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from domain.backtest import ENTER_LONG, EXIT, NO_ACTION, BarArrays, LongOnlyPortfolio
+from infrastructure.backtest import CsvBarSource
+from infrastructure.strategies.base import BaseStrategy
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from shared.domain.models import OHLCV
+
+_START = datetime(2024, 1, 1)
+
+
+def _prices(num_bars: int) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return np.round(1_000_000.0 + np.cumsum(rng.normal(0, 500, num_bars)), 2)
+
+
+def _bars(prices: np.ndarray) -> BarArrays:
+    timestamps = np.datetime64(_START, "ms") + np.arange(len(prices)).astype("timedelta64[s]")
+    return BarArrays(
+        timestamps=timestamps,
+        open=prices,
+        high=prices,
+        low=prices,
+        close=prices,
+        volume=np.ones(len(prices)),
+    )
+
+
+def _chunks(bars: BarArrays, size: int) -> List[BarArrays]:
+    return [bars.slice(offset, offset + size) for offset in range(0, len(bars), size)]
+
+
+def test_decide_series_matches_decide() -> None:
+    """decide_series の行動が、指標計算ユースケースと decide をバーごとに実行した結果と一致することを確認"""
+    prices = _prices(600)
+    live = MovingAverageCrossStrategy(fast_window=5, slow_window=20)
+    calculator = IndicatorCalculatorUseCase(indicators=live.required_indicators())
+    expected = []
+    for i, price in enumerate(prices.tolist()):
+        ohlcv = OHLCV(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            timeframe="1s",
+            timestamp=_START + timedelta(seconds=i),
+            open=Decimal(str(price)),
+            high=Decimal(str(price)),
+            low=Decimal(str(price)),
+            close=Decimal(str(price)),
+            volume=Decimal("1"),
+        )
+        signal = live.decide(ohlcv, calculator.execute(ohlcv))
+        expected.append({"enter_long": ENTER_LONG, "exit": EXIT}[signal.action] if signal else NO_ACTION)
+
+    strategy = MovingAverageCrossStrategy(fast_window=5, slow_window=20)
+    assert strategy.decide_series(prices, 0).tolist() == expected
+    assert any(expected)
+
+    # 直前のチャンクの終値を series_history 本だけ引き継げば、チャンクに分けても同じ行動になる
+    history = strategy.series_history
+    chunked: List[int] = []
+    for offset in range(0, len(prices), 37):
+        start = max(offset - history, 0)
+        chunked.extend(strategy.decide_series(prices[start : offset + 37], offset - start).tolist())
+    assert chunked == expected
+
+
+def test_portfolio_pnl_drawdown_and_trades() -> None:
+    """売買の行動から資産・ドローダウン・取引一覧が計算されることを確認"""
+    prices = np.array([100.0, 100.0, 110.0, 99.0, 121.0, 121.0, 100.0, 100.0])
+    actions = np.array([0, 1, 1, 0, -1, -1, 1, 0], dtype=np.int8)
+    portfolio = LongOnlyPortfolio(initial_capital=1000.0)
+    portfolio.update(_bars(prices), actions)
+    result = portfolio.result()
+
+    # 100 で買い 121 で売る（保有中の enter_long、未保有の exit は無視）、最後に 100 で買って保有中
+    assert result.final_equity == pytest.approx(1210.0)
+    assert result.pnl == pytest.approx(210.0)
+    assert result.max_drawdown == pytest.approx(0.1)
+    assert result.max_drawdown_at == _START + timedelta(seconds=3)
+    assert [(t.entry_price, t.exit_price, t.bars) for t in result.trades] == [(100.0, 121.0, 3), (100.0, None, 1)]
+    assert result.trades[0].net_return == pytest.approx(0.21)
+    assert result.win_rate == 1.0
+
+
+def test_portfolio_is_independent_of_chunking() -> None:
+    """チャンクの分け方によらず、手数料込みの損益・ドローダウン・取引一覧が同じになることを確認"""
+    prices = _prices(5_000)
+    bars = _bars(prices)
+    actions = MovingAverageCrossStrategy(fast_window=5, slow_window=20).decide_series(prices, 0)
+
+    results = []
+    for size in (len(bars), 997, 64, 1):
+        portfolio = LongOnlyPortfolio(fee_rate=0.0005)
+        for offset in range(0, len(bars), size):
+            portfolio.update(bars.slice(offset, offset + size), actions[offset : offset + size])
+        results.append(portfolio.result())
+
+    baseline = results[0]
+    assert len(baseline.trades) > 10
+    for result in results[1:]:
+        assert result.final_equity == pytest.approx(baseline.final_equity, rel=1e-9)
+        assert result.max_drawdown == pytest.approx(baseline.max_drawdown, rel=1e-9)
+        assert result.max_drawdown_at == baseline.max_drawdown_at
+        assert [t.to_dict() for t in result.trades] == pytest.approx([t.to_dict() for t in baseline.trades])
+
+
+@pytest.mark.asyncio
+async def test_backtest_usecase_streams_csv_in_chunks(tmp_path: Path) -> None:
+    """CSV から小さなチャンクで読み込んでも、全履歴を1回で評価した結果と一致することを確認"""
+    prices = _prices(3_000)
+    timestamps = pd.date_range(_START, periods=len(prices), freq="1s")
+    frame = pd.DataFrame(
+        {
+            "exchange": "gmo",
+            "symbol": "BTC_JPY",
+            "timeframe": "1s",
+            "timestamp": timestamps.strftime("%Y-%m-%dT%H:%M:%S"),
+            "open": prices,
+            "high": prices,
+            "low": prices,
+            "close": prices,
+            "volume": 1.0,
+        }
+    )
+    other = frame.assign(symbol="ETH_JPY", close=1.0)
+    path = tmp_path / "bars.csv"
+    pd.concat([frame, other]).sort_values("timestamp", kind="stable").to_csv(path, index=False)
+
+    strategy = MovingAverageCrossStrategy(fast_window=5, slow_window=20)
+    backtest = BacktestUseCase(CsvBarSource(path, chunk_size=250), strategy, fee_rate=0.0005)
+    result = await backtest.execute("gmo", "BTC_JPY")
+
+    portfolio = LongOnlyPortfolio(fee_rate=0.0005)
+    portfolio.update(_bars(prices), strategy.decide_series(prices, 0))
+    expected = portfolio.result()
+    assert result.bars == len(prices)
+    assert result.start == _START
+    assert result.final_equity == pytest.approx(expected.final_equity, rel=1e-9)
+    assert [(t.entry_time, t.exit_time) for t in result.trades] == [(t.entry_time, t.exit_time) for t in expected.trades]
+
+    # 期間の指定（end は含まない）
+    window = await backtest.execute("gmo", "BTC_JPY", _START + timedelta(seconds=100), _START + timedelta(seconds=600))
+    assert window.bars == 500
+    assert window.end == _START + timedelta(seconds=599)
+
+
+@pytest.mark.asyncio
+async def test_backtest_requires_vectorized_strategy(tmp_path: Path) -> None:
+    """decide_series を実装していない戦略は ValueError になることを確認"""
+
+    class _PerBarOnly(BaseStrategy):
+        def decide(self, ohlcv, indicators):
+            return None
+
+    path = tmp_path / "bars.csv"
+    row = {"timestamp": 1704067200000, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0}
+    pd.DataFrame([row]).to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        await BacktestUseCase(CsvBarSource(path), _PerBarOnly()).execute("gmo", "BTC_JPY")
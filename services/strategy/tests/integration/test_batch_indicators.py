@@ -0,0 +1,110 @@
+"""Integration test: Cross-symbol batch indicator evaluation.
+
+同時に確定した複数シンボルの指標をベクトル化してまとめて計算する動作確認テスト
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from shared.domain.models import OHLCV
+
+INDICATORS = ["ma:5", "ma:20", "rsi:14", "rsi:3", "bb:20:2", "ema:7", "macd:12:26:9", "macd:5:35:5"]
+
+
+def _ohlcv(symbol: str, i: int, price: float) -> OHLCV:
+    return OHLCV(
+        exchange="gmo",
+        symbol=symbol,
+        timeframe="1s",
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=i),
+        open=Decimal(str(price)),
+        high=Decimal(str(price)),
+        low=Decimal(str(price)),
+        close=Decimal(str(price)),
+        volume=Decimal("1.0"),
+    )
+
+
+def _prices(num_symbols: int, num_bars: int) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    prices = 100.0 + np.cumsum(rng.normal(0, 1, (num_symbols, num_bars)), axis=1)
+    # 値動きのない区間（RSI が未定義になるケース）を含める
+    prices[0, 10:30] = prices[0, 10]
+    return np.round(prices, 2)
+
+
+def _assert_same(actual: Dict[str, float], expected: Dict[str, float]) -> None:
+    assert list(actual) == list(expected)
+    for name, value in expected.items():
+        if np.isnan(value):
+            assert np.isnan(actual[name]), name
+        else:
+            assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+def test_execute_many_matches_per_symbol_execute() -> None:
+    """バッチ計算の結果がシンボルごとの計算結果と一致することを確認"""
+    symbols = [f"SYM{i}" for i in range(12)]
+    prices = _prices(len(symbols), 80)
+    batched = IndicatorCalculatorUseCase(indicators=INDICATORS)
+    single = IndicatorCalculatorUseCase(indicators=INDICATORS)
+
+    for i in range(prices.shape[1]):
+        ohlcvs = [_ohlcv(symbol, i, prices[row, i]) for row, symbol in enumerate(symbols)]
+        results = batched.execute_many(ohlcvs)
+        assert len(results) == len(ohlcvs)
+        for ohlcv, actual in zip(ohlcvs, results):
+            _assert_same(actual, single.execute(ohlcv))
+
+
+def test_execute_many_then_single_updates_stay_consistent() -> None:
+    """バッチ計算とシンボルごとの計算を交互に行っても結果が変わらないことを確認"""
+    symbols = [f"SYM{i}" for i in range(10)]
+    prices = _prices(len(symbols), 90)
+    mixed = IndicatorCalculatorUseCase(indicators=INDICATORS)
+    single = IndicatorCalculatorUseCase(indicators=INDICATORS)
+
+    for i in range(prices.shape[1]):
+        ohlcvs = [_ohlcv(symbol, i, prices[row, i]) for row, symbol in enumerate(symbols)]
+        if (i // 7) % 2 == 0:
+            results = mixed.execute_many(ohlcvs)
+        else:
+            # ウィンドウ型のノードは履歴から作り直される
+            results = [mixed.execute(ohlcv) for ohlcv in ohlcvs]
+        for ohlcv, actual in zip(ohlcvs, results):
+            _assert_same(actual, single.execute(ohlcv))
+
+
+def test_execute_many_preserves_order_for_repeated_symbols() -> None:
+    """同じシンボルが複数回含まれる場合も、シンボルごとの順序どおりに計算されることを確認"""
+    symbols = [f"SYM{i}" for i in range(9)]
+    prices = _prices(len(symbols), 40)
+    batched = IndicatorCalculatorUseCase(indicators=INDICATORS)
+    single = IndicatorCalculatorUseCase(indicators=INDICATORS)
+
+    # 2本分のバーを1回の呼び出しにまとめる
+    for i in range(0, prices.shape[1], 2):
+        ohlcvs: List[OHLCV] = [
+            _ohlcv(symbol, j, prices[row, j]) for j in (i, i + 1) for row, symbol in enumerate(symbols)
+        ]
+        for ohlcv, actual in zip(ohlcvs, batched.execute_many(ohlcvs)):
+            _assert_same(actual, single.execute(ohlcv))
+
+
+def test_execute_many_small_batches_use_per_symbol_path() -> None:
+    """min_batch_size 未満のバッチはシンボルごとに計算されることを確認"""
+    calculator = IndicatorCalculatorUseCase(indicators=["ma:2"], min_batch_size=4)
+    calculator.execute_many([_ohlcv("A", 0, 100.0), _ohlcv("B", 0, 200.0)])
+    results = calculator.execute_many([_ohlcv("A", 1, 102.0), _ohlcv("B", 1, 204.0)])
+    assert results == [{"ma_2": 101.0}, {"ma_2": 202.0}]
+    assert calculator.execute_many([]) == []
@@ -0,0 +1,261 @@
+"""Integration test: Strategy checkpoint.
+
+チェックポイントの取得・復元とリプレイによるウォームリスタートの動作確認テスト
+"""
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.checkpoint import stream_id_key
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.main import StrategyPipeline
+from domain.market import OHLCVRingBuffer
+from shared.domain.models import OHLCV
+from tests.integration.helpers import BASE_TS, FakePublisher, build_pipeline, ticker_message
+
+
+def _prices() -> List[float]:
+    # 下落 → 上昇 → 下落でゴールデンクロスとデッドクロスを発生させる
+    return [200.0 - i for i in range(120)] + [80.0 + 2 * i for i in range(60)] + [200.0 - 3 * i for i in range(60)]
+
+
+def _messages() -> List[dict]:
+    """Redis Stream の ticker メッセージを 500ms 間隔で生成します。"""
+    return [ticker_message(BASE_TS + i * 500, price) for i, price in enumerate(_prices())]
+
+
+def _pipeline(publisher: FakePublisher, **kwargs) -> StrategyPipeline:
+    return build_pipeline(publisher, timeframes=["1s", "5s"], **kwargs)
+
+
+def test_ring_buffer_round_trip() -> None:
+    """リングバッファをバイナリにシリアライズして復元できること、容量を縮めると新しい方が残ることを確認"""
+    buffer = OHLCVRingBuffer(8)
+    for i in range(11):
+        buffer.append(float(i), i + 0.1, i + 0.2, i + 0.3, i + 0.4, i + 0.5)
+
+    restored = OHLCVRingBuffer.from_bytes(buffer.to_bytes())
+    assert restored.capacity == 8
+    np.testing.assert_array_equal(restored.close, buffer.close)
+    np.testing.assert_array_equal(restored.timestamp, buffer.timestamp)
+
+    smaller = OHLCVRingBuffer.from_bytes(buffer.to_bytes(), capacity=4)
+    np.testing.assert_array_equal(smaller.timestamp, [7.0, 8.0, 9.0, 10.0])
+    # 復元後の追加も時系列順のビューに反映される
+    smaller.append(11.0, 1, 1, 1, 1, 1)
+    np.testing.assert_array_equal(smaller.timestamp, [8.0, 9.0, 10.0, 11.0])
+
+    with pytest.raises(ValueError):
+        OHLCVRingBuffer.from_bytes(buffer.to_bytes()[:-1])
+
+
+def test_indicator_state_is_rebuilt_from_history() -> None:
+    """OHLCV履歴から再構築した指標が、元の指標と一致することを確認"""
+    original = IndicatorCalculatorUseCase()
+    for i in range(80):
+        price = Decimal(str(100 + (i % 7) - i * 0.1))
+        ohlcv = OHLCV(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            timeframe="1s",
+            timestamp=datetime.fromtimestamp(1732312345 + i),
+            open=price,
+            high=price,
+            low=price,
+            close=price,
+            volume=Decimal("1"),
+        )
+        original.execute(ohlcv)
+
+    restored = IndicatorCalculatorUseCase()
+    restored.restore_state(original.export_state())
+    next_bar = OHLCV(
+        exchange="gmo",
+        symbol="BTC_JPY",
+        timeframe="1s",
+        timestamp=datetime.fromtimestamp(1732312345 + 80),
+        open=Decimal("95"),
+        high=Decimal("95"),
+        low=Decimal("95"),
+        close=Decimal("95"),
+        volume=Decimal("1"),
+    )
+    expected = original.execute(next_bar)
+    actual = restored.execute(next_bar)
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-9), key
+
+
+@pytest.mark.asyncio
+async def test_restore_and_replay_matches_uninterrupted_run() -> None:
+    """チェックポイントの復元とリプレイの後に、停止しなかった場合と同じシグナルが配信されることを確認"""
+    messages = _messages()
+    checkpoint_at, crash_at = 130, 150
+
+    # 停止しなかった場合
+    reference_publisher = FakePublisher()
+    reference = _pipeline(reference_publisher)
+    await reference.start(report_interval=0)
+    for message in messages:
+        await reference.submit(message)
+    await reference.stop()
+
+    # checkpoint_at までを処理してチェックポイントを取得し、crash_at まで処理して停止する
+    first_publisher = FakePublisher()
+    first = _pipeline(first_publisher)
+    await first.start(report_interval=0)
+    for message in messages[:checkpoint_at]:
+        await first.submit(message)
+    checkpoint = await first.checkpoint()
+    for message in messages[checkpoint_at:crash_at]:
+        await first.submit(message)
+    await first.stop()
+    assert checkpoint.stream_ids == {"md:ticker": messages[checkpoint_at - 1]["id"]}
+    assert checkpoint.history and checkpoint.strategy and checkpoint.open_bars["1s"]
+
+    # 再起動: 復元 → チェックポイント以降の処理済みメッセージをリプレイ → 続きを処理
+    second_publisher = FakePublisher()
+    second = _pipeline(second_publisher)
+    second.restore(checkpoint)
+    for message in messages:
+        if stream_id_key(checkpoint.stream_ids["md:ticker"]) < stream_id_key(message["id"]) <= stream_id_key(
+            messages[crash_at - 1]["id"]
+        ):
+            await second.replay(message)
+    # リプレイではシグナルを配信しない
+    assert not second_publisher.published
+    await second.start(report_interval=0)
+    for message in messages[crash_at:]:
+        await second.submit(message)
+    await second.stop()
+
+    def actions(publisher: FakePublisher) -> List[tuple]:
+        return [(payload["timestamp"], payload["action"]) for _, payload in publisher.published]
+
+    assert second_publisher.published
+    assert actions(first_publisher) + actions(second_publisher) == actions(reference_publisher)
+
+
+@pytest.mark.asyncio
+async def test_replay_publishes_signals_of_pending_messages() -> None:
+    """停止前に配信済みで処理が完了していない（pending の）メッセージは、リプレイで状態に反映してシグナルを配信することを確認"""
+    messages = _messages()
+    checkpoint_at = 130
+
+    reference_publisher = FakePublisher()
+    reference = _pipeline(reference_publisher)
+    await reference.start(report_interval=0)
+    for message in messages:
+        await reference.submit(message)
+    await reference.stop()
+
+    # checkpoint_at 以降のメッセージは Consumer に配信された後、処理される前に停止した
+    first_publisher = FakePublisher()
+    first = _pipeline(first_publisher)
+    await first.start(report_interval=0)
+    for message in messages[:checkpoint_at]:
+        await first.submit(message)
+    checkpoint = await first.checkpoint()
+    await first.stop()
+
+    done: list = []
+    second_publisher = FakePublisher()
+    second = _pipeline(second_publisher, on_done=lambda message: done.append(message["id"]))
+    second.restore(checkpoint)
+    for message in messages[checkpoint_at:]:
+        await second.replay(message, publish=True)
+    assert not second_publisher.published
+    await second.start(report_interval=0)
+    await second.stop()
+
+    def actions(publisher: FakePublisher) -> List[tuple]:
+        return [(payload["timestamp"], payload["action"]) for _, payload in publisher.published]
+
+    assert second_publisher.published
+    assert actions(first_publisher) + actions(second_publisher) == actions(reference_publisher)
+    assert len(done) == len(second_publisher.published)
+
+
+def test_warm_up_from_recent_bars_enables_first_cross() -> None:
+    """データベースの直近のバーでウォームアップすると、最初のバーから指標がそろい、クロスでシグナルが出ることを確認"""
+    pipeline = _pipeline(FakePublisher())
+    base = datetime(2024, 11, 23, 12, 0, 0)
+
+    def bar(i: int, price: float, timeframe: str = "1s") -> OHLCV:
+        value = Decimal(str(price))
+        return OHLCV(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            timeframe=timeframe,
+            timestamp=datetime.fromtimestamp(base.timestamp() + i),
+            open=value,
+            high=value,
+            low=value,
+            close=value,
+            volume=Decimal("1"),
+        )
+
+    # 戦略の時間足以外のバーは読み込まない
+    history = [bar(i, 200.0 - i) for i in range(60)] + [bar(0, 1.0, timeframe="5s")]
+    assert pipeline.warm_up(history) == 1
+
+    calculator = pipeline.indicator_calculator
+    assert len(calculator.get_history("gmo", "BTC_JPY")) == 60
+    indicators = calculator.execute(bar(60, 300.0))
+    assert {"ma_5", "ma_20", "ma_50", "rsi"} <= indicators.keys()
+    # ウォームアップで前回のMA値が設定されているため、最初のライブのバーでクロスを判定できる
+    signal = pipeline.signal_generator.execute(bar(60, 300.0), indicators)
+    assert signal is not None and signal.action == "enter_long"
+
+
+@pytest.mark.asyncio
+async def test_state_is_kept_per_exchange() -> None:
+    """同じシンボルでも取引所ごとに指標・戦略の状態が分かれ、チェックポイントにも取引所ごとに保存されることを確認"""
+    messages = _messages()
+
+    reference_publisher = FakePublisher()
+    reference = _pipeline(reference_publisher)
+    await reference.start(report_interval=0)
+    for message in messages:
+        await reference.submit(message)
+    await reference.stop()
+
+    # 同じシンボルの別の取引所の ticker（逆向きの値動き）を交互に流す
+    publisher = FakePublisher()
+    pipeline = _pipeline(publisher)
+    await pipeline.start(report_interval=0)
+    others = [ticker_message(BASE_TS + i * 500, 400.0 - price, exchange="bitflyer") for i, price in enumerate(_prices())]
+    for message, other in zip(messages, others):
+        await pipeline.submit(message)
+        await pipeline.submit(other)
+    checkpoint = await pipeline.checkpoint()
+    await pipeline.stop()
+
+    def actions(publisher: FakePublisher, exchange: str) -> List[tuple]:
+        return [
+            (payload["timestamp"], payload["action"])
+            for _, payload in publisher.published
+            if payload["exchange"] == exchange
+        ]
+
+    assert actions(publisher, "gmo") == actions(reference_publisher, "gmo")
+    assert actions(publisher, "bitflyer")
+    assert set(checkpoint.history) == {"gmo", "bitflyer"}
+    assert set(checkpoint.strategy["default"]) == {"gmo", "bitflyer"}
+
+    restored = _pipeline(FakePublisher())
+    restored.restore(checkpoint)
+    assert restored.signal_generator.export_state() == checkpoint.strategy
+    assert len(restored.indicator_calculator.get_history("bitflyer", "BTC_JPY")) == len(
+        pipeline.indicator_calculator.get_history("bitflyer", "BTC_JPY")
+    )
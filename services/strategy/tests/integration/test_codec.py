@@ -0,0 +1,90 @@
+"""Integration test: Market-data wire codec.
+
+Stream フィールドの遅延デコードと data フィールドのコーデックの動作確認テスト
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+from infrastructure.redis.codec import StreamFields, decode_data
+
+
+def _raw_fields(data: bytes, **extra: str) -> dict:
+    """XREADGROUP が返すバイト列のフィールドをシミュレートします。"""
+    fields = {b"exchange": b"gmo", b"symbol": b"BTC_JPY", b"ts": b"1732312345000", b"data": data}
+    fields.update({key.encode(): value.encode() for key, value in extra.items()})
+    return fields
+
+
+class _CountingBytes(bytes):
+    """decode の呼び出し回数を数えるバイト列。"""
+
+    def __init__(self, value: bytes) -> None:
+        self.decodes = 0
+
+    def decode(self, *args, **kwargs) -> str:
+        self.decodes += 1
+        return super().decode(*args, **kwargs)
+
+
+def test_stream_fields_decode_lazily() -> None:
+    """アクセスしたフィールドだけが1回だけデコードされることを確認"""
+    raw = _raw_fields(_CountingBytes(b'{"last": 6123456}'))
+    raw[b"symbol"] = _CountingBytes(b"BTC_JPY")
+    fields = StreamFields(raw)
+
+    assert fields.get("symbol") == "BTC_JPY"
+    assert fields["symbol"] == "BTC_JPY"
+    assert raw[b"symbol"].decodes == 1
+    assert fields.get("missing", "") == ""
+    assert fields.raw("data") == b'{"last": 6123456}'
+    assert set(fields) == {"exchange", "symbol", "ts", "data"}
+    # data は文字列化されていない
+    assert raw[b"data"].decodes == 0
+
+
+def test_decode_data_json_from_bytes_and_str() -> None:
+    """JSON の data をバイト列・文字列のどちらからでもデコードできることを確認"""
+    assert decode_data(StreamFields(_raw_fields(b'{"last": 6123456}'))) == {"last": 6123456}
+    assert decode_data({"data": '{"price": 1.5}'}) == {"price": 1.5}
+    assert decode_data({"data": {"price": 1.5}}) == {"price": 1.5}
+    assert decode_data({}) == {}
+
+    with pytest.raises(ValueError):
+        decode_data(StreamFields(_raw_fields(b"{}", codec="unknown")))
+
+
+def test_decode_data_msgpack() -> None:
+    """codec=msgpack の data をデコードできることを確認"""
+    msgpack = pytest.importorskip("msgpack")
+    payload = msgpack.packb({"price": 6123456, "size": 0.01})
+
+    assert decode_data(StreamFields(_raw_fields(payload, codec="msgpack"))) == {
+        "price": 6123456,
+        "size": 0.01,
+    }
+
+
+def test_ohlcv_generator_parses_raw_stream_fields() -> None:
+    """OHLCV 生成がバイト列のフィールドとコーデックでメッセージをパースできることを確認"""
+    generator = OHLCVGeneratorUseCase(decode_data=decode_data)
+
+    parsed = generator.parse_message(
+        {"stream": "md:trade", "id": "1-0", "fields": StreamFields(_raw_fields(b'{"price": 100, "size": 2}'))}
+    )
+    assert parsed == {
+        "type": "trade",
+        "exchange": "gmo",
+        "symbol": "BTC_JPY",
+        "ts": 1732312345000,
+        "data": {"price": 100, "size": 2},
+    }
+
+    # Stream 名は完全一致で判定する
+    assert generator.parse_message({"stream": "md:ticker_v2", "id": "1-0", "fields": {}}) is None
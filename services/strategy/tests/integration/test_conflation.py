@@ -0,0 +1,96 @@
+"""Integration test: Ticker conflation.
+
+遅延時のティッカー間引きの動作確認テスト
+"""
+import json
+import sys
+from pathlib import Path
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.conflation import conflate_tickers
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+
+
+def _message(stream: str, symbol: str, ts: int, data: dict) -> dict:
+    """Redis Stream メッセージをシミュレートします。"""
+    return {
+        "stream": stream,
+        "id": f"{ts}-{symbol}",
+        "fields": {"exchange": "gmo", "symbol": symbol, "ts": str(ts), "data": json.dumps(data)},
+    }
+
+
+def test_conflate_tickers_keeps_first_and_last_per_bucket() -> None:
+    """同じシンボル・同じバケットのティッカーは最初と最後だけが残り、約定は残ることを確認"""
+    base = 1732312345000
+    batch = [
+        _message("md:ticker", "BTC_JPY", base, {"last": 100}),
+        _message("md:ticker", "ETH_JPY", base + 10, {"last": 10}),
+        _message("md:ticker", "BTC_JPY", base + 100, {"last": 105}),
+        _message("md:trade", "BTC_JPY", base + 150, {"price": 104, "size": 1}),
+        _message("md:ticker", "BTC_JPY", base + 200, {"last": 103}),
+        _message("md:ticker", "BTC_JPY", base + 900, {"last": 101}),
+        _message("md:ticker", "BTC_JPY", base + 1000, {"last": 102}),
+    ]
+
+    kept, superseded = conflate_tickers(batch, 1000)
+
+    assert [m["id"] for m in superseded] == [batch[2]["id"], batch[4]["id"]]
+    assert kept == [batch[0], batch[1], batch[3], batch[5], batch[6]]
+
+
+def test_conflate_tickers_keeps_exchanges_apart() -> None:
+    """同じシンボルでも取引所が異なるティッカーは、別のバケットとして間引くことを確認"""
+    base = 1732312345000
+    batch = [_message("md:ticker", "BTC_JPY", base + i * 100, {"last": 100 + i}) for i in range(3)]
+    for message in batch[1:]:
+        message["fields"]["exchange"] = "bitflyer"
+
+    kept, superseded = conflate_tickers(batch, 1000)
+
+    assert kept == batch
+    assert not superseded
+
+
+def test_conflate_tickers_tolerates_invalid_ts() -> None:
+    """ts が欠落・不正なティッカーがあっても例外を出さずに間引けることを確認"""
+    base = 1732312345000
+    broken = _message("md:ticker", "BTC_JPY", base, {"last": 100})
+    broken["fields"]["ts"] = "not-a-number"
+    missing = _message("md:ticker", "BTC_JPY", base + 100, {"last": 101})
+    del missing["fields"]["ts"]
+    batch = [broken, missing, _message("md:ticker", "BTC_JPY", base + 200, {"last": 102})]
+
+    kept, superseded = conflate_tickers(batch, 1000)
+
+    assert len(kept) + len(superseded) == len(batch)
+    assert kept[0] is broken and kept[-1] is batch[-1]
+
+
+def test_conflated_bars_keep_open_close_and_trade_volume() -> None:
+    """間引いた場合も、バーの始値・終値・約定の高値安値・出来高が保たれることを確認"""
+    base = 1732312345000
+    batch = [
+        _message("md:ticker", "BTC_JPY", base, {"last": 100}),
+        _message("md:ticker", "BTC_JPY", base + 100, {"last": 101}),
+        _message("md:trade", "BTC_JPY", base + 150, {"price": 108, "size": 0.5}),
+        _message("md:ticker", "BTC_JPY", base + 200, {"last": 102}),
+        _message("md:trade", "BTC_JPY", base + 250, {"price": 97, "size": 0.25}),
+        _message("md:ticker", "BTC_JPY", base + 900, {"last": 103}),
+        _message("md:ticker", "BTC_JPY", base + 1000, {"last": 104}),
+    ]
+
+    full = OHLCVGeneratorUseCase()
+    conflated = OHLCVGeneratorUseCase()
+    kept, superseded = conflate_tickers(batch, 1000)
+    assert len(superseded) == 2
+
+    full_bars = [bar for message in batch for bar in full.execute_all(message)]
+    conflated_bars = [bar for message in kept for bar in conflated.execute_all(message)]
+
+    assert len(full_bars) == len(conflated_bars) == 1
+    for field in ("timestamp", "open", "high", "low", "close", "volume"):
+        assert getattr(conflated_bars[0], field) == getattr(full_bars[0], field)
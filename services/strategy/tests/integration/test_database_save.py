@@ -121,6 +121,75 @@ async def test_ohlcv_save_duplicate(database):
         assert len(rows) == 1
 
 
+@pytest.mark.asyncio
+async def test_ohlcv_save_many(database):
+    """複数 OHLCV の一括保存をテストします（バッチ内・既存データとの重複は無視）。"""
+    repository = OhlcvRepository(database)
+
+    base = datetime(2024, 11, 23, 12, 0, 0)
+    bars = [
+        OHLCV(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            timeframe="1s",
+            timestamp=base.replace(second=i),
+            open=Decimal("5000000"),
+            high=Decimal("5010000"),
+            low=Decimal("4990000"),
+            close=Decimal(5000000 + i),
+            volume=Decimal("1.5"),
+        )
+        for i in range(5)
+    ]
+
+    # 1件目を先に保存し、バッチ内にも重複を含める
+    await repository.save(bars[0])
+    await repository.save_many(bars + [bars[1]])
+
+    async with database.get_session() as session:
+        result = await session.execute(
+            text("SELECT * FROM ohlcv WHERE exchange = :exchange AND symbol = :symbol ORDER BY timestamp"),
+            {"exchange": "gmo", "symbol": "BTC_JPY"},
+        )
+        rows = result.fetchall()
+        assert len(rows) == 5
+        assert [float(row.close) for row in rows] == [5000000.0 + i for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_fetch_recent(database):
+    """取引所・シンボル・時間足ごとの直近 N 本を1回のクエリで古い順に取得できることをテストします。"""
+    repository = OhlcvRepository(database)
+
+    base = datetime(2024, 11, 23, 12, 0, 0)
+    bars = [
+        OHLCV(
+            exchange=exchange,
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamp=base.replace(second=i),
+            open=Decimal("100"),
+            high=Decimal("101"),
+            low=Decimal("99"),
+            close=Decimal(100 + i) if exchange == "gmo" else Decimal(200 + i),
+            volume=Decimal("1"),
+        )
+        for exchange in ("gmo", "bitflyer")
+        for symbol in ("BTC_JPY", "ETH_JPY", "XRP_JPY")
+        for timeframe in ("1s", "1m")
+        for i in range(10)
+    ]
+    await repository.save_many(bars)
+
+    recent = await repository.fetch_recent([("gmo", "BTC_JPY"), ("gmo", "ETH_JPY")], ["1s"], limit=3)
+
+    # 同じシンボルの別の取引所のバーは含まない
+    assert [(ohlcv.exchange, ohlcv.symbol, ohlcv.timeframe) for ohlcv in recent] == [("gmo", "BTC_JPY", "1s")] * 3 + [
+        ("gmo", "ETH_JPY", "1s")
+    ] * 3
+    assert [ohlcv.close for ohlcv in recent] == [Decimal(107), Decimal(108), Decimal(109)] * 2
+
+
 @pytest.mark.asyncio
 async def test_signal_save(database):
     """Signal の保存をテストします。"""
@@ -0,0 +1,135 @@
+"""Integration test: Batch decide API.
+
+同時に確定した複数シンボルを戦略の decide_batch でまとめて判断する動作確認テスト
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.interfaces.strategy import BatchStrategy
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
+from infrastructure.strategies.base import BaseStrategy
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from shared.domain.models import OHLCV, Signal
+
+
+class _ThresholdStrategy(BaseStrategy):
+    """decide だけを実装した戦略（終値がしきい値を超えたら enter_long）。"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def decide(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
+        self.calls += 1
+        if ohlcv.close <= Decimal("105"):
+            return None
+        return Signal(
+            exchange=ohlcv.exchange,
+            symbol=ohlcv.symbol,
+            strategy="threshold",
+            action="enter_long",
+            confidence=Decimal("0.6"),
+            price_ref=ohlcv.close,
+            timestamp=ohlcv.timestamp,
+        )
+
+
+def _ohlcv(symbol: str, i: int, price: float) -> OHLCV:
+    return OHLCV(
+        exchange="gmo",
+        symbol=symbol,
+        timeframe="1s",
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=i),
+        open=Decimal(str(price)),
+        high=Decimal(str(price)),
+        low=Decimal(str(price)),
+        close=Decimal(str(price)),
+        volume=Decimal("1.0"),
+    )
+
+
+def _bars(num_symbols: int, num_bars: int) -> List[List[OHLCV]]:
+    rng = np.random.default_rng(11)
+    prices = np.round(100.0 + np.cumsum(rng.normal(0, 1, (num_symbols, num_bars)), axis=1), 2)
+    return [[_ohlcv(f"SYM{row}", i, prices[row, i]) for row in range(num_symbols)] for i in range(num_bars)]
+
+
+def _summary(signals: List[Signal]) -> List[tuple]:
+    return [
+        (s.symbol, s.strategy, s.action, s.confidence, s.meta.get("fast_ma") if s.meta else None) for s in signals
+    ]
+
+
+def test_decide_batch_matches_per_bar_decide() -> None:
+    """MovingAverageCrossStrategy の decide_batch が decide と同じシグナルを生成することを確認"""
+    calculator = IndicatorCalculatorUseCase(indicators=["ma:3", "ma:8"])
+    batched = SignalGeneratorUseCase(MovingAverageCrossStrategy(fast_window=3, slow_window=8), min_batch_size=2)
+    single = SignalGeneratorUseCase(MovingAverageCrossStrategy(fast_window=3, slow_window=8))
+
+    total = 0
+    for ohlcvs in _bars(20, 80):
+        indicators = calculator.execute_many(ohlcvs)
+        results = batched.execute_batch(ohlcvs, indicators)
+        for ohlcv, values, signals in zip(ohlcvs, indicators, results):
+            expected = single.execute_all(ohlcv, values)
+            assert _summary(signals) == _summary(expected)
+            total += len(signals)
+
+    assert total > 0
+    assert batched.export_state() == single.export_state()
+
+
+def test_decide_batch_falls_back_to_decide_and_keeps_instance_order() -> None:
+    """decide_batch を実装していない戦略はバーごとに decide が呼ばれ、シグナルはインスタンスの順に並ぶことを確認"""
+    threshold = _ThresholdStrategy()
+    generator = SignalGeneratorUseCase(
+        strategies={"threshold": threshold, "ma": MovingAverageCrossStrategy(fast_window=3, slow_window=8)},
+        min_batch_size=2,
+    )
+    calculator = IndicatorCalculatorUseCase(indicators=generator.required_indicators())
+
+    bars = _bars(6, 60)
+    for ohlcvs in bars:
+        for ohlcv, signals in zip(ohlcvs, generator.execute_batch(ohlcvs, calculator.execute_many(ohlcvs))):
+            strategies = [signal.strategy for signal in signals]
+            assert strategies == sorted(strategies, key=["threshold", "ma"].index)
+            assert ("threshold" in strategies) == (ohlcv.close > Decimal("105"))
+
+    assert threshold.calls == 6 * 60
+
+
+def test_execute_batch_with_repeated_symbols() -> None:
+    """同じシンボルの複数のバーを1回で渡しても、バーの順に判断されることを確認"""
+    calculator = IndicatorCalculatorUseCase(indicators=["ma:2", "ma:4"])
+    batched = SignalGeneratorUseCase(MovingAverageCrossStrategy(fast_window=2, slow_window=4), min_batch_size=1)
+    single = SignalGeneratorUseCase(MovingAverageCrossStrategy(fast_window=2, slow_window=4))
+
+    prices = [10.0, 9.0, 8.0, 7.0, 6.0, 9.0, 12.0, 15.0, 11.0, 7.0, 3.0]
+    ohlcvs = [_ohlcv("BTC_JPY", i, price) for i, price in enumerate(prices)]
+    indicators = [calculator.execute(ohlcv) for ohlcv in ohlcvs]
+
+    results = batched.execute_batch(ohlcvs, indicators)
+    expected = [single.execute_all(ohlcv, values) for ohlcv, values in zip(ohlcvs, indicators)]
+    assert [_summary(signals) for signals in results] == [_summary(signals) for signals in expected]
+    assert [s.action for signals in results for s in signals] == ["enter_long", "exit"]
+
+
+def test_batch_strategy_requires_make_signal() -> None:
+    """decide_batch だけを実装した BatchStrategy はインスタンス化できないことを確認"""
+
+    class _Incomplete(BaseStrategy, BatchStrategy):
+        def decide_batch(self, symbols, closes, indicators):
+            return np.full(len(symbols), "", dtype=object), np.full(len(symbols), 0.5)
+
+    with pytest.raises(TypeError):
+        _Incomplete()
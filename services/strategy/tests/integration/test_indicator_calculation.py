@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
 # shared/ を PYTHONPATH に追加
@@ -68,3 +70,65 @@ def test_indicator_calculation_insufficient_data() -> None:
     indicators = calculator.execute(ohlcv)
     assert indicators == {}
 
+
+
+def _reference_indicators(closes: list) -> dict:
+    """従来の pandas 実装（DataFrame を毎回再構築）で指標を計算します。"""
+    close = pd.Series(closes[-200:])
+    result = {}
+    for window in (5, 20, 50):
+        if len(close) >= window:
+            result[f"ma_{window}"] = float(close.rolling(window=window).mean().iloc[-1])
+    if len(close) >= 15:
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi = 100 - (100 / (1 + gain / loss))
+        if not pd.isna(rsi.iloc[-1]):
+            result["rsi"] = float(rsi.iloc[-1])
+    if len(close) >= 20:
+        middle = close.rolling(window=20).mean().iloc[-1]
+        std = close.rolling(window=20).std().iloc[-1]
+        result["bb_middle"] = float(middle)
+        result["bb_upper"] = float(middle + 2 * std)
+        result["bb_lower"] = float(middle - 2 * std)
+    if len(close) >= 35:
+        macd_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal_line = macd_line.ewm(span=9, adjust=False).mean()
+        result["macd"] = float(macd_line.iloc[-1])
+        result["macd_signal"] = float(signal_line.iloc[-1])
+        result["macd_hist"] = float(macd_line.iloc[-1] - signal_line.iloc[-1])
+    return result
+
+
+def test_incremental_indicators_match_pandas() -> None:
+    """インクリメンタル計算が従来の pandas 実装と同じ値を返すことを確認"""
+    calculator = IndicatorCalculatorUseCase()
+    rng = np.random.default_rng(42)
+    prices = 100.0 + np.cumsum(rng.normal(0, 1, 300))
+    # 値動きのない区間（RSI の 0/0、標準偏差 0）も含める
+    prices[100:130] = prices[99]
+
+    base_time = datetime.now()
+    closes = []
+    for i, price in enumerate(prices):
+        price = round(float(price), 4)
+        closes.append(price)
+        ohlcv = OHLCV(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            timeframe="1s",
+            timestamp=base_time + timedelta(seconds=i),
+            open=Decimal(str(price)),
+            high=Decimal(str(price)),
+            low=Decimal(str(price)),
+            close=Decimal(str(price)),
+            volume=Decimal("1.0"),
+        )
+        indicators = calculator.execute(ohlcv)
+        expected = _reference_indicators(closes)
+
+        assert list(indicators.keys()) == list(expected.keys())
+        for key, value in expected.items():
+            # pandas の rolling std は値動きのない区間で 1e-6 程度の誤差を残すため abs で許容する
+            assert indicators[key] == pytest.approx(value, rel=1e-9, abs=1e-5), (i, key)
@@ -0,0 +1,112 @@
+"""Integration test: Declarative indicator graph.
+
+戦略が宣言した指標だけを共有ノードのグラフで計算する動作確認テスト
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
+from domain.indicators import DEFAULT_INDICATORS, IndicatorEngine, IndicatorSpec, parse_indicators
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from shared.domain.models import OHLCV
+
+
+def _ohlcv(i: int, price: float) -> OHLCV:
+    return OHLCV(
+        exchange="gmo",
+        symbol="BTC_JPY",
+        timeframe="1s",
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=i),
+        open=Decimal(str(price)),
+        high=Decimal(str(price)),
+        low=Decimal(str(price)),
+        close=Decimal(str(price)),
+        volume=Decimal("1.0"),
+    )
+
+
+def test_parse_indicator_specs() -> None:
+    """指標の宣言をパースし、デフォルトのパラメータと出力名を補完することを確認"""
+    assert IndicatorSpec.parse("ma:7").outputs == ("ma_7",)
+    assert IndicatorSpec.parse("rsi").outputs == ("rsi",)
+    assert IndicatorSpec.parse("rsi:7").outputs == ("rsi_7",)
+    assert IndicatorSpec.parse("bb").params == (20, 2)
+    assert IndicatorSpec.parse("bb:10:1.5").outputs == ("bb_middle_10_1.5", "bb_upper_10_1.5", "bb_lower_10_1.5")
+    assert IndicatorSpec.parse("macd").outputs == ("macd", "macd_signal", "macd_hist")
+    assert str(IndicatorSpec.parse(" ema : 12 ")) == "ema:12"
+
+    # 重複は除かれ、宣言がない場合は従来の指標一式
+    assert [str(spec) for spec in parse_indicators(["ma:7", "ma:7.0", "ma:20"])] == ["ma:7", "ma:20"]
+    assert parse_indicators(None) == parse_indicators(DEFAULT_INDICATORS)
+
+
+@pytest.mark.parametrize("value", ["sma:5", "ma", "ma:0", "ma:2.5", "ma:5:1", "bb:20:0", "macd:26:12", "ma:x"])
+def test_parse_invalid_indicator_specs(value: str) -> None:
+    """不正な宣言は ValueError になることを確認"""
+    with pytest.raises(ValueError):
+        IndicatorSpec.parse(value)
+
+
+def test_engine_shares_nodes() -> None:
+    """同じ期間の MA とボリンジャーバンド、EMA と MACD がノードを共有することを確認"""
+    # ma:20 と bb:20:2 → RollingStats(20) を1つ、ema:12 と macd → EMA(12), EMA(26) とシグナル線
+    engine = IndicatorEngine(["ma:20", "bb:20:2", "ema:12", "macd:12:26:9"])
+    assert engine.node_count == 4
+
+    # 戦略が必要な2本だけを宣言した場合は、2つのノードだけを更新する
+    assert IndicatorEngine(["ma:7", "ma:20"]).node_count == 2
+    assert IndicatorEngine(["ma:7", "ma:20"]).required_history == 21
+
+
+def test_engine_matches_pandas_for_declared_indicators() -> None:
+    """宣言した任意の期間の指標が pandas の計算結果と一致することを確認"""
+    rng = np.random.default_rng(7)
+    closes = list(100.0 + np.cumsum(rng.normal(0, 1, 120)))
+    engine = IndicatorEngine(["ma:7", "ema:12", "bb:20:2", "macd:12:26:9"])
+    history = []
+    for close in closes:
+        history.append(close)
+        indicators = engine.update(history)
+
+    series = pd.Series(closes)
+    assert list(indicators) == [
+        "ma_7", "ema_12", "bb_middle", "bb_upper", "bb_lower", "macd", "macd_signal", "macd_hist",
+    ]
+    assert indicators["ma_7"] == pytest.approx(series.tail(7).mean())
+    assert indicators["ema_12"] == pytest.approx(series.ewm(span=12, adjust=False).mean().iloc[-1])
+    assert indicators["bb_upper"] == pytest.approx(series.tail(20).mean() + 2 * series.tail(20).std())
+    macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    assert indicators["macd"] == pytest.approx(macd.iloc[-1])
+    assert indicators["macd_signal"] == pytest.approx(macd.ewm(span=9, adjust=False).mean().iloc[-1])
+
+
+def test_strategy_declared_indicators_drive_calculation() -> None:
+    """戦略の required_indicators で宣言した期間の MA だけが計算され、シグナルが生成されることを確認"""
+    strategy = MovingAverageCrossStrategy(fast_window=7, slow_window=30)
+    calculator = IndicatorCalculatorUseCase(indicators=strategy.required_indicators())
+    signal_generator = SignalGeneratorUseCase(strategy)
+
+    # 下落のあとに上昇 → ゴールデンクロス
+    prices = [100.0 - i for i in range(40)] + [60.0 + 3 * i for i in range(30)]
+    signals = []
+    for i, price in enumerate(prices):
+        indicators = calculator.execute(_ohlcv(i, price))
+        if indicators:
+            assert set(indicators) <= {"ma_7", "ma_30"}
+        signal = signal_generator.execute(_ohlcv(i, price), indicators)
+        if signal:
+            signals.append(signal)
+
+    assert calculator.history_capacity >= 31
+    assert [signal.action for signal in signals] == ["enter_long"]
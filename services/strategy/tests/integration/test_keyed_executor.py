@@ -0,0 +1,85 @@
+"""Integration test: Keyed concurrent execution.
+
+シンボル単位で順序を保つ並行実行の動作確認テスト
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.keyed_executor import KeyedExecutor
+
+
+@pytest.mark.asyncio
+async def test_keyed_executor_orders_per_key_and_runs_keys_concurrently() -> None:
+    """同じキーは投入順に、異なるキーは並行に実行されることを確認"""
+    executor = KeyedExecutor(max_in_flight=10)
+    events = []
+    slow_started = asyncio.Event()
+    release_slow = asyncio.Event()
+
+    async def slow(index: int) -> None:
+        slow_started.set()
+        await release_slow.wait()
+        events.append(("BTC_JPY", index))
+
+    async def fast(key: str, index: int) -> None:
+        events.append((key, index))
+
+    await executor.submit("BTC_JPY", lambda: slow(0))
+    await executor.submit("BTC_JPY", lambda: fast("BTC_JPY", 1))
+    await executor.submit("ETH_JPY", lambda: fast("ETH_JPY", 0))
+    await slow_started.wait()
+    await asyncio.sleep(0)
+
+    # BTC_JPY の遅い処理を待たずに ETH_JPY が完了し、BTC_JPY の2件目は待たされている
+    assert events == [("ETH_JPY", 0)]
+
+    release_slow.set()
+    await executor.join()
+    assert events == [("ETH_JPY", 0), ("BTC_JPY", 0), ("BTC_JPY", 1)]
+    assert executor.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_keyed_executor_bounds_in_flight_tasks() -> None:
+    """実行中のタスク数が上限に達すると submit が待機することを確認"""
+    executor = KeyedExecutor(max_in_flight=2)
+    release = asyncio.Event()
+
+    async def blocked() -> None:
+        await release.wait()
+
+    await executor.submit("A", blocked)
+    await executor.submit("B", blocked)
+
+    third = asyncio.create_task(executor.submit("C", blocked))
+    await asyncio.sleep(0.01)
+    assert not third.done()
+
+    release.set()
+    await third
+    await executor.join()
+
+
+@pytest.mark.asyncio
+async def test_keyed_executor_continues_after_failure() -> None:
+    """前のタスクが失敗しても同じキーの次のタスクが実行されることを確認"""
+    executor = KeyedExecutor()
+    results = []
+
+    async def fail() -> None:
+        raise RuntimeError("boom")
+
+    async def succeed() -> None:
+        results.append("ok")
+
+    await executor.submit("BTC_JPY", fail)
+    await executor.submit("BTC_JPY", succeed)
+    await executor.join()
+    assert results == ["ok"]
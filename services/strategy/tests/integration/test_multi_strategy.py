@@ -0,0 +1,85 @@
+"""Integration test: Multiple strategy instances in one worker.
+
+1つのワーカーで複数の戦略インスタンスが共通の指標を共有してシグナルを生成する動作確認テスト
+"""
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.signal_generator import SignalGeneratorUseCase
+from infrastructure.strategies.base import BaseStrategy
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from shared.domain.models import OHLCV, Signal
+from tests.integration.helpers import BASE_TS, FakePublisher, build_pipeline, ticker_message
+
+
+class _FailingStrategy(BaseStrategy):
+    """判断のたびに例外を送出する戦略。"""
+
+    def decide(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
+        raise RuntimeError("boom")
+
+
+def _instances() -> Dict[str, MovingAverageCrossStrategy]:
+    return {
+        "ma_5_20": MovingAverageCrossStrategy(fast_window=5, slow_window=20),
+        "ma_10_30": MovingAverageCrossStrategy(fast_window=10, slow_window=30),
+    }
+
+
+def test_required_indicators_are_the_union_of_instances() -> None:
+    """各インスタンスが宣言した指標の和集合を1回だけ計算することを確認"""
+    generator = SignalGeneratorUseCase(strategies=_instances())
+    calculator = IndicatorCalculatorUseCase(indicators=generator.required_indicators())
+    assert [str(spec) for spec in calculator.indicators] == ["ma:5", "ma:20", "ma:10", "ma:30"]
+
+
+def test_instances_must_share_timeframe() -> None:
+    """時間足が異なるインスタンスの組み合わせは ValueError になることを確認"""
+    with pytest.raises(ValueError):
+        SignalGeneratorUseCase(
+            strategies={
+                "fast": MovingAverageCrossStrategy(timeframe="1s"),
+                "slow": MovingAverageCrossStrategy(timeframe="1m"),
+            }
+        )
+    with pytest.raises(ValueError):
+        SignalGeneratorUseCase()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fans_out_bars_to_every_instance() -> None:
+    """1回の集約・指標計算の結果で各インスタンスが判断し、シグナルがインスタンスごとに区別されることを確認"""
+    publisher = FakePublisher()
+    done: list = []
+    pipeline = build_pipeline(publisher, strategies={**_instances(), "broken": _FailingStrategy()}, done=done)
+    generator = pipeline.signal_generator
+    await pipeline.start(report_interval=0)
+
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(30)]
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+    for message in messages:
+        await pipeline.submit(message)
+    await pipeline.stop()
+
+    # 失敗するインスタンスがあっても、他のインスタンスのシグナルは配信され、メッセージは完了する
+    assert len(done) == len(messages)
+    payloads = [payload for _, payload in publisher.published]
+    assert [payload["strategy"] for payload in payloads] == ["ma_5_20", "ma_10_30"]
+    assert all(payload["action"] == "enter_long" for payload in payloads)
+    assert payloads[0]["meta"]["strategy_name"] == "moving_average_cross"
+    assert payloads[1]["meta"]["fast_window"] == 10
+
+    # 戦略の状態はインスタンスごとにチェックポイントされる
+    state = generator.export_state()
+    assert set(state) == {"ma_5_20", "ma_10_30", "broken"}
+    restored = SignalGeneratorUseCase(strategies=_instances())
+    restored.restore_state(state)
+    assert restored.export_state()["ma_10_30"] == state["ma_10_30"]
@@ -0,0 +1,46 @@
+"""Integration test: OHLCV ring buffer.
+
+ローソク足履歴リングバッファの動作確認テスト
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from domain.market import OHLCVRingBuffer
+
+
+def _append(buffer: OHLCVRingBuffer, i: int) -> None:
+    buffer.append(float(i), i + 0.1, i + 0.5, i - 0.5, float(i), 1.0)
+
+
+def test_ring_buffer_keeps_latest_in_order() -> None:
+    """容量を超えると古い順に上書きされ、ビューは古い順に並ぶことを確認"""
+    buffer = OHLCVRingBuffer(capacity=5)
+
+    for i in range(3):
+        _append(buffer, i)
+    assert len(buffer) == 3
+    np.testing.assert_array_equal(buffer.close, [0.0, 1.0, 2.0])
+
+    for i in range(3, 12):
+        _append(buffer, i)
+    assert len(buffer) == 5
+    np.testing.assert_array_equal(buffer.close, [7.0, 8.0, 9.0, 10.0, 11.0])
+    np.testing.assert_array_equal(buffer.timestamp, [7.0, 8.0, 9.0, 10.0, 11.0])
+    assert buffer.high[-1] == 11.5
+
+
+def test_ring_buffer_view_is_zero_copy() -> None:
+    """ビューが内部配列を共有し、書き込みできないことを確認"""
+    buffer = OHLCVRingBuffer(capacity=4)
+    for i in range(6):
+        _append(buffer, i)
+
+    view = buffer.close
+    assert view.base is not None
+    assert not view.flags.writeable
@@ -14,63 +14,75 @@ import pytest
 shared_path = Path(__file__).parent.parent.parent.parent / "shared"
 sys.path.insert(0, str(shared_path))
 
+from application.services.message_time import message_ts
 from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
 from shared.domain.models import OHLCV
 
 
-def test_ohlcv_generation_from_ticker() -> None:
-    """ticker データから OHLCV を生成できることを確認"""
-    generator = OHLCVGeneratorUseCase()
-
-    # ticker メッセージをシミュレート
-    message = {
-        "stream": "md:ticker",
-        "id": "1234567890-0",
+def _message(stream: str, ts: int, data: dict) -> dict:
+    """Redis Stream メッセージをシミュレートします。"""
+    return {
+        "stream": stream,
+        "id": f"{ts}-0",
         "fields": {
             "exchange": "gmo",
             "symbol": "BTC_JPY",
-            "ts": "1732312345000",
-            "data": json.dumps({"last": 6123456, "volume": 1.5}),
+            "ts": str(ts),
+            "data": json.dumps(data),
         },
     }
 
-    # OHLCV を生成
-    ohlcv = generator.execute(message)
+
+def test_ohlcv_generation_from_ticker() -> None:
+    """ticker データから OHLCV を生成できることを確認"""
+    generator = OHLCVGeneratorUseCase()
+
+    # 同じ1秒間の ticker ではバーは確定しない
+    assert generator.execute(_message("md:ticker", 1732312345000, {"last": 6123456, "volume": 1.5})) is None
+    assert generator.execute(_message("md:ticker", 1732312345400, {"last": 6123500, "volume": 1.6})) is None
+    assert generator.execute(_message("md:ticker", 1732312345900, {"last": 6123400, "volume": 1.7})) is None
+
+    # 次の1秒の ticker で前のバーが確定する
+    ohlcv = generator.execute(_message("md:ticker", 1732312346100, {"last": 6123000, "volume": 1.8}))
 
     # 結果を検証
     assert ohlcv is not None
     assert ohlcv.exchange == "gmo"
     assert ohlcv.symbol == "BTC_JPY"
     assert ohlcv.timeframe == "1s"
-    assert ohlcv.close == Decimal("6123456")
-    assert ohlcv.volume == Decimal("1.5")
+    assert ohlcv.timestamp == datetime.fromtimestamp(1732312345)
+    assert ohlcv.open == Decimal("6123456")
+    assert ohlcv.high == Decimal("6123500")
+    assert ohlcv.low == Decimal("6123400")
+    assert ohlcv.close == Decimal("6123400")
+    # ticker の volume は24時間出来高のため、バーの出来高には加算されない
+    assert ohlcv.volume == Decimal("0")
 
 
 def test_ohlcv_generation_from_trade() -> None:
     """trade データから OHLCV を生成できることを確認"""
     generator = OHLCVGeneratorUseCase()
 
-    # trade メッセージをシミュレート
-    message = {
-        "stream": "md:trade",
-        "id": "1234567890-0",
-        "fields": {
-            "exchange": "gmo",
-            "symbol": "BTC_JPY",
-            "ts": "1732312345000",
-            "data": json.dumps({"price": 6123456, "size": 0.01, "side": "buy"}),
-        },
-    }
+    trades = [
+        (1732312345000, 6123456, 0.01),
+        (1732312345200, 6124000, 0.02),
+        (1732312345700, 6122000, 0.03),
+    ]
+    for ts, price, size in trades:
+        assert generator.execute(_message("md:trade", ts, {"price": price, "size": size, "side": "buy"})) is None
 
-    # OHLCV を生成
-    ohlcv = generator.execute(message)
+    # 次の1秒の trade で前のバーが確定する
+    ohlcv = generator.execute(_message("md:trade", 1732312346000, {"price": 6123000, "size": 0.5, "side": "sell"}))
 
     # 結果を検証
     assert ohlcv is not None
     assert ohlcv.exchange == "gmo"
     assert ohlcv.symbol == "BTC_JPY"
-    assert ohlcv.close == Decimal("6123456")
-    assert ohlcv.volume == Decimal("0.01")
+    assert ohlcv.open == Decimal("6123456")
+    assert ohlcv.high == Decimal("6124000")
+    assert ohlcv.low == Decimal("6122000")
+    assert ohlcv.close == Decimal("6122000")
+    assert ohlcv.volume == Decimal("0.06")
 
 
 def test_ohlcv_generation_invalid_message() -> None:
@@ -88,3 +100,111 @@ def test_ohlcv_generation_invalid_message() -> None:
     ohlcv = generator.execute(message)
     assert ohlcv is None
 
+
+def test_message_ts_tolerates_invalid_ts() -> None:
+    """ts が欠落・不正なメッセージでも並べ替えのキーを返すことを確認"""
+    valid = _message("md:ticker", 1732312345000, {"last": 1})
+    missing = {"stream": "md:ticker", "id": "1732312344000-0", "fields": {}}
+    invalid = {"stream": "md:ticker", "id": "broken", "fields": {"ts": "abc"}}
+
+    assert message_ts(valid) == 1732312345000
+    assert message_ts(missing) == 1732312344000
+    assert message_ts(invalid) == 0
+    assert sorted([valid, missing, invalid], key=message_ts) == [invalid, missing, valid]
+
+
+def test_ohlcv_generation_skips_messages_without_ts() -> None:
+    """ts が欠落・不正なメッセージは 1970-01-01 のティックとして集約されないことを確認"""
+    generator = OHLCVGeneratorUseCase()
+
+    missing = _message("md:trade", 1732312345000, {"price": 1, "size": 5.0})
+    del missing["fields"]["ts"]
+    invalid = _message("md:trade", 1732312345000, {"price": 1, "size": 5.0})
+    invalid["fields"]["ts"] = "abc"
+    assert generator.parse_message(missing) is None
+    assert generator.parse_message(invalid) is None
+
+    assert generator.execute(missing) is None
+    assert generator.execute(_message("md:trade", 1732312345000, {"price": 100, "size": 1.0})) is None
+    assert generator.execute(invalid) is None
+
+    ohlcv = generator.execute(_message("md:trade", 1732312346000, {"price": 101, "size": 1.0}))
+    assert ohlcv is not None
+    assert ohlcv.timestamp == datetime.fromtimestamp(1732312345)
+    assert ohlcv.low == Decimal("100")
+    assert ohlcv.volume == Decimal("1.0")
+
+
+def test_ohlcv_generation_drops_late_ticks() -> None:
+    """確定済みのバケットに遅れて届いたティックは未確定バーの出来高に加算されないことを確認"""
+    generator = OHLCVGeneratorUseCase()
+
+    assert generator.execute(_message("md:trade", 1732312345000, {"price": 100, "size": 1.0})) is None
+    assert generator.execute(_message("md:trade", 1732312346000, {"price": 101, "size": 1.0})) is not None
+    # 確定済みの 1732312345 のバケットに属する trade
+    assert generator.execute(_message("md:trade", 1732312345900, {"price": 99, "size": 7.0})) is None
+
+    ohlcv = generator.execute(_message("md:trade", 1732312347000, {"price": 102, "size": 1.0}))
+    assert ohlcv is not None
+    assert ohlcv.timestamp == datetime.fromtimestamp(1732312346)
+    assert ohlcv.low == Decimal("101")
+    assert ohlcv.volume == Decimal("1.0")
+
+
+def test_ohlcv_generation_multi_timeframe_rollup() -> None:
+    """確定した1秒足から1分足・5分足が段階的に集約されることを確認"""
+    generator = OHLCVGeneratorUseCase(timeframes=["5m", "1s", "1m"])
+
+    base_ts = 1732312320000  # 分の境界
+    bars = []
+    # 2分間、1秒ごとに trade を送る（価格は秒数、出来高は 1.0）
+    for second in range(120):
+        message = _message("md:trade", base_ts + second * 1000 + 500, {"price": 100 + second, "size": 1.0})
+        bars.extend(generator.execute_all(message))
+    # 次の trade で最後の1秒足が確定し、その1秒足で2本目の1分足も確定する
+    bars.extend(generator.execute_all(_message("md:trade", base_ts + 120_500, {"price": 1, "size": 1.0})))
+
+    minute_bars = [bar for bar in bars if bar.timeframe == "1m"]
+    assert len([bar for bar in bars if bar.timeframe == "1s"]) == 120
+    assert len(minute_bars) == 2
+    assert not [bar for bar in bars if bar.timeframe == "5m"]
+
+    first = minute_bars[0]
+    assert first.timestamp == datetime.fromtimestamp(base_ts / 1000)
+    assert first.open == Decimal("100")
+    assert first.high == Decimal("159")
+    assert first.low == Decimal("100")
+    assert first.close == Decimal("159")
+    assert first.volume == Decimal("60.0")
+
+    # 1分足は、その分の最後の1秒足と同じメッセージで確定する（次の分のティックを待たない）
+    first_index = bars.index(first)
+    assert bars[first_index - 1].timeframe == "1s"
+    assert bars[first_index - 1].timestamp == datetime.fromtimestamp((base_ts + 59_000) / 1000)
+
+
+def test_ohlcv_generation_keeps_exchanges_apart() -> None:
+    """同じシンボルでも取引所ごとに別のバーが集約されることを確認"""
+    generator = OHLCVGeneratorUseCase()
+
+    other = _message("md:trade", 1732312345500, {"price": 200, "size": 2.0})
+    other["fields"]["exchange"] = "bitflyer"
+    assert generator.execute(_message("md:trade", 1732312345000, {"price": 100, "size": 1.0})) is None
+    assert generator.execute(other) is None
+
+    state = generator.export_state()
+    assert set(state["1s"]) == {"gmo", "bitflyer"}
+    restored = OHLCVGeneratorUseCase()
+    restored.restore_state(json.loads(json.dumps(state)))
+
+    ohlcv = restored.execute(_message("md:trade", 1732312346000, {"price": 101, "size": 1.0}))
+    assert ohlcv is not None
+    assert ohlcv.exchange == "gmo"
+    assert ohlcv.high == Decimal("100")
+    assert ohlcv.volume == Decimal("1.0")
+
+
+def test_ohlcv_generation_rejects_non_divisible_timeframes() -> None:
+    """上位の時間足が下位の時間足で割り切れない場合はエラーになることを確認"""
+    with pytest.raises(ValueError):
+        OHLCVGeneratorUseCase(timeframes=["1s", "7s", "1m"])
@@ -0,0 +1,125 @@
+"""Integration test: L2 order book.
+
+板情報（スナップショット・差分更新・特徴量）の動作確認テスト
+"""
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+from domain.market import OrderBook, OrderBookStore
+from shared.domain.models import OHLCV
+
+
+def test_order_book_snapshot_and_updates() -> None:
+    """スナップショットと差分更新で最良気配・板厚が更新されることを確認"""
+    book = OrderBook()
+    # GMO の形式（最良気配から順）
+    book.apply_snapshot(
+        bids=[[100.0, 1.0], [99.0, 2.0], [98.0, 3.0]],
+        asks=[{"price": "101", "size": "0.5"}, {"price": "102", "size": "1.5"}],
+    )
+    assert book.best_bid == 100.0
+    assert book.best_ask == 101.0
+
+    # 最良気配より内側に買い注文、最良売り気配の約定（数量 0 で削除）
+    book.apply_update(bids=[[100.5, 0.2]], asks=[[101.0, 0]])
+    assert book.best_bid == 100.5
+    assert book.best_ask == 102.0
+
+    # 既存レベルの数量変更と存在しないレベルの削除
+    book.apply_update(bids=[[99.0, 5.0], [97.0, 0]])
+
+    features = book.features(depth=2)
+    assert features["spread"] == pytest.approx(1.5)
+    assert features["mid_price"] == pytest.approx(101.25)
+    assert features["bid_depth"] == pytest.approx(1.2)  # 100.5 + 100
+    assert features["ask_depth"] == pytest.approx(1.5)
+    assert features["book_imbalance"] == pytest.approx((1.2 - 1.5) / 2.7)
+    assert book.bids.depth(10) == pytest.approx(0.2 + 1.0 + 5.0 + 3.0)
+
+
+def test_order_book_snapshot_unsorted_input() -> None:
+    """並び順が崩れたスナップショットでも正しく整列されることを確認"""
+    book = OrderBook()
+    book.apply_snapshot(bids=[[98.0, 1.0], [100.0, 1.0], [99.0, 1.0]], asks=[[103.0, 1.0], [101.0, 1.0]])
+
+    assert book.best_bid == 100.0
+    assert book.best_ask == 101.0
+    assert book.bids.keys == [98.0, 99.0, 100.0]
+
+
+def test_order_book_features_merged_into_indicators() -> None:
+    """md:orderbook のメッセージが板に反映され、指標に板の特徴量が含まれることを確認"""
+    order_books = OrderBookStore(depth=1)
+    generator = OHLCVGeneratorUseCase(order_books=order_books)
+    calculator = IndicatorCalculatorUseCase(order_books=order_books)
+
+    message = {
+        "stream": "md:orderbook",
+        "id": "1-0",
+        "fields": {
+            "exchange": "gmo",
+            "symbol": "BTC_JPY",
+            "ts": "1732312345000",
+            "data": json.dumps({"bids": [[6123000, 0.3]], "asks": [[6124000, 0.1]]}),
+        },
+    }
+    assert generator.execute_all(message) == []
+
+    ohlcv = OHLCV(
+        exchange="gmo",
+        symbol="BTC_JPY",
+        timeframe="1s",
+        timestamp=datetime(2024, 11, 23, 12, 0, 0),
+        open=Decimal("6123500"),
+        high=Decimal("6123500"),
+        low=Decimal("6123500"),
+        close=Decimal("6123500"),
+        volume=Decimal("0"),
+    )
+    indicators = calculator.execute(ohlcv)
+    assert indicators["best_bid"] == 6123000
+    assert indicators["best_ask"] == 6124000
+    assert indicators["spread"] == 1000
+    assert indicators["book_imbalance"] == pytest.approx(0.5)
+
+    # 板情報のないシンボル・取引所には特徴量を含めない
+    ohlcv.symbol = "ETH_JPY"
+    assert "best_bid" not in calculator.execute(ohlcv)
+    ohlcv.symbol = "BTC_JPY"
+    ohlcv.exchange = "bitflyer"
+    assert "best_bid" not in calculator.execute(ohlcv)
+
+
+def test_order_book_features_snapshot_at_bar_close() -> None:
+    """バーの終了時刻より後の板の更新が、そのバーの特徴量に含まれないことを確認"""
+    order_books = OrderBookStore(depth=1)
+    generator = OHLCVGeneratorUseCase(order_books=order_books)
+
+    def message(stream: str, ts: int, data: dict) -> dict:
+        return {
+            "stream": stream,
+            "id": f"{ts}-0",
+            "fields": {"exchange": "gmo", "symbol": "BTC_JPY", "ts": str(ts), "data": json.dumps(data)},
+        }
+
+    generator.execute_all(message("md:orderbook", 1732312345000, {"bids": [[100, 1]], "asks": [[101, 1]]}))
+    generator.execute_all(message("md:ticker", 1732312345100, {"last": 100.5}))
+    # バーの終了時刻（1732312346000）より後の板の更新
+    generator.execute_all(
+        message("md:orderbook", 1732312346050, {"type": "update", "bids": [[100.5, 2]], "asks": []})
+    )
+    (bar,) = generator.execute_all(message("md:ticker", 1732312346100, {"last": 100.6}))
+
+    assert generator.features_at_close(bar)["best_bid"] == 100
+    assert order_books.features("gmo", "BTC_JPY")["best_bid"] == 100.5
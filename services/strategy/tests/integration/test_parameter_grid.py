@@ -0,0 +1,125 @@
+"""Integration test: Moving average cross parameter grid.
+
+パラメータグリッドの全組み合わせをベクトル化して評価し、シャドーシグナルを配信する動作確認テスト
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.signal_publisher import SignalPublisherService
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from infrastructure.strategies.moving_average_cross_grid import MovingAverageCrossGrid
+from shared.domain.models import OHLCV
+from tests.integration.helpers import BASE_TS, FakePublisher, build_pipeline, ticker_message
+
+
+def _ohlcv(i: int, price: float) -> OHLCV:
+    return OHLCV(
+        exchange="gmo",
+        symbol="BTC_JPY",
+        timeframe="1s",
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=i),
+        open=Decimal(str(price)),
+        high=Decimal(str(price)),
+        low=Decimal(str(price)),
+        close=Decimal(str(price)),
+        volume=Decimal("1.0"),
+    )
+
+
+def _prices(num_bars: int) -> List[float]:
+    rng = np.random.default_rng(3)
+    return list(np.round(100.0 + np.cumsum(rng.normal(0, 1, num_bars)), 4))
+
+
+def test_grid_pairs_and_validation() -> None:
+    """短期 < 長期 の組み合わせだけを評価し、組み合わせがない場合は ValueError になることを確認"""
+    grid = MovingAverageCrossGrid([5, 10, 20], [10, 20, 40])
+    assert grid.pairs.tolist() == [[5, 10], [5, 20], [5, 40], [10, 20], [10, 40], [20, 40]]
+    assert grid.windows.tolist() == [5, 10, 20, 40]
+    assert grid.required_history == 41
+
+    with pytest.raises(ValueError):
+        MovingAverageCrossGrid([20], [10])
+    with pytest.raises(ValueError):
+        MovingAverageCrossGrid([0], [10])
+
+
+def test_grid_matches_individual_strategies() -> None:
+    """グリッドのシャドーシグナルが、組み合わせごとの MovingAverageCrossStrategy のシグナルと一致することを確認"""
+    fast_windows, slow_windows = range(2, 12, 3), range(10, 50, 7)
+    grid = MovingAverageCrossGrid(fast_windows, slow_windows)
+    prices = _prices(300)
+    series = pd.Series(prices)
+
+    expected: Set[Tuple[int, int, int, str]] = set()
+    for fast, slow in grid.pairs.tolist():
+        strategy = MovingAverageCrossStrategy(fast_window=fast, slow_window=slow)
+        fast_ma = series.rolling(fast).mean()
+        slow_ma = series.rolling(slow).mean()
+        for i, price in enumerate(prices):
+            if np.isnan(slow_ma[i]):
+                continue
+            indicators = {f"ma_{fast}": fast_ma[i], f"ma_{slow}": slow_ma[i]}
+            signal = strategy.decide(_ohlcv(i, price), indicators)
+            if signal:
+                expected.add((fast, slow, i, signal.action))
+
+    actual: Set[Tuple[int, int, int, str]] = set()
+    for i in range(len(prices)):
+        for signal in grid.evaluate(_ohlcv(i, prices[i]), np.array(prices[: i + 1])):
+            assert signal.strategy == f"moving_average_cross:{signal.meta['fast_window']}:{signal.meta['slow_window']}"
+            actual.add((signal.meta["fast_window"], signal.meta["slow_window"], i, signal.action))
+
+    assert expected
+    assert actual == expected
+
+
+def test_grid_recovers_crossover_state_from_history() -> None:
+    """前回の値がないシンボルでも、共有の履歴から1本前の値を補って同じ判定をすることを確認"""
+    prices = _prices(200)
+    running = MovingAverageCrossGrid(range(2, 10), range(10, 60, 5))
+    signals_by_bar = [
+        [(s.strategy, s.action) for s in running.evaluate(_ohlcv(i, prices[i]), np.array(prices[: i + 1]))]
+        for i in range(len(prices))
+    ]
+
+    crossed_at = next(i for i in range(100, len(prices)) if signals_by_bar[i])
+    restarted = MovingAverageCrossGrid(range(2, 10), range(10, 60, 5))
+    signals = restarted.evaluate(_ohlcv(crossed_at, prices[crossed_at]), np.array(prices[: crossed_at + 1]))
+    assert [(s.strategy, s.action) for s in signals] == signals_by_bar[crossed_at]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_publishes_shadow_signals_to_separate_stream() -> None:
+    """シャドーシグナルが本番のシグナルとは別の Stream に配信されることを確認"""
+    publisher = FakePublisher()
+    shadow_grid = MovingAverageCrossGrid(range(2, 8), range(10, 40, 5))
+    pipeline = build_pipeline(
+        publisher,
+        shadow_grid=shadow_grid,
+        shadow_publisher=SignalPublisherService(publisher=publisher, stream_prefix="shadow"),
+    )
+    await pipeline.start(report_interval=0)
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(30)]
+    for i, price in enumerate(prices):
+        await pipeline.submit(ticker_message(BASE_TS + i * 1000, price))
+    await pipeline.stop()
+
+    streams = [stream for stream, _ in publisher.published]
+    shadow = [payload for stream, payload in publisher.published if stream == "shadow:gmo:BTC_JPY"]
+    assert streams.count("signal:gmo:BTC_JPY") == 1
+    # 上昇に転じた後、すべての組み合わせでゴールデンクロスが発生する
+    assert len(shadow) == len(shadow_grid.pairs)
+    assert {payload["action"] for payload in shadow} == {"enter_long"}
+    assert "moving_average_cross:5:20" in {payload["strategy"] for payload in shadow}
@@ -0,0 +1,101 @@
+"""Integration test: Pending reclaimer.
+
+XAUTOCLAIM による pending メッセージの回収と dead-letter の動作確認テスト
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from infrastructure.redis.reclaimer import PendingReclaimer
+
+
+class _FakeConsumer:
+    """Redis の pending リストをシミュレートする Consumer。"""
+
+    def __init__(self, pending: Dict[str, List[str]], deliveries: Dict[str, int]) -> None:
+        self.pending = pending
+        self.deliveries = deliveries
+        self.dead_lettered: List[tuple] = []
+        self.autoclaim_calls: List[tuple] = []
+
+    async def autoclaim(self, group_name, consumer_name, stream_name, min_idle_ms, start_id="0-0", count=100):
+        self.autoclaim_calls.append((stream_name, start_id))
+        ids = self.pending.get(stream_name, [])
+        offset = int(start_id.split("-")[1]) if start_id != "0-0" else 0
+        page = ids[offset : offset + count]
+        next_offset = offset + count
+        next_id = f"0-{next_offset}" if next_offset < len(ids) else "0-0"
+        messages = []
+        for message_id in page:
+            # XAUTOCLAIM は引き取ったメッセージの配信回数を1増やす
+            self.deliveries[message_id] = self.deliveries.get(message_id, 0) + 1
+            messages.append({"stream": stream_name, "id": message_id, "fields": {"symbol": "BTC_JPY"}})
+        return next_id, messages
+
+    async def delivery_counts(self, group_name, stream_name, message_ids):
+        return {message_id: self.deliveries[message_id] for message_id in message_ids}
+
+    async def dead_letter(self, group_name, dead_letter_stream, messages, reason):
+        self.dead_lettered.append((dead_letter_stream, [message["id"] for message in messages], reason))
+
+
+@pytest.mark.asyncio
+async def test_reclaim_pages_through_pending_and_dead_letters_exhausted() -> None:
+    """pending をバッチごとに最後まで走査し、配信回数の上限を超えたメッセージだけを dead-letter に移動することを確認"""
+    consumer = _FakeConsumer(
+        pending={"md:ticker": ["1-0", "2-0", "3-0", "4-0", "5-0"], "md:trade": ["6-0"]},
+        deliveries={"1-0": 1, "2-0": 3, "3-0": 1, "4-0": 1, "5-0": 1, "6-0": 2},
+    )
+    reclaimer = PendingReclaimer(
+        consumer,
+        group_name="strategy",
+        consumer_name="strategy-0",
+        streams=["md:ticker", "md:trade"],
+        min_idle_ms=1000,
+        max_deliveries=3,
+        batch_size=2,
+        dead_letter_stream="dlq:strategy",
+    )
+
+    batches = [batch async for batch in reclaimer.reclaim()]
+
+    reprocessed = [message["id"] for batch in batches for message in batch]
+    assert reprocessed == ["1-0", "3-0", "4-0", "5-0", "6-0"]
+    assert all(len(batch) <= 2 for batch in batches)
+    # 配信回数が 4 回目になったメッセージだけが dead-letter に移動する
+    assert consumer.dead_lettered == [
+        ("dlq:strategy", ["2-0"], "delivered more than 3 times")
+    ]
+    # 各 Stream の走査は next_id が 0-0 に戻った時点で終了する
+    assert consumer.autoclaim_calls == [
+        ("md:ticker", "0-0"),
+        ("md:ticker", "0-2"),
+        ("md:ticker", "0-4"),
+        ("md:trade", "0-0"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reclaim_continues_after_stream_error() -> None:
+    """1つの Stream で回収に失敗しても、他の Stream の回収を続けることを確認"""
+
+    class _FailingConsumer(_FakeConsumer):
+        async def autoclaim(self, group_name, consumer_name, stream_name, *args, **kwargs):
+            if stream_name == "md:ticker":
+                raise ConnectionError("connection lost")
+            return await super().autoclaim(group_name, consumer_name, stream_name, *args, **kwargs)
+
+    consumer = _FailingConsumer(pending={"md:trade": ["1-0"]}, deliveries={"1-0": 1})
+    reclaimer = PendingReclaimer(
+        consumer, group_name="strategy", consumer_name="strategy-0", streams=["md:ticker", "md:trade"]
+    )
+
+    batches = [batch async for batch in reclaimer.reclaim()]
+
+    assert [[message["id"] for message in batch] for batch in batches] == [["1-0"]]
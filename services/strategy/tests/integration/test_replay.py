@@ -0,0 +1,154 @@
+"""Integration test: Event replay.
+
+記録したメッセージを本番と同じ処理に通し、決定的にシグナルを再現する動作確認テスト
+"""
+import gzip
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.signal_publisher import SignalPublisherService
+from application.usecases.strategy.replay import ReplayUseCase
+from infrastructure.replay import JsonlSignalWriter, read_messages
+from infrastructure.strategies.base import BaseStrategy
+from infrastructure.strategies.moving_average_cross import MovingAverageCrossStrategy
+from shared.domain.models import OHLCV, Signal
+from tests.integration.helpers import BASE_TS, FakePublisher, build_pipeline, ticker_message
+
+
+class _UntimedStrategy(BaseStrategy):
+    """timestamp を指定せずに Signal を生成する戦略（終値が 100 を超えるたびに enter_long）。"""
+
+    def decide(self, ohlcv: OHLCV, indicators: Dict[str, float]) -> Optional[Signal]:
+        if ohlcv.close <= Decimal("100"):
+            return None
+        return Signal(
+            exchange=ohlcv.exchange,
+            symbol=ohlcv.symbol,
+            strategy="untimed",
+            action="enter_long",
+            confidence=Decimal("0.5"),
+            price_ref=ohlcv.close,
+        )
+
+
+def _messages(num_symbols: int = 5, seconds: int = 120) -> List[dict]:
+    """シンボルごとに1秒に2回の ticker を、ts の順に並べたメッセージを生成します。"""
+    rng = np.random.default_rng(7)
+    prices = np.round(100.0 + np.cumsum(rng.normal(0, 1, (num_symbols, seconds * 2)), axis=1), 2)
+    messages = []
+    for step in range(seconds * 2):
+        ts = BASE_TS + step * 500
+        for row in range(num_symbols):
+            messages.append(ticker_message(ts, float(prices[row, step]), symbol=f"SYM{row}"))
+    return messages
+
+
+def _ma_strategies() -> dict:
+    return {
+        "ma_3_8": MovingAverageCrossStrategy(fast_window=3, slow_window=8),
+        "ma_5_20": MovingAverageCrossStrategy(fast_window=5, slow_window=20),
+    }
+
+
+@pytest.mark.asyncio
+async def test_replay_matches_live_pipeline() -> None:
+    """リプレイのシグナルが、実行中のパイプラインに同じメッセージを投入したときの配信内容と一致することを確認"""
+    messages = _messages()
+
+    live = FakePublisher()
+    pipeline = build_pipeline(SignalPublisherService(publisher=live), _ma_strategies())
+    await pipeline.start(report_interval=0)
+    for message in messages:
+        await pipeline.submit(message)
+    await pipeline.stop()
+
+    replayed = FakePublisher()
+    publisher = SignalPublisherService(publisher=replayed)
+    replay = ReplayUseCase(build_pipeline(publisher, _ma_strategies()), batch_size=64, publisher=publisher)
+    report = await replay.execute(messages)
+
+    assert live.published
+    assert replayed.published == live.published
+    assert report.messages == len(messages)
+    assert report.signal_count == len(report.signals) == len(live.published)
+    assert report.messages_per_second > 0
+
+
+@pytest.mark.asyncio
+async def test_replay_is_deterministic_with_event_clock() -> None:
+    """timestamp を省略したシグナルもイベント時刻になり、何度リプレイしても同じ結果になることを確認"""
+    messages = _messages(num_symbols=3, seconds=30)
+
+    runs = []
+    for _ in range(2):
+        published = FakePublisher()
+        publisher = SignalPublisherService(publisher=published)
+        pipeline = build_pipeline(publisher, {"untimed": _UntimedStrategy()})
+        replay = ReplayUseCase(pipeline, batch_size=16, publisher=publisher)
+        await replay.execute(messages)
+        runs.append(published.published)
+
+    assert runs[0]
+    assert runs[0] == runs[1]
+    first = datetime.fromtimestamp(BASE_TS / 1000)
+    last = datetime.fromtimestamp(int(messages[-1]["fields"]["ts"]) / 1000)
+    assert all(first <= datetime.fromisoformat(payload["timestamp"]) <= last for _, payload in runs[0])
+
+    # リプレイの後はシステム時刻に戻る
+    signal = Signal(
+        exchange="gmo", symbol="BTC_JPY", strategy="s", action="exit", confidence=Decimal("1"), price_ref=Decimal("1")
+    )
+    assert signal.timestamp > last
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_messages_with_invalid_ts() -> None:
+    """ts が欠落・不正なメッセージがあっても、リプレイが止まらずに読み飛ばされることを確認"""
+    messages = _messages(num_symbols=2, seconds=30)
+    broken = dict(messages[-1], fields=dict(messages[-1]["fields"], ts="not-a-number"))
+    missing = dict(messages[10], fields={k: v for k, v in messages[10]["fields"].items() if k != "ts"})
+
+    pipeline = build_pipeline(SignalPublisherService(publisher=FakePublisher()), _ma_strategies())
+    report = await ReplayUseCase(pipeline, batch_size=16).execute(messages[:10] + [missing] + messages[11:-1] + [broken])
+
+    assert report.messages == len(messages)
+    # 読み飛ばしたメッセージを除いた場合と同じシグナルになる（1970-01-01 のティックとして集約されない）
+    pipeline = build_pipeline(SignalPublisherService(publisher=FakePublisher()), _ma_strategies())
+    expected = await ReplayUseCase(pipeline, batch_size=16).execute(messages[:10] + messages[11:-1])
+    assert report.signals
+    assert [(s.strategy, s.symbol, s.action, s.price_ref) for s in report.signals] == [
+        (s.strategy, s.symbol, s.action, s.price_ref) for s in expected.signals
+    ]
+
+
+@pytest.mark.asyncio
+async def test_message_log_round_trip(tmp_path: Path) -> None:
+    """記録したメッセージ（gzip）を読み込み、シグナルを JSON Lines に書き出せることを確認"""
+    messages = _messages(num_symbols=2, seconds=60)
+    path = tmp_path / "md.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for message in messages:
+            file.write(json.dumps(message) + "\n")
+    assert list(read_messages(path)) == messages
+
+    writer = JsonlSignalWriter(tmp_path / "signals.jsonl")
+    publisher = SignalPublisherService(publisher=writer)
+    replay = ReplayUseCase(build_pipeline(publisher, _ma_strategies()), publisher=publisher)
+    report = await replay.execute(read_messages(path), keep_signals=False)
+    writer.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "signals.jsonl").read_text().splitlines()]
+    assert report.signals == []
+    assert len(lines) == report.signal_count > 0
+    assert {line["stream"] for line in lines} <= {"signal:gmo:SYM0", "signal:gmo:SYM1"}
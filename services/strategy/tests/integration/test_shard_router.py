@@ -0,0 +1,47 @@
+"""Integration test: Symbol sharding across strategy workers.
+
+シンボルのシャード割り当ての動作確認テスト
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.services.shard_router import ShardRouter
+
+SYMBOLS = [f"SYM{i}_JPY" for i in range(200)]
+
+
+def test_each_symbol_is_owned_by_exactly_one_shard() -> None:
+    """すべてのシンボルがちょうど1つのシャードに割り当てられることを確認"""
+    routers = [ShardRouter(index, 4) for index in range(4)]
+
+    for symbol in SYMBOLS:
+        assert sum(router.owns(symbol) for router in routers) == 1
+
+    # 偏りすぎない（各シャードが少なくとも1割は担当する）
+    for router in routers:
+        assert len(router.owned_symbols(SYMBOLS)) > len(SYMBOLS) // 10
+
+
+def test_adding_a_shard_moves_few_symbols() -> None:
+    """シャードを追加しても、担当が変わるのは新しいシャードに移るシンボルだけであることを確認"""
+    before = ShardRouter(0, 4)
+    after = ShardRouter(0, 5)
+
+    moved = [symbol for symbol in SYMBOLS if before.shard_of(symbol) != after.shard_of(symbol)]
+    assert all(after.shard_of(symbol) == 4 for symbol in moved)
+    assert len(moved) < len(SYMBOLS) // 2
+
+
+def test_consumer_group_per_shard() -> None:
+    """シャードごとに別の Consumer Group 名になることを確認"""
+    assert ShardRouter(0, 1).consumer_group("strategy") == "strategy"
+    assert ShardRouter(2, 3).consumer_group("strategy") == "strategy-shard-2"
+
+    with pytest.raises(ValueError):
+        ShardRouter(3, 3)
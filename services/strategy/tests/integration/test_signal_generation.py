@@ -38,8 +38,8 @@ def test_signal_generation_golden_cross() -> None:
 
     # ゴールデンクロスのシミュレーション（前回: fast < slow, 今回: fast > slow）
     # 初回は前回値がないため、手動で設定
-    strategy._prev_fast_ma["BTC_JPY"] = 99.0
-    strategy._prev_slow_ma["BTC_JPY"] = 100.0
+    strategy._prev_fast_ma[("gmo", "BTC_JPY")] = 99.0
+    strategy._prev_slow_ma[("gmo", "BTC_JPY")] = 100.0
 
     indicators = {"ma_fast": 101.0, "ma_slow": 100.0}
 
@@ -73,8 +73,8 @@ def test_signal_generation_dead_cross() -> None:
     )
 
     # デッドクロスのシミュレーション（前回: fast > slow, 今回: fast < slow）
-    strategy._prev_fast_ma["BTC_JPY"] = 101.0
-    strategy._prev_slow_ma["BTC_JPY"] = 100.0
+    strategy._prev_fast_ma[("gmo", "BTC_JPY")] = 101.0
+    strategy._prev_slow_ma[("gmo", "BTC_JPY")] = 100.0
 
     indicators = {"ma_fast": 99.0, "ma_slow": 100.0}
 
@@ -107,8 +107,8 @@ def test_signal_generation_no_cross() -> None:
     )
 
     # クロスなしのシミュレーション（前回も今回も fast > slow）
-    strategy._prev_fast_ma["BTC_JPY"] = 101.0
-    strategy._prev_slow_ma["BTC_JPY"] = 100.0
+    strategy._prev_fast_ma[("gmo", "BTC_JPY")] = 101.0
+    strategy._prev_slow_ma[("gmo", "BTC_JPY")] = 100.0
 
     indicators = {"ma_fast": 102.0, "ma_slow": 101.0}
 
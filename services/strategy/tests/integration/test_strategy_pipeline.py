@@ -0,0 +1,256 @@
+"""Integration test: Staged strategy pipeline.
+
+decode → aggregate → indicators → decide → publish/persist パイプラインの動作確認テスト
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.main import STAGES
+from tests.integration.helpers import BASE_TS, FakePublisher, FakeRepository, build_pipeline, ticker_message
+
+
+@pytest.mark.asyncio
+async def test_pipeline_generates_signal_and_acks_every_message() -> None:
+    """下落後の上昇でゴールデンクロスのシグナルが配信・保存され、全メッセージが完了することを確認"""
+    publisher = FakePublisher()
+    done: list = []
+    ohlcv_repo, signal_repo = FakeRepository(), FakeRepository()
+    pipeline = build_pipeline(
+        publisher, done=done, ohlcv_repository=ohlcv_repo, signal_repository=signal_repo, queue_size=4
+    )
+    await pipeline.start(report_interval=0)
+
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(20)]
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+    for message in messages:
+        await pipeline.submit(message)
+    await pipeline.stop()
+
+    # バー未確定のメッセージも含め、すべてのメッセージが1回ずつ完了している
+    assert sorted(done) == sorted(message["id"] for message in messages)
+    # 最後の1本以外のバーが確定して保存されている（時系列順）
+    assert len(ohlcv_repo.saved) == len(messages) - 1
+    timestamps = [ohlcv.timestamp for ohlcv in ohlcv_repo.saved]
+    assert timestamps == sorted(timestamps)
+
+    assert publisher.published
+    assert publisher.published[0][0] == "signal:gmo:BTC_JPY"
+    assert publisher.published[0][1]["action"] == "enter_long"
+    assert len(signal_repo.saved) == len(publisher.published)
+
+    stats = pipeline.stats()
+    assert list(stats) == list(STAGES)
+    assert stats["decode"]["processed"] == len(messages)
+    assert stats["publish"]["processed"] == len(messages) - 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_applies_backpressure_when_downstream_is_slow() -> None:
+    """publish が詰まるとキューが埋まり、submit が待機することを確認"""
+    publisher = FakePublisher()
+    publisher.release.clear()
+    done: list = []
+    pipeline = build_pipeline(publisher, done=done, queue_size=1, max_in_flight=1)
+    await pipeline.start(report_interval=0)
+
+    # ゴールデンクロスを発生させ、配信で停止させる
+    prices = [200.0 - i for i in range(30)] + [170.0 + 5 * i for i in range(10)]
+    prices += [220.0] * 50
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+
+    submitted = 0
+
+    async def feed() -> None:
+        nonlocal submitted
+        for message in messages:
+            await pipeline.submit(message)
+            submitted += 1
+
+    feeder = asyncio.create_task(feed())
+    await asyncio.sleep(0.05)
+
+    # 下流が止まっているため、すべては投入できない
+    assert submitted < len(messages)
+    assert not feeder.done()
+
+    publisher.release.set()
+    await feeder
+    await pipeline.stop()
+    assert sorted(done) == sorted(message["id"] for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_publishes_simultaneous_signals_in_one_round_trip() -> None:
+    """複数シンボルで同時に発生したシグナルが1回の往復でまとめて配信されることを確認"""
+    publisher = FakePublisher()
+    done: list = []
+    symbols = [f"SYM{i}_JPY" for i in range(5)]
+    signal_repo = FakeRepository()
+    pipeline = build_pipeline(publisher, done=done, signal_repository=signal_repo, queue_size=100)
+
+    # ゴールデンクロスまで処理してから配信を止め、同時に発生したシグナルを溜める
+    prices = [200.0 - i for i in range(30)] + [170.0 + 5 * i for i in range(10)]
+    await pipeline.start(report_interval=0)
+    for i, price in enumerate(prices):
+        if i == 31:
+            await asyncio.sleep(0.01)
+            publisher.release.clear()
+        for symbol in symbols:
+            await pipeline.submit(ticker_message(BASE_TS + i * 1000, price, symbol))
+    await asyncio.sleep(0.01)
+    round_trips = publisher.round_trips
+    assert not publisher.published
+    publisher.release.set()
+    await pipeline.stop()
+
+    streams = [stream for stream, _ in publisher.published]
+    assert sorted(streams) == sorted(f"signal:gmo:{symbol}" for symbol in symbols)
+    # 溜まっていたシグナルは1回（停止時に待機中のバッチを含め最大2回）の往復で配信される
+    assert publisher.round_trips - round_trips <= 2
+    assert len(signal_repo.saved) == len(symbols)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retries_unpublished_signals() -> None:
+    """シグナルの配信に失敗したメッセージは再処理せず、計算済みのシグナルを再送してから完了することを確認"""
+
+    class _FlakyPublisher(FakePublisher):
+        def __init__(self) -> None:
+            super().__init__()
+            self.failures = 2
+
+        async def publish_many(self, messages: list) -> List[str]:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection lost")
+            return await super().publish_many(messages)
+
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(20)]
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+
+    expected_publisher = FakePublisher()
+    expected = build_pipeline(expected_publisher)
+    await expected.start(report_interval=0)
+    for message in messages:
+        await expected.submit(dict(message))
+    await expected.stop()
+
+    publisher = _FlakyPublisher()
+    done: list = []
+    failed: list = []
+    ohlcv_repo, signal_repo = FakeRepository(), FakeRepository()
+    pipeline = build_pipeline(
+        publisher,
+        done=done,
+        ohlcv_repository=ohlcv_repo,
+        signal_repository=signal_repo,
+        on_failed=lambda message: failed.append(message["id"]),
+        publish_retry_interval=0.01,
+    )
+    await pipeline.start(report_interval=0)
+    for message in messages:
+        await pipeline.submit(message)
+    # 新しいメッセージがなくても再送され、停止前にすべてのメッセージが完了する
+    for _ in range(200):
+        if len(done) == len(messages):
+            break
+        await asyncio.sleep(0.01)
+    assert len(done) == len(messages)
+    await pipeline.stop()
+
+    # 再処理に回されたメッセージはなく、すべてのメッセージが1回ずつ完了している
+    assert not failed
+    assert sorted(done) == sorted(message["id"] for message in messages)
+    # 失敗しなかった場合と同じシグナルが同じ順序で配信・保存されている
+    assert publisher.failures == 0
+    assert [stream for stream, _ in publisher.published] == [stream for stream, _ in expected_publisher.published]
+    assert [payload["action"] for _, payload in publisher.published] == [
+        payload["action"] for _, payload in expected_publisher.published
+    ]
+    assert len(signal_repo.saved) == len(publisher.published)
+    assert len(ohlcv_repo.saved) == len(messages) - 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_carries_unpublished_signals_over_on_shutdown() -> None:
+    """停止時に配信できないシグナルはチェックポイントで引き継ぎ、メッセージは pending に残さないことを確認"""
+
+    class _FailingPublisher(FakePublisher):
+        async def publish_many(self, messages: list) -> List[str]:
+            raise ConnectionError("connection lost")
+
+    done: list = []
+    failed: list = []
+    ohlcv_repo, signal_repo = FakeRepository(), FakeRepository()
+    pipeline = build_pipeline(
+        _FailingPublisher(),
+        done=done,
+        ohlcv_repository=ohlcv_repo,
+        signal_repository=signal_repo,
+        on_failed=lambda message: failed.append(message["id"]),
+    )
+    await pipeline.start(report_interval=0)
+
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(20)]
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+    for message in messages:
+        await pipeline.submit(message)
+    await pipeline.stop()
+
+    assert not failed
+    assert sorted(done) == sorted(message["id"] for message in messages)
+    assert not signal_repo.saved
+    assert len(ohlcv_repo.saved) == len(messages) - 1
+
+    # 次回の起動時に、引き継いだシグナルを配信してから保存する
+    checkpoint = await pipeline.checkpoint()
+    assert checkpoint.unpublished
+    checkpoint.unpublished = json.loads(json.dumps(checkpoint.unpublished))
+    publisher = FakePublisher()
+    restored_repo = FakeRepository()
+    restored = build_pipeline(publisher, signal_repository=restored_repo)
+    restored.restore(checkpoint)
+    await restored.start(report_interval=0)
+    await restored.stop()
+
+    assert len(publisher.published) == len(checkpoint.unpublished)
+    assert [signal.symbol for signal in restored_repo.saved] == ["BTC_JPY"] * len(checkpoint.unpublished)
+    assert not (await restored.checkpoint()).unpublished
+
+
+@pytest.mark.asyncio
+async def test_pipeline_forwards_messages_when_a_batch_stage_fails() -> None:
+    """indicators/decide で失敗したメッセージは再処理に回さず、バーを保存して完了とすることを確認"""
+    done: list = []
+    failed: list = []
+    publisher = FakePublisher()
+    ohlcv_repo = FakeRepository()
+    pipeline = build_pipeline(
+        publisher, done=done, ohlcv_repository=ohlcv_repo, on_failed=lambda message: failed.append(message["id"])
+    )
+
+    def _raise(*args, **kwargs):
+        raise RuntimeError("strategy error")
+
+    pipeline.signal_generator.execute_batch = _raise
+    await pipeline.start(report_interval=0)
+
+    prices = [200.0 - i for i in range(60)] + [140.0 + 3 * i for i in range(20)]
+    messages = [ticker_message(BASE_TS + i * 1000, price) for i, price in enumerate(prices)]
+    for message in messages:
+        await pipeline.submit(message)
+    await pipeline.stop()
+
+    assert not failed
+    assert sorted(done) == sorted(message["id"] for message in messages)
+    assert len(ohlcv_repo.saved) == len(messages) - 1
+    assert not publisher.published
@@ -0,0 +1,149 @@
+"""Integration test: Trade tape and order-flow features.
+
+約定履歴のリングバッファと時間窓の約定特徴量の動作確認テスト
+"""
+import json
+import random
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from application.usecases.strategy.indicator_calculator import IndicatorCalculatorUseCase
+from application.usecases.strategy.ohlcv_generator import OHLCVGeneratorUseCase
+from domain.market import TradeTape, TradeTapeStore
+from shared.domain.models import OHLCV
+
+
+def _brute_force(trades: list, now_ms: int, length_ms: int) -> dict:
+    """時間窓内の約定から特徴量を直接計算します（比較用）。"""
+    window = [t for t in trades if t[0] > now_ms - length_ms]
+    volume = sum(size for _, _, size, _ in window)
+    return {
+        "vwap": sum(price * size for _, price, size, _ in window) / volume,
+        "volume_delta": sum(side * size for _, _, size, side in window),
+        "trade_intensity": len(window) * 1000.0 / length_ms,
+        "avg_trade_size": volume / len(window),
+    }
+
+
+def test_trade_tape_matches_brute_force() -> None:
+    """インクリメンタルな特徴量が窓内の約定から直接計算した値と一致することを確認"""
+    rng = random.Random(7)
+    tape = TradeTape(windows=["1s", "10s"], capacity=100_000)
+    trades = []
+    ts = 1732312345000
+
+    for _ in range(5_000):
+        ts += rng.randint(0, 40)
+        trade = (ts, 6_000_000 + rng.uniform(-5000, 5000), rng.uniform(0.0001, 0.5), rng.choice((1, -1)))
+        trades.append(trade)
+        tape.append(*trade)
+
+    features = tape.features()
+    for label, length_ms in (("1s", 1_000), ("10s", 10_000)):
+        expected = _brute_force(trades, ts, length_ms)
+        for name, value in expected.items():
+            assert features[f"{name}_{label}"] == pytest.approx(value, rel=1e-9, abs=1e-9)
+
+
+def test_trade_tape_evicts_overwritten_trades() -> None:
+    """容量を超えて上書きされた約定が時間窓からも除外されることを確認"""
+    tape = TradeTape(windows=["1m"], capacity=3)
+    for i, (price, size) in enumerate([(100.0, 1.0), (200.0, 1.0), (300.0, 1.0), (400.0, 1.0)]):
+        tape.append(1732312345000 + i, price, size, 1)
+
+    assert len(tape) == 3
+    features = tape.features()
+    assert features["vwap_1m"] == pytest.approx(300.0)
+    assert features["volume_delta_1m"] == pytest.approx(3.0)
+
+
+def test_trade_tape_features_decay_without_trades() -> None:
+    """約定が途絶えている間も、参照時刻を基準に窓から外れた約定が除外されることを確認"""
+    tape = TradeTape(windows=["1s", "10s"])
+    tape.append(1732312345000, 100.0, 1.0, 1)
+    tape.append(1732312345500, 110.0, 1.0, -1)
+
+    features = tape.features(as_of_ms=1732312346600)
+    assert "vwap_1s" not in features
+    assert features["trade_intensity_10s"] == pytest.approx(0.2)
+
+    assert tape.features(as_of_ms=1732312355400)["trade_intensity_10s"] == pytest.approx(0.1)
+    assert tape.features(as_of_ms=1732312356000) == {}
+
+
+def test_trade_features_merged_into_indicators() -> None:
+    """md:trade の約定が約定履歴に追加され、指標に約定の特徴量が含まれることを確認"""
+    trade_tapes = TradeTapeStore(windows=["10s"])
+    generator = OHLCVGeneratorUseCase(trade_tapes=trade_tapes)
+    calculator = IndicatorCalculatorUseCase(trade_tapes=trade_tapes)
+
+    for i, (price, size, side) in enumerate([(100.0, 1.0, "BUY"), (110.0, 3.0, "SELL")]):
+        generator.execute_all(
+            {
+                "stream": "md:trade",
+                "id": f"{i}-0",
+                "fields": {
+                    "exchange": "gmo",
+                    "symbol": "BTC_JPY",
+                    "ts": str(1732312345000 + i * 100),
+                    "data": json.dumps({"price": price, "size": size, "side": side}),
+                },
+            }
+        )
+
+    ohlcv = OHLCV(
+        exchange="gmo",
+        symbol="BTC_JPY",
+        timeframe="1s",
+        timestamp=datetime(2024, 11, 23, 12, 0, 0),
+        open=Decimal("100"),
+        high=Decimal("110"),
+        low=Decimal("100"),
+        close=Decimal("110"),
+        volume=Decimal("4"),
+    )
+    indicators = calculator.execute(ohlcv)
+    assert indicators["vwap_10s"] == pytest.approx((100.0 + 330.0) / 4.0)
+    assert indicators["volume_delta_10s"] == pytest.approx(-2.0)
+    assert indicators["trade_intensity_10s"] == pytest.approx(0.2)
+    assert indicators["avg_trade_size_10s"] == pytest.approx(2.0)
+
+
+def test_trade_features_snapshot_at_bar_close() -> None:
+    """バーの特徴量に、バーを確定させた約定やその後の約定が含まれないことを確認"""
+    trade_tapes = TradeTapeStore(windows=["10s"])
+    generator = OHLCVGeneratorUseCase(trade_tapes=trade_tapes)
+
+    def trade(ts: int, price: float, size: float) -> list:
+        return generator.execute_all(
+            {
+                "stream": "md:trade",
+                "id": f"{ts}-0",
+                "fields": {
+                    "exchange": "gmo",
+                    "symbol": "BTC_JPY",
+                    "ts": str(ts),
+                    "data": json.dumps({"price": price, "size": size, "side": "BUY"}),
+                },
+            }
+        )
+
+    assert trade(1732312345000, 100.0, 1.0) == []
+    assert trade(1732312345500, 110.0, 3.0) == []
+    # 次の1秒の約定でバーが確定する（この約定はバーの特徴量に含めない）
+    (bar,) = trade(1732312346200, 200.0, 5.0)
+    trade(1732312346300, 300.0, 5.0)
+
+    features = generator.features_at_close(bar)
+    assert features["vwap_10s"] == pytest.approx((100.0 + 330.0) / 4.0)
+    assert features["volume_delta_10s"] == pytest.approx(4.0)
+    # 現在の約定履歴には確定後の約定も含まれる
+    assert trade_tapes.features("gmo", "BTC_JPY")["volume_delta_10s"] == pytest.approx(14.0)
@@ -0,0 +1,165 @@
+"""Integration test: Write-behind buffer.
+
+書き込みバッファのバッチ化・上限・シャットダウン時の書き込みの動作確認テスト
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# shared/ を PYTHONPATH に追加
+shared_path = Path(__file__).parent.parent.parent.parent / "shared"
+sys.path.insert(0, str(shared_path))
+
+from infrastructure.database.write_behind import WriteBehindBuffer
+
+
+class _Sink:
+    """バッチを記録する書き込み先。"""
+
+    def __init__(self) -> None:
+        self.batches: list = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = 0
+
+    async def write(self, batch: list) -> None:
+        await self.release.wait()
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(batch))
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_size_and_close() -> None:
+    """件数のしきい値で書き込み、close で残りを書き込むことを確認"""
+    sink = _Sink()
+    buffer = WriteBehindBuffer(sink.write, max_batch=3, flush_interval=60.0, max_pending=10)
+    buffer.start()
+
+    for i in range(3):
+        await buffer.put(i)
+    await asyncio.sleep(0.01)
+    await buffer.put(3)
+
+    assert sink.batches == [[0, 1, 2]]
+    assert buffer.pending == 1
+
+    await buffer.close()
+    assert sink.batches == [[0, 1, 2], [3]]
+    assert buffer.pending == 0
+    with pytest.raises(RuntimeError):
+        await buffer.put(4)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_interval() -> None:
+    """件数に達しなくても一定時間で書き込むことを確認"""
+    sink = _Sink()
+    buffer = WriteBehindBuffer(sink.write, max_batch=100, flush_interval=0.02, max_pending=100)
+    buffer.start()
+
+    await buffer.put("a")
+    await asyncio.sleep(0.1)
+
+    assert sink.batches == [["a"]]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_blocks_when_pending_limit_reached() -> None:
+    """未書き込みが上限に達すると put が待機することを確認"""
+    sink = _Sink()
+    sink.release.clear()
+    buffer = WriteBehindBuffer(sink.write, max_batch=2, flush_interval=60.0, max_pending=4)
+    buffer.start()
+
+    for i in range(4):
+        await buffer.put(i)
+    blocked = asyncio.create_task(buffer.put(4))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    sink.release.set()
+    await asyncio.wait_for(blocked, timeout=1.0)
+    await buffer.close()
+    assert [item for batch in sink.batches for item in batch] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_retries_failed_batch() -> None:
+    """書き込みに失敗したバッチが再試行されることを確認"""
+    sink = _Sink()
+    sink.fail = 1
+    buffer = WriteBehindBuffer(sink.write, max_batch=10, flush_interval=60.0, max_pending=10)
+
+    await buffer.put("a")
+    await buffer.flush()
+    assert buffer.pending == 1
+
+    await buffer.flush()
+    assert sink.batches == [["a"]]
+    assert buffer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_write_behind_drop_oldest_does_not_block() -> None:
+    """overflow="drop_oldest" では put が待機せず、古い項目を破棄することを確認"""
+    sink = _Sink()
+    buffer = WriteBehindBuffer(
+        sink.write, max_batch=2, flush_interval=60.0, max_pending=3, overflow="drop_oldest"
+    )
+
+    for i in range(5):
+        await asyncio.wait_for(buffer.put(i), timeout=0.1)
+
+    assert buffer.dropped == 2
+    await buffer.close()
+    assert [item for batch in sink.batches for item in batch] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_signal_outbox_persists_in_background() -> None:
+    """SignalOutbox がシグナルをまとめて書き込み、close で残りを書き込むことを確認"""
+    from datetime import datetime
+    from decimal import Decimal
+
+    from infrastructure.database.repositories.signal_repository import SignalOutbox
+    from shared.domain.models import Signal
+
+    class _Repository:
+        def __init__(self) -> None:
+            self.batches: list = []
+
+        async def save(self, signal) -> None:
+            await self.save_many([signal])
+
+        async def save_many(self, signals) -> None:
+            self.batches.append(list(signals))
+
+    repository = _Repository()
+    outbox = SignalOutbox(repository, max_batch=2, flush_interval=60.0, max_pending=10)
+    outbox.start()
+
+    signals = [
+        Signal(
+            exchange="gmo",
+            symbol="BTC_JPY",
+            strategy="moving_average_cross",
+            action="enter_long",
+            confidence=Decimal("0.7"),
+            price_ref=Decimal(5000000 + i),
+            timestamp=datetime(2024, 11, 23, 12, 0, i),
+        )
+        for i in range(3)
+    ]
+    await outbox.save_many(signals[:2])
+    await asyncio.sleep(0.01)
+    assert repository.batches == [signals[:2]]
+
+    await outbox.save(signals[2])
+    assert outbox.pending == 1
+    await outbox.close()
+    assert repository.batches == [signals[:2], signals[2:]]
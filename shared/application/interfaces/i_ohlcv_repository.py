@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
 
 from shared.domain.models import OHLCV
 
@@ -8,3 +9,12 @@ class IOhlcvRepository(ABC):
     async def save(self, ohlcv: OHLCV) -> None:
         """Persist OHLCV."""
 
+    @abstractmethod
+    async def save_many(self, ohlcvs: Sequence[OHLCV]) -> None:
+        """Persist multiple OHLCV in one batch."""
+
+    @abstractmethod
+    async def fetch_recent(
+        self, markets: Sequence[Tuple[str, str]], timeframes: Sequence[str], limit: int
+    ) -> List[OHLCV]:
+        """Return the latest `limit` bars per (exchange, symbol, timeframe), oldest first, in one query."""
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 from shared.domain.models import Signal
 
@@ -8,3 +9,6 @@ class ISignalRepository(ABC):
     async def save(self, signal: Signal) -> None:
         """Persist Signal."""
 
+    @abstractmethod
+    async def save_many(self, signals: Sequence[Signal]) -> None:
+        """Persist multiple Signals in one batch."""
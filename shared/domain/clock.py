@@ -0,0 +1,70 @@
+"""Injectable clock for default timestamps.
+
+ドメインモデル（Signal / Order / Execution / Position）が時刻を省略されたときに使用する現在時刻を提供します。
+通常はシステム時刻（datetime.now）を返し、リプレイやテストでは use_clock でイベント時刻の時計に差し替えます。
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+_clock: Callable[[], datetime] = datetime.now
+
+
+def now() -> datetime:
+    """現在の時計の時刻を返します。"""
+    return _clock()
+
+
+def set_clock(clock: Optional[Callable[[], datetime]]) -> Callable[[], datetime]:
+    """時計を差し替えます。
+
+    Args:
+        clock: 現在時刻を返す関数（None の場合はシステム時刻に戻す）
+
+    Returns:
+        差し替える前の時計
+    """
+    global _clock
+    previous = _clock
+    _clock = clock or datetime.now
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Callable[[], datetime]) -> Iterator[Callable[[], datetime]]:
+    """with ブロックの間だけ時計を差し替えます。
+
+    Args:
+        clock: 現在時刻を返す関数
+
+    Yields:
+        差し替えた時計
+    """
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+class ManualClock:
+    """A clock that only moves when told to (event time for replays and tests)."""
+
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        """Initialize Manual Clock.
+
+        Args:
+            start: 初期時刻（省略時は UNIX エポック）
+        """
+        self._now = start or datetime.fromtimestamp(0)
+
+    def __call__(self) -> datetime:
+        return self._now
+
+    def set(self, value: datetime) -> None:
+        """時刻を設定します。"""
+        self._now = value
+
+    def set_ms(self, timestamp_ms: int) -> None:
+        """UNIX ミリ秒で時刻を設定します（OHLCV の timestamp と同じくローカル時刻の naive datetime）。"""
+        self._now = datetime.fromtimestamp(timestamp_ms / 1000)
@@ -3,6 +3,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
+from .. import clock
+
 
 @dataclass
 class Execution:
@@ -18,5 +20,5 @@ class Execution:
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            self.timestamp = clock.now()
 
@@ -3,6 +3,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
+from .. import clock
+
 
 @dataclass
 class Order:
@@ -21,5 +23,5 @@ class Order:
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            self.timestamp = clock.now()
 
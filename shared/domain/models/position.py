@@ -3,6 +3,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
+from .. import clock
+
 
 @dataclass
 class Position:
@@ -17,5 +19,5 @@ class Position:
 
     def __post_init__(self) -> None:
         if self.updated_at is None:
-            self.updated_at = datetime.now()
+            self.updated_at = clock.now()
 
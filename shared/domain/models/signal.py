@@ -3,6 +3,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Optional
 
+from .. import clock
+
 
 @dataclass
 class Signal:
@@ -18,5 +20,5 @@ class Signal:
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            self.timestamp = clock.now()
 